@@ -0,0 +1,132 @@
+import asyncio
+from functools import lru_cache
+import logging
+import re
+import time
+from typing import Callable, Optional
+
+from google.auth import exceptions, jwt
+import httpx
+from starlette.concurrency import run_in_threadpool
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_ISSUERS = ["accounts.google.com", "https://accounts.google.com"]
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class GoogleTokenVerifier:
+    """
+    Verifies Google ID tokens against a local copy of Google's signing certs.
+
+    The certs are fetched over a pooled HTTP client and kept for as long as
+    the endpoint's Cache-Control max-age allows.  Shortly before they expire
+    they are refreshed in the background, so verification itself never waits
+    on the network once the cache is warm.  Signature checks run in the
+    threadpool to keep the RSA work off the event loop.
+    """
+
+    def __init__(
+        self,
+        certs_url: str,
+        client: Optional[httpx.AsyncClient] = None,
+        default_max_age: float = 300,
+        refresh_margin: float = 60,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.certs_url = certs_url
+        self.client = client or httpx.AsyncClient(
+            timeout=10, limits=httpx.Limits(max_keepalive_connections=5)
+        )
+        self.default_max_age = default_max_age
+        self.refresh_margin = refresh_margin
+        self.clock = clock
+        self._certs: Optional[dict] = None
+        self._expires_at = 0.0
+        # Created on first use, since before Python 3.10 a Lock binds to the
+        # event loop current at creation
+        self._lock: Optional[asyncio.Lock] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def _fetch_certs(self):
+        """
+        Raises TransportError if the certs can't be fetched or aren't JSON.
+        """
+        try:
+            response = await self.client.get(self.certs_url)
+        except httpx.HTTPError as e:
+            raise exceptions.TransportError(
+                f"Could not fetch certificates at {self.certs_url}"
+            ) from e
+        if response.status_code != 200:
+            raise exceptions.TransportError(
+                f"Could not fetch certificates at {self.certs_url}"
+            )
+
+        try:
+            certs = response.json()
+        except ValueError as e:
+            raise exceptions.TransportError(
+                f"Invalid certificates at {self.certs_url}"
+            ) from e
+
+        max_age = self.default_max_age
+        match = _MAX_AGE.search(response.headers.get("cache-control", ""))
+        if match:
+            max_age = int(match.group(1))
+
+        self._certs = certs
+        self._expires_at = self.clock() + max_age
+
+    async def _refresh(self):
+        try:
+            async with self._get_lock():
+                await self._fetch_certs()
+        except Exception:
+            # The current certs stay in use until they expire
+            logger.exception("Background refresh of Google certs failed")
+
+    async def get_certs(self) -> dict:
+        now = self.clock()
+        if self._certs is None or now >= self._expires_at:
+            async with self._get_lock():
+                if self._certs is None or self.clock() >= self._expires_at:
+                    await self._fetch_certs()
+        elif now >= self._expires_at - self.refresh_margin and (
+            self._refresh_task is None or self._refresh_task.done()
+        ):
+            self._refresh_task = asyncio.create_task(self._refresh())
+        return self._certs
+
+    async def verify(self, token: str) -> dict:
+        """
+        Returns the token's claims.  Raises ValueError if the signature or
+        timestamps don't check out, GoogleAuthError for a foreign issuer and
+        its subclass TransportError if Google's certs can't be fetched.
+        """
+        certs = await self.get_certs()
+        idinfo = await run_in_threadpool(jwt.decode, token, certs=certs)
+
+        if idinfo["iss"] not in GOOGLE_ISSUERS:
+            raise exceptions.GoogleAuthError(
+                f"Wrong issuer. 'iss' should be one of {GOOGLE_ISSUERS}"
+            )
+        return idinfo
+
+    async def aclose(self):
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+        await self.client.aclose()
+
+
+@lru_cache()
+def get_google_verifier():
+    return GoogleTokenVerifier(get_settings().google_certs_url)
@@ -1,35 +1,57 @@
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
+from google.auth.exceptions import GoogleAuthError, TransportError
+import httpx
 import jwt
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.config import Settings, get_settings
 
-from app.user import model
+from .google import GoogleTokenVerifier, get_google_verifier
 from .schema import AuthenticateRequest
-from database import auth, db
+from .token_cache import TokenCache
+from database import async_crud, auth, db
 
 router = APIRouter()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+token_cache = TokenCache()
+
 
 async def get_authenticated_user(token=Depends(oauth2_scheme)):
+    user = token_cache.get(token)
+    if user is not None:
+        return user
+
     try:
         user = jwt.decode(token, key="myKey", algorithms=["HS256"])
-        return user
-    except jwt.DecodeError:
+    except jwt.InvalidTokenError:
         raise HTTPException(403, "Invalid token")
 
+    token_cache.put(token, user)
+    return user
+
 
 @router.post("/auth/authenticate")
 async def authenticate(
     auth_request: AuthenticateRequest,
-    session: Session = Depends(db.get_db),
+    session: AsyncSession = Depends(db.get_async_db),
     settings: Settings = Depends(get_settings),
+    verifier: GoogleTokenVerifier = Depends(get_google_verifier),
 ):
-    return auth.auth.authenticate(
-        session,
-        auth_request,
+    try:
+        idinfo = await verifier.verify(auth_request.token)
+    except (httpx.HTTPError, TransportError):
+        # Google's certs are unreachable, which says nothing about the token
+        raise HTTPException(
+            status_code=503, detail="Could not verify token, try again later"
+        )
+    except (ValueError, GoogleAuthError):
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    return await session.run_sync(
+        auth.auth.authenticate,
+        idinfo,
         settings,
     )
 
@@ -38,10 +60,10 @@ async def authenticate(
 @router.get("/auth/spoof/{user_id}")
 async def spoof_user(
     user_id: int,
-    session: Session = Depends(db.get_db),
+    session: AsyncSession = Depends(db.get_async_db),
     settings: Settings = Depends(get_settings),
 ):
-    db_user = session.query(model.User).filter(model.User.id == user_id).first()
+    db_user = await async_crud.user.get(session, user_id)
 
     access_token_data: dict = {
         "sub": db_user.id,
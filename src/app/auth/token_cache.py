@@ -0,0 +1,77 @@
+from collections import OrderedDict
+import hashlib
+import time
+from typing import Callable, Optional
+
+
+class TokenCache:
+    """
+    Bounded LRU cache of verified token claims, keyed by a hash of the token
+    so raw tokens are never held in memory.  An entry lives for ``ttl``
+    seconds, or until the token's own ``exp`` if that comes first.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10000,
+        ttl: float = 300,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[dict]:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, claims = entry
+            if expires_at > self.clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return claims
+            del self._entries[key]
+
+        self.misses += 1
+        return None
+
+    def put(self, token: str, claims: dict):
+        expires_at = self.clock() + self.ttl
+        if "exp" in claims:
+            expires_at = min(expires_at, claims["exp"])
+
+        key = self._key(token)
+        self._entries[key] = (expires_at, claims)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, token: str):
+        self._entries.pop(self._key(token), None)
+
+    def invalidate_user(self, user_id: int):
+        stale = [
+            key
+            for key, (_, claims) in self._entries.items()
+            if claims.get("user_id") == user_id
+        ]
+        for key in stale:
+            del self._entries[key]
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.routers import get_authenticated_user
+from .schema import BatchRequest, BatchResponse
+from database import async_crud, db
+
+router = APIRouter(dependencies=[Depends(get_authenticated_user)])
+
+
+@router.post("/users/{user_id}/batch", response_model=BatchResponse)
+async def run_batch(
+    user_id: int,
+    request: BatchRequest,
+    db: AsyncSession = Depends(db.get_async_db),
+):
+    return {"results": await async_crud.batch.run(db, user_id, request.operations)}
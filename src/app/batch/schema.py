@@ -0,0 +1,88 @@
+from typing import List, Literal, Optional, Union
+
+from pydantic import BaseModel, Field
+from typing_extensions import Annotated
+
+from app.household.schema import HouseholdMember, HouseholdMemberCreate
+from app.pantry.schema import PantryItem, PantryItemCreate
+from app.recipe.schema import Recipe, RecipeCreate
+
+MAX_OPERATIONS = 200
+
+
+class CreatePantryItem(BaseModel):
+    op: Literal["create_pantry_item"]
+    data: PantryItemCreate
+
+
+class UpdatePantryItem(BaseModel):
+    op: Literal["update_pantry_item"]
+    data: PantryItem
+
+
+class DeletePantryItem(BaseModel):
+    op: Literal["delete_pantry_item"]
+    data: PantryItem
+
+
+class CreateRecipe(BaseModel):
+    op: Literal["create_recipe"]
+    data: RecipeCreate
+
+
+class UpdateRecipe(BaseModel):
+    op: Literal["update_recipe"]
+    data: Recipe
+
+
+class DeleteRecipe(BaseModel):
+    op: Literal["delete_recipe"]
+    data: Recipe
+
+
+class CreateHouseholdMember(BaseModel):
+    op: Literal["create_household_member"]
+    data: HouseholdMemberCreate
+
+
+class UpdateHouseholdMember(BaseModel):
+    op: Literal["update_household_member"]
+    data: HouseholdMember
+
+
+class DeleteHouseholdMember(BaseModel):
+    op: Literal["delete_household_member"]
+    data: HouseholdMember
+
+
+Operation = Annotated[
+    Union[
+        CreatePantryItem,
+        UpdatePantryItem,
+        DeletePantryItem,
+        CreateRecipe,
+        UpdateRecipe,
+        DeleteRecipe,
+        CreateHouseholdMember,
+        UpdateHouseholdMember,
+        DeleteHouseholdMember,
+    ],
+    Field(discriminator="op"),
+]
+
+
+class BatchRequest(BaseModel):
+    operations: List[Operation] = Field(..., min_items=1, max_items=MAX_OPERATIONS)
+
+
+class BatchResult(BaseModel):
+    op: str
+    # What the matching single-operation endpoint returns; None for deletes
+    result: Optional[Union[PantryItem, Recipe, HouseholdMember]]
+
+    class Config:
+        smart_union = True
+
+
+class BatchResponse(BaseModel):
+    results: List[BatchResult]
@@ -1,17 +1,33 @@
-from functools import lru_cache
-from pydantic import BaseSettings
-
-
-class Settings(BaseSettings):
-    token_key: str
-    oauth_ios_client_id: str
-    oauth_android_client_id: str
-    oauth_desktop_client_id: str
-
-    class Config:
-        env_file = ".env"
-
-
-@lru_cache()
-def get_settings():
-    return Settings()
+from functools import lru_cache
+from pydantic import BaseSettings
+
+
+class Settings(BaseSettings):
+    token_key: str
+    oauth_ios_client_id: str
+    oauth_android_client_id: str
+    oauth_desktop_client_id: str
+    google_certs_url: str = "https://www.googleapis.com/oauth2/v1/certs"
+    environment: str = "development"
+    # 0 disables the in-process expiry notification scan
+    expiry_scan_interval_hours: float = 24
+    expiry_scan_within_days: int = 3
+
+    database_url: str = "postgresql://postgres:newpassword@db:5432/panda_express"
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+
+    class Config:
+        env_file = ".env"
+
+    @property
+    def seed_test_data(self) -> bool:
+        return self.environment != "production"
+
+
+@lru_cache()
+def get_settings():
+    return Settings()
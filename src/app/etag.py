@@ -0,0 +1,31 @@
+import hashlib
+from typing import Optional, Union
+
+from fastapi import Request, Response
+
+ETAG_HEADER = "ETag"
+
+
+def list_etag(version: Union[int, str], request: Request) -> str:
+    """
+    ETag for a page of a per-user list at ``version``.  The query string picks
+    the page and format, so it is part of the tag.
+    """
+    query = hashlib.sha1(str(request.query_params).encode()).hexdigest()[:16]
+    return f'"{version}-{query}"'
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """
+    Returns a 304 response when the request's If-None-Match matches ``etag``,
+    otherwise None.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return None
+
+    tags = {tag.strip() for tag in if_none_match.split(",")}
+    tags = {tag[2:] if tag.startswith("W/") else tag for tag in tags}
+    if etag in tags or "*" in tags:
+        return Response(status_code=304, headers={ETAG_HEADER: etag})
+    return None
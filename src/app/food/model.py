@@ -0,0 +1,20 @@
+from sqlalchemy import Column, ForeignKey, Integer, String
+
+from database.db import Base
+
+
+class Food(Base):
+    __tablename__ = "foods"
+
+    id = Column(Integer, primary_key=True)
+    # normalize_name() of the food's name
+    name = Column(String, nullable=False, unique=True)
+
+
+class FoodAlias(Base):
+    """Another normalized name for a food, e.g. "scallion" for "green onion"."""
+
+    __tablename__ = "food_aliases"
+
+    alias = Column(String, primary_key=True)
+    food_id = Column(Integer, ForeignKey("foods.id"), nullable=False, index=True)
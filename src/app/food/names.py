@@ -0,0 +1,34 @@
+import re
+from typing import Optional, Union
+
+_WHITESPACE = re.compile(r"\s+")
+_NON_WORD = re.compile(r"[^\w\s]")
+
+
+def _singular(word: str) -> str:
+    if len(word) <= 3 or word.endswith("ss"):
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith(("oes", "ches", "shes", "xes")):
+        return word[:-2]
+    if word.endswith("s"):
+        return word[:-1]
+    return word
+
+
+def normalize_name(name: str) -> str:
+    """
+    Folds case, punctuation, spacing and simple plurals so that e.g.
+    "Tomatoes", "tomato" and " tomato. " compare equal.
+    """
+    words = _WHITESPACE.split(_NON_WORD.sub(" ", name.lower()).strip())
+    return " ".join(_singular(word) for word in words if word)
+
+
+def food_key(food_id: Optional[int], name: str) -> Union[int, str]:
+    """
+    What pantry items and ingredients are matched on: the interned food id,
+    or the normalized name for rows written before foods were resolved.
+    """
+    return food_id if food_id is not None else normalize_name(name)
@@ -0,0 +1,118 @@
+from collections import OrderedDict
+import threading
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import event, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.food.model import Food, FoodAlias
+from app.food.names import normalize_name
+
+# Session.info key for the ids each resolver learned in the session's current
+# transaction
+_PENDING = "food_ids"
+
+
+def _insert_ignoring_duplicates(db: Session, table):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(table).on_conflict_do_nothing()
+    if dialect == "sqlite":
+        return sqlite.insert(table).on_conflict_do_nothing()
+    return insert(table)
+
+
+class FoodResolver:
+    """
+    Maps food names to ``foods`` ids, creating foods the first time they are
+    seen.  Names are normalized first, then looked up as an alias, then as a
+    food name.
+
+    Resolved ids are cached in a bounded LRU, but only once the transaction
+    that looked them up commits, so a rolled back insert is never cached.
+    """
+
+    def __init__(self, maxsize: int = 50000):
+        self.maxsize = maxsize
+        self._ids: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def resolve(self, db: Session, names: Iterable[str]) -> List[Optional[int]]:
+        """Returns the food id for each of ``names``, or None for blank ones."""
+        keys = [normalize_name(name) for name in names]
+
+        ids: Dict[str, int] = {}
+        with self._lock:
+            for key in set(keys):
+                if key in self._ids:
+                    self._ids.move_to_end(key)
+                    ids[key] = self._ids[key]
+
+        missing = set(keys) - ids.keys() - {""}
+        if missing:
+            loaded = self._load(db, missing)
+            db.info.setdefault(_PENDING, {}).setdefault(self, {}).update(loaded)
+            ids.update(loaded)
+
+        return [ids.get(key) for key in keys]
+
+    def _load(self, db: Session, names: Set[str]) -> Dict[str, int]:
+        aliases = FoodAlias.__table__
+        foods = Food.__table__
+
+        ids = dict(
+            db.execute(
+                select(aliases.c.alias, aliases.c.food_id).where(
+                    aliases.c.alias.in_(names)
+                )
+            ).all()
+        )
+        lookup = names - ids.keys()
+        if lookup:
+            ids.update(
+                db.execute(
+                    select(foods.c.name, foods.c.id).where(foods.c.name.in_(lookup))
+                ).all()
+            )
+
+        new = names - ids.keys()
+        if new:
+            # Sorted so that concurrent inserts take row locks in the same order
+            db.execute(
+                _insert_ignoring_duplicates(db, foods).values(
+                    [{"name": name} for name in sorted(new)]
+                )
+            )
+            ids.update(
+                db.execute(
+                    select(foods.c.name, foods.c.id).where(foods.c.name.in_(new))
+                ).all()
+            )
+        return ids
+
+    def remember(self, ids: Dict[str, int]):
+        with self._lock:
+            self._ids.update(ids)
+            for key in ids:
+                self._ids.move_to_end(key)
+            while len(self._ids) > self.maxsize:
+                self._ids.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._ids.clear()
+
+
+food_resolver = FoodResolver()
+
+
+@event.listens_for(Session, "after_commit")
+def _remember_committed(session: Session):
+    for resolver, ids in session.info.pop(_PENDING, {}).items():
+        resolver.remember(ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back(session: Session):
+    session.info.pop(_PENDING, None)
@@ -0,0 +1,136 @@
+"""
+Conversion of free-text quantity units into canonical dimensions.
+
+Every known unit spelling is resolved ahead of time into a lookup table of
+(dimension, factor), where the factor converts into grams, millilitres or a
+plain count.  The batch functions resolve each distinct unit string once and
+then convert whole lists with a table lookup per item.
+"""
+
+from enum import Enum
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+
+class Dimension(Enum):
+    MASS = "g"
+    VOLUME = "ml"
+    COUNT = "each"
+
+
+class Unit(NamedTuple):
+    dimension: Dimension
+    factor: float
+
+
+class Quantity(NamedTuple):
+    amount: float
+    dimension: Dimension
+
+
+_UNITS = {
+    Dimension.MASS: {
+        1.0: ["g", "gram", "gramme", "gr"],
+        1000.0: ["kg", "kilogram", "kilo"],
+        0.001: ["mg", "milligram"],
+        28.349523125: ["oz", "ounce"],
+        453.59237: ["lb", "lbs", "pound"],
+    },
+    Dimension.VOLUME: {
+        1.0: ["ml", "milliliter", "millilitre", "cc"],
+        10.0: ["cl", "centiliter", "centilitre"],
+        100.0: ["dl", "deciliter", "decilitre"],
+        1000.0: ["l", "liter", "litre"],
+        4.92892159375: ["tsp", "teaspoon", "t"],
+        14.78676478125: ["tbsp", "tablespoon", "tbs", "tbl", "T"],
+        29.5735295625: ["fl oz", "fluid ounce", "floz"],
+        236.5882365: ["cup", "c"],
+        473.176473: ["pint", "pt"],
+        946.352946: ["quart", "qt"],
+        3785.411784: ["gallon", "gal"],
+    },
+    Dimension.COUNT: {
+        1.0: ["", "each", "ea", "whole", "piece", "pc", "item", "unit", "x"],
+        12.0: ["dozen", "doz"],
+    },
+}
+
+
+def _spellings(name: str):
+    yield name
+    if len(name) > 2 and not name.endswith("s"):
+        yield name + "s"
+
+
+def _build_table() -> Dict[str, Unit]:
+    table = {}
+    for dimension, factors in _UNITS.items():
+        for factor, names in factors.items():
+            for name in names:
+                for spelling in _spellings(name):
+                    table.setdefault(spelling, Unit(dimension, factor))
+                    table.setdefault(spelling.lower(), Unit(dimension, factor))
+    return table
+
+
+UNIT_TABLE = _build_table()
+
+
+def lookup(unit: str) -> Optional[Unit]:
+    """
+    Resolves a unit spelling, or returns None if it isn't a known unit.
+    "T" is a tablespoon and "t" a teaspoon, so case is only folded when the
+    exact spelling isn't in the table.
+    """
+    unit = unit.strip().rstrip(".")
+    found = UNIT_TABLE.get(unit)
+    if found is None:
+        found = UNIT_TABLE.get(unit.lower())
+    return found
+
+
+def _resolve(units: Iterable[str]) -> Dict[str, Optional[Unit]]:
+    return {unit: lookup(unit) for unit in set(units)}
+
+
+def to_canonical(
+    quantities: Sequence[float],
+    units: Sequence[str],
+) -> List[Optional[Quantity]]:
+    """
+    Converts each (quantity, unit) pair into grams, millilitres or a count.
+    Pairs with an unknown unit come back as None.
+    """
+    resolved = _resolve(units)
+    converted = []
+    for quantity, unit in zip(quantities, units):
+        found = resolved[unit]
+        converted.append(
+            None
+            if found is None
+            else Quantity(quantity * found.factor, found.dimension)
+        )
+    return converted
+
+
+def convert_many(
+    quantities: Sequence[float],
+    from_units: Sequence[str],
+    to_units: Sequence[str],
+) -> List[Optional[float]]:
+    """
+    Converts each quantity from one unit into another.  Pairs whose units are
+    unknown or measure different dimensions come back as None.
+    """
+    resolved = _resolve(list(from_units) + list(to_units))
+    converted = []
+    for quantity, from_unit, to_unit in zip(quantities, from_units, to_units):
+        source, target = resolved[from_unit], resolved[to_unit]
+        if source is None or target is None or source.dimension != target.dimension:
+            converted.append(None)
+        else:
+            converted.append(quantity * source.factor / target.factor)
+    return converted
+
+
+def convert(quantity: float, from_unit: str, to_unit: str) -> Optional[float]:
+    return convert_many([quantity], [from_unit], [to_unit])[0]
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends
+from typing import List
+
+from app.auth.routers import get_authenticated_user, token_cache
+from .schema import PoolStatus, TokenCacheStats
+from database import db
+
+router = APIRouter(dependencies=[Depends(get_authenticated_user)])
+
+
+@router.get("/health/db_pool", response_model=List[PoolStatus])
+async def get_db_pool_status(engines: dict = Depends(db.get_engines)):
+    return [db.pool_status(name, engine) for name, engine in engines.items()]
+
+
+@router.get("/health/token_cache", response_model=TokenCacheStats)
+async def get_token_cache_stats():
+    return token_cache.stats()
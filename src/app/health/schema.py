@@ -0,0 +1,21 @@
+from typing import Optional
+from pydantic import BaseModel
+
+
+class PoolStatus(BaseModel):
+    name: str
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: Optional[int]
+    timeouts: Optional[int]
+    avg_wait: Optional[float]
+    max_wait: Optional[float]
+
+
+class TokenCacheStats(BaseModel):
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, Query
+
+from app.auth.routers import get_authenticated_user
+from .schema import Home
+from database import async_crud, db
+from database.pagination import MAX_PAGE_SIZE
+
+# Items per list section, enough for a first screen
+HOME_SECTION_SIZE = 20
+
+router = APIRouter(dependencies=[Depends(get_authenticated_user)])
+
+
+@router.get("/users/{user_id}/home", response_model=Home)
+async def get_home(
+    user_id: int,
+    limit: int = Query(HOME_SECTION_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    session_factory=Depends(db.get_async_session_factory),
+):
+    return await async_crud.home.get(session_factory, user_id, limit)
@@ -0,0 +1,18 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from app.household.schema import HouseholdMember
+from app.pantry.schema import PantryItem
+from app.recipe.schema import Recipe
+from app.user.schema import User
+
+
+class Home(BaseModel):
+    user: User
+    household: List[HouseholdMember]
+    pantry_items: List[PantryItem]
+    # Cursors for the rest of each list, for the list endpoints
+    pantry_items_cursor: Optional[str]
+    recipes: List[Recipe]
+    recipes_cursor: Optional[str]
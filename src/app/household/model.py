@@ -5,9 +5,11 @@ from sqlalchemy import (
     Integer,
     Boolean,
     String,
+    func,
+    text,
 )
 from sqlalchemy.orm import relationship
-from database.db import Base
+from database.db import Base, ServerTimestamp
 from .schema import DietaryPreferenceEnum
 
 
@@ -15,7 +17,7 @@ class DietaryPreferences(Base):
     __tablename__ = "dietary_preferences"
 
     id = Column(Integer, primary_key=True)
-    member_id = Column(ForeignKey("household_members.id"))
+    member_id = Column(ForeignKey("household_members.id"), index=True)
     preference = Column(Enum(DietaryPreferenceEnum))
 
 
@@ -29,11 +31,18 @@ class HouseholdMember(Base):
         Integer,
         ForeignKey("users.id"),
         nullable=True,
+        index=True,
     )
     head_of_household_id = Column(
         Integer,
         ForeignKey("users.id"),
         nullable=False,
+        index=True,
     )
     child = Column(Boolean, default=False)
+    updated_at = Column(
+        ServerTimestamp, server_default=text("CURRENT_TIMESTAMP"), onupdate=func.now()
+    )
+    # Head of household's household_version as of the last write to this member
+    version = Column(Integer, nullable=False, default=0, server_default="0")
     dietary_preferences = relationship(DietaryPreferences, lazy="joined")
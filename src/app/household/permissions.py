@@ -0,0 +1,25 @@
+from fastapi import HTTPException
+
+from .schema import HouseholdMember
+
+
+def check_can_update(user_id: int, member: HouseholdMember):
+    if user_id != member.user_id and user_id != member.head_of_household_id:
+        raise HTTPException(
+            status_code=403,
+            detail="Not authorized to make changes to this household member",
+        )
+
+
+def check_can_remove(user_id: int, member: HouseholdMember):
+    if user_id != member.head_of_household_id:
+        raise HTTPException(
+            status_code=403,
+            detail="Not authorized to remove household member",
+        )
+
+    if member.user_id == member.head_of_household_id:
+        raise HTTPException(
+            status_code=403,
+            detail="Cannot remove head from own household",
+        )
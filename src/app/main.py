@@ -1,61 +1,50 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 
+from app.auth.google import get_google_verifier
 from app.auth.routers import router as auth_router
+from app.batch.routers import router as batch_router
+from app.config import get_settings
+from app.health.routers import router as health_router
+from app.home.routers import router as home_router
+from app.notifications.scanner import run_expiry_scans
 from app.pantry.routers import router as pantry_router
 from app.household.routers import router as household_router
 from app.recipe.routers import router as recipe_router
-from app.recipe.schema import IngredientCreate, RecipeCreate
+from app.shopping.routers import router as shopping_router
+from app.startup import run_startup_tasks
+from app.sync.routers import router as sync_router
 from app.user.routers import router as user_router
-from app.user.schema import UserCreate
-from database import crud, db
-
-db.Base.metadata.create_all(bind=db.engine)
-
-
-def seed_test_data():
-    session = db.SessionLocal()
-    existing = crud.user.get_all(session)
-    if len(existing) > 0:
-        return
-
-    michelle = UserCreate(
-        first_name="Michelle",
-        last_name="Tolfa",
-        email="michelle.tolfa@gmail.com",
-    )
-    db_michelle = crud.user.create(session, michelle)
-
-    alex = UserCreate(
-        first_name="Alex",
-        last_name="Cahoon",
-        email="cahoon.alex@gmail.com",
-    )
-    crud.user.create(session, alex)
-
-    hannah = UserCreate(
-        first_name="Hannah",
-        last_name="Horvath",
-        email="writerGrl@hotmail.com",
-    )
-    crud.user.create(session, hannah)
-
-    milk = IngredientCreate(name="milk", quantity=1, unit="liter")
-    froot_loops = IngredientCreate(name="froot loops", quantity=2, unit="cups")
-    cereal = RecipeCreate(
-        name="cereal",
-        procedure="pour the milk",
-        ingredients=[milk, froot_loops],
-        servings=4,
-    )
-    crud.recipe.add(session, db_michelle.id, cereal)
-
-
-app = FastAPI()
-
-seed_test_data()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings = get_settings()
+    await run_in_threadpool(run_startup_tasks, settings)
+
+    expiry_scans = None
+    if settings.expiry_scan_interval_hours > 0:
+        expiry_scans = asyncio.create_task(run_expiry_scans(settings))
+
+    yield
+
+    if expiry_scans is not None:
+        expiry_scans.cancel()
+    await get_google_verifier().aclose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(auth_router)
 app.include_router(user_router)
 app.include_router(pantry_router)
 app.include_router(recipe_router)
 app.include_router(household_router)
+app.include_router(sync_router)
+app.include_router(shopping_router)
+app.include_router(batch_router)
+app.include_router(home_router)
+app.include_router(health_router)
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, ForeignKey, Integer, String, UniqueConstraint, text
+
+from database.db import Base, ServerTimestamp
+
+
+class Notification(Base):
+    __tablename__ = "notifications"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # What the notification is about, e.g. "expiry:2026-10-18", so that a
+    # rerun of the same scan does not notify anyone twice
+    key = Column(String, nullable=False)
+    body = Column(String)
+    item_count = Column(Integer)
+    created_at = Column(ServerTimestamp, server_default=text("CURRENT_TIMESTAMP"))
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "key", name="uq_notifications_user_id_key"),
+    )
+
+
+class ScanRun(Base):
+    """A completed scan, so that other workers and restarts skip it."""
+
+    __tablename__ = "scan_runs"
+
+    # The scan's notification key, e.g. "expiry:2026-10-18"
+    key = Column(String, primary_key=True)
+    completed_at = Column(ServerTimestamp, server_default=text("CURRENT_TIMESTAMP"))
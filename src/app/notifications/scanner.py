@@ -0,0 +1,196 @@
+"""
+Daily "use it before it spoils" notifications.
+
+The scanner walks every user's pantry items whose use_by falls in a window, in
+keyset order (user_id, use_by, id).  Each chunk is read through a server-side
+cursor in its own short transaction, and items are grouped per user as they
+stream past, so neither memory use nor transaction length grows with the size
+of pantry_items.  Notifications are written in batches between chunks, once
+the read transaction has ended.
+
+Every worker schedules the scan, so a completed day's scan is recorded in
+scan_runs and skipped by the workers that come after it.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from functools import partial
+import logging
+from typing import List
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import insert, literal, select, tuple_
+
+from app.config import Settings
+from app.notifications.model import Notification, ScanRun
+from app.pantry.model import PantryItem
+from database import db
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary key for the advisory lock, so one worker scans at a time
+EXPIRY_SCAN_LOCK_ID = 7_305_612
+
+CHUNK_SIZE = 1000
+# Rows per round trip from the server-side cursor
+FETCH_SIZE = 200
+WRITE_BATCH_SIZE = 500
+# Item names listed in a notification before "and N more"
+PREVIEW_SIZE = 3
+
+
+def expiry_key(start: datetime) -> str:
+    return f"expiry:{start.date().isoformat()}"
+
+
+class _ExpiringItems:
+    """One user's expiring items, seen so far in the scan."""
+
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        self.names = []
+        self.count = 0
+
+    def add(self, name: str):
+        if len(self.names) < PREVIEW_SIZE:
+            self.names.append(name)
+        self.count += 1
+
+    def notification(self, key: str) -> dict:
+        body = "Use soon: " + ", ".join(self.names)
+        if self.count > len(self.names):
+            body += f" and {self.count - len(self.names)} more"
+        return {
+            "user_id": self.user_id,
+            "key": key,
+            "body": body,
+            "item_count": self.count,
+        }
+
+
+class ExpiryScanner:
+    def __init__(
+        self,
+        session_factory,
+        chunk_size: int = CHUNK_SIZE,
+        write_batch_size: int = WRITE_BATCH_SIZE,
+    ):
+        self.session_factory = session_factory
+        self.chunk_size = chunk_size
+        self.write_batch_size = write_batch_size
+
+    def scan(self, start: datetime, end: datetime) -> int:
+        """
+        Notifies each user with items whose use_by is in [start, end], once per
+        day of ``start``.  Returns the number of notifications written.
+        """
+        key = expiry_key(start)
+        written = 0
+        pending: List[dict] = []
+        current = None
+        after = None
+
+        while True:
+            rows_read = 0
+            with self.session_factory() as session:
+                result = session.execute(
+                    self._chunk_query(start, end, after),
+                    execution_options={
+                        "stream_results": True,
+                        "max_row_buffer": FETCH_SIZE,
+                    },
+                )
+                for row in result:
+                    rows_read += 1
+                    after = (row.user_id, row.use_by, row.id)
+                    if current is not None and current.user_id != row.user_id:
+                        pending.append(current.notification(key))
+                        current = None
+                    if current is None:
+                        current = _ExpiringItems(row.user_id)
+                    current.add(row.name)
+
+            if rows_read < self.chunk_size:
+                break
+            if len(pending) >= self.write_batch_size:
+                written += self._write(pending, key)
+                pending = []
+
+        if current is not None:
+            pending.append(current.notification(key))
+        return written + self._write(pending, key)
+
+    def has_completed(self, key: str) -> bool:
+        with self.session_factory() as session:
+            return session.get(ScanRun, key) is not None
+
+    def mark_completed(self, key: str):
+        with self.session_factory() as session:
+            session.execute(insert(ScanRun.__table__).values(key=key))
+            session.commit()
+
+    def _chunk_query(self, start: datetime, end: datetime, after):
+        items = PantryItem.__table__
+        columns = [items.c.user_id, items.c.use_by, items.c.id]
+        query = select(*columns, items.c.name).where(
+            items.c.user_id.isnot(None),
+            items.c.use_by >= start,
+            items.c.use_by <= end,
+        )
+        if after is not None:
+            values = tuple_(*[literal(v, c.type) for c, v in zip(columns, after)])
+            query = query.where(tuple_(*columns) > values)
+        return query.order_by(*columns).limit(self.chunk_size)
+
+    def _write(self, notifications: List[dict], key: str) -> int:
+        if not notifications:
+            return 0
+
+        table = Notification.__table__
+        with self.session_factory() as session:
+            notified = {
+                user_id
+                for user_id, in session.execute(
+                    select(table.c.user_id).where(
+                        table.c.key == key,
+                        table.c.user_id.in_([n["user_id"] for n in notifications]),
+                    )
+                )
+            }
+            new = [n for n in notifications if n["user_id"] not in notified]
+            if new:
+                session.execute(insert(table).values(new))
+            session.commit()
+        return len(new)
+
+
+def scan_expiring(settings: Settings) -> int:
+    with db.get_engine().connect() as connection:
+        with db.try_advisory_lock(connection, EXPIRY_SCAN_LOCK_ID) as acquired:
+            if not acquired:
+                logger.info("Expiry scan is running in another worker")
+                return 0
+
+            scanner = ExpiryScanner(partial(db.SessionLocal, bind=db.get_engine()))
+            now = datetime.utcnow()
+            key = expiry_key(now)
+            if scanner.has_completed(key):
+                logger.info("Expiry scan for %s already ran", key)
+                return 0
+
+            written = scanner.scan(
+                now, now + timedelta(days=settings.expiry_scan_within_days)
+            )
+            scanner.mark_completed(key)
+            return written
+
+
+async def run_expiry_scans(settings: Settings):
+    """Runs scan_expiring every expiry_scan_interval_hours, until cancelled."""
+    while True:
+        try:
+            written = await run_in_threadpool(scan_expiring, settings)
+            logger.info("Expiry scan wrote %d notifications", written)
+        except Exception:
+            logger.exception("Expiry scan failed")
+        await asyncio.sleep(settings.expiry_scan_interval_hours * 3600)
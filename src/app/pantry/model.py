@@ -1,7 +1,18 @@
-from sqlalchemy import Column, DateTime, Enum, Float, ForeignKey, Integer, String, text
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Enum,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    func,
+    text,
+)
 from app.pantry.schema import StorageLocation
 
-from database.db import Base
+from database.db import Base, ServerTimestamp
 
 
 class PantryItem(Base):
@@ -15,8 +26,21 @@ class PantryItem(Base):
         DateTime(timezone=False), server_default=text("CURRENT_TIMESTAMP")
     )
     use_by = Column(DateTime(timezone=False), server_default=text("CURRENT_TIMESTAMP"))
-    timestamp = Column(
-        DateTime(timezone=False), server_default=text("CURRENT_TIMESTAMP")
+    timestamp = Column(ServerTimestamp, server_default=text("CURRENT_TIMESTAMP"))
+    updated_at = Column(
+        ServerTimestamp, server_default=text("CURRENT_TIMESTAMP"), onupdate=func.now()
     )
+    # User's pantry_version as of the last write to this item
+    version = Column(Integer, nullable=False, default=0, server_default="0")
     unit = Column(String)
     user_id = Column(Integer, ForeignKey("users.id"))
+    food_id = Column(Integer, ForeignKey("foods.id"), nullable=True)
+
+    # Serve per-user listing in keyset order, delta sync, expiring items and
+    # lookups by food
+    __table_args__ = (
+        Index("ix_pantry_items_user_id_timestamp_id", "user_id", "timestamp", "id"),
+        Index("ix_pantry_items_user_id_version", "user_id", "version"),
+        Index("ix_pantry_items_user_id_use_by", "user_id", "use_by"),
+        Index("ix_pantry_items_user_id_food_id", "user_id", "food_id"),
+    )
@@ -1,44 +1,99 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from typing import List
+from datetime import datetime, timedelta
+from fastapi import APIRouter, Body, Depends, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 
 from app.auth.routers import get_authenticated_user
+from app.etag import ETAG_HEADER, list_etag, not_modified
+from app.streaming import StreamFormat, stream_response
 from .schema import PantryItem, PantryItemCreate
-from database import crud, db
+from database import async_crud, db
+from database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
 
 router = APIRouter(dependencies=[Depends(get_authenticated_user)])
 
+DURATION_UNITS = {"h": "hours", "d": "days", "w": "weeks"}
+# A bulk add is one transaction holding the user's version lock, so it is
+# capped well above a grocery receipt
+MAX_BULK_PANTRY_ITEMS = 500
+
+
+def parse_within(within: str = Query("3d", regex=r"^\d{1,4}[hdw]$")) -> timedelta:
+    """Parses durations such as 12h, 3d or 2w."""
+    return timedelta(**{DURATION_UNITS[within[-1]]: int(within[:-1])})
+
 
 @router.post("/users/{user_id}/pantry_items", response_model=PantryItem)
 async def add_pantry_item(
     user_id: int,
     pantry_item: PantryItemCreate,
-    db: Session = Depends(db.get_db),
+    db: AsyncSession = Depends(db.get_async_db),
+):
+    return await async_crud.pantry.add(db, user_id, pantry_item)
+
+
+@router.post("/users/{user_id}/pantry_items/bulk", response_model=List[PantryItem])
+async def add_pantry_items(
+    user_id: int,
+    pantry_items: List[PantryItemCreate] = Body(..., max_items=MAX_BULK_PANTRY_ITEMS),
+    db: AsyncSession = Depends(db.get_async_db),
 ):
-    return crud.pantry.add(db, user_id, pantry_item)
+    return await async_crud.pantry.add_many(db, user_id, pantry_items)
 
 
 @router.get("/users/{user_id}/pantry_items", response_model=List[PantryItem])
 async def get_pantry_items(
     user_id: int,
-    db: Session = Depends(db.get_db),
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    stream: Optional[StreamFormat] = None,
+    db: AsyncSession = Depends(db.get_async_db),
+):
+    etag = list_etag(await async_crud.pantry.get_version(db, user_id), request)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    if stream is not None:
+        streaming = stream_response(
+            async_crud.pantry.stream(db, user_id), PantryItem, stream
+        )
+        streaming.headers[ETAG_HEADER] = etag
+        return streaming
+
+    response.headers[ETAG_HEADER] = etag
+    items, next_cursor = await async_crud.pantry.get_page(db, user_id, cursor, limit)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
+
+
+@router.get("/users/{user_id}/pantry_items/expiring", response_model=List[PantryItem])
+async def get_expiring_pantry_items(
+    user_id: int,
+    within: timedelta = Depends(parse_within),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(db.get_async_db),
 ):
-    return crud.pantry.get_all(db, user_id)
+    now = datetime.utcnow()
+    return await async_crud.pantry.get_expiring(db, user_id, now, now + within, limit)
 
 
 @router.put("/users/{user_id}/pantry_items", response_model=PantryItem)
 async def update_pantry_item(
     user_id: int,
     pantry_item: PantryItem,
-    db: Session = Depends(db.get_db),
+    db: AsyncSession = Depends(db.get_async_db),
 ):
-    return crud.pantry.update(db, user_id, pantry_item)
+    return await async_crud.pantry.update(db, user_id, pantry_item)
 
 
 @router.delete("/users/{user_id}/pantry_items")
 async def delete_pantry_item(
     user_id: int,
     pantry_item: PantryItem,
-    db: Session = Depends(db.get_db),
+    db: AsyncSession = Depends(db.get_async_db),
 ):
-    crud.pantry.delete(db, user_id, pantry_item)
+    await async_crud.pantry.delete(db, user_id, pantry_item)
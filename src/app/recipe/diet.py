@@ -0,0 +1,181 @@
+"""
+Diet compatibility of recipes, as bitmasks.
+
+Bit ``1 << preference.value`` of a recipe's diet_mask is set when the recipe
+suits that DietaryPreferenceEnum.  The mask is derived from ingredient names
+when a recipe is written, so filtering recipes for a household is a single
+predicate on one column: the recipe's mask must contain every bit of the
+household's combined preferences.
+
+Ingredients are classified by keyword, after normalize_name.  The lists err
+towards marking a recipe unsuitable.
+"""
+
+from typing import Iterable, List
+
+from app.food.names import normalize_name
+from app.household.schema import DietaryPreferenceEnum
+
+VEGETARIAN = 1 << DietaryPreferenceEnum.VEGETARIAN.value
+PESCATARIAN = 1 << DietaryPreferenceEnum.PESCATARIAN.value
+VEGAN = 1 << DietaryPreferenceEnum.VEGAN.value
+GLUTEN_FREE = 1 << DietaryPreferenceEnum.GLUTEN_FREE.value
+ALL_DIETS = VEGETARIAN | PESCATARIAN | VEGAN | GLUTEN_FREE
+
+MEAT = {
+    "bacon",
+    "beef",
+    "chicken",
+    "chorizo",
+    "duck",
+    "gelatin",
+    "ham",
+    "lamb",
+    "lard",
+    "mince",
+    "mutton",
+    "pancetta",
+    "pepperoni",
+    "pork",
+    "prosciutto",
+    "salami",
+    "sausage",
+    "steak",
+    "turkey",
+    "veal",
+    "venison",
+    "beef stock",
+    "chicken stock",
+    "chicken broth",
+    "beef broth",
+}
+SEAFOOD = {
+    "anchovy",
+    "clam",
+    "cod",
+    "crab",
+    "fish",
+    "haddock",
+    "lobster",
+    "mackerel",
+    "mussel",
+    "oyster",
+    "prawn",
+    "salmon",
+    "sardine",
+    "scallop",
+    "shrimp",
+    "squid",
+    "tilapia",
+    "trout",
+    "tuna",
+    "fish sauce",
+    "worcestershire sauce",
+}
+ANIMAL_PRODUCTS = {
+    "butter",
+    "buttermilk",
+    "cheese",
+    "cream",
+    "egg",
+    "ghee",
+    "honey",
+    "mayonnaise",
+    "milk",
+    "parmesan",
+    "mozzarella",
+    "cheddar",
+    "feta",
+    "ricotta",
+    "yogurt",
+    "yoghurt",
+}
+GLUTEN = {
+    "barley",
+    "bread",
+    "breadcrumb",
+    "bulgur",
+    "couscous",
+    "cracker",
+    "farro",
+    "flour",
+    "noodle",
+    "pasta",
+    "rye",
+    "seitan",
+    "semolina",
+    "spaghetti",
+    "spelt",
+    "tortilla",
+    "wheat",
+    "beer",
+    "soy sauce",
+}
+# Phrases that contain a keyword above without being what it names
+PLANT_BASED = [
+    "almond butter",
+    "almond flour",
+    "almond milk",
+    "apple butter",
+    "buckwheat flour",
+    "cocoa butter",
+    "coconut cream",
+    "coconut flour",
+    "coconut milk",
+    "corn flour",
+    "corn tortilla",
+    "cream of tartar",
+    "oat milk",
+    "peanut butter",
+    "rice flour",
+    "rice milk",
+    "rice noodle",
+    "soy milk",
+    "vegan",
+]
+
+# Diets each group of ingredients rules out
+_RULES_OUT = [
+    (MEAT, VEGETARIAN | PESCATARIAN | VEGAN),
+    (SEAFOOD, VEGETARIAN | VEGAN),
+    (ANIMAL_PRODUCTS, VEGAN),
+    (GLUTEN, GLUTEN_FREE),
+]
+
+
+def _terms(name: str) -> set:
+    """Words and adjacent word pairs of a normalized ingredient name."""
+    normalized = f" {normalize_name(name)} "
+    for phrase in PLANT_BASED:
+        normalized = normalized.replace(f" {phrase} ", " ")
+    words = normalized.split()
+    return set(words) | {" ".join(pair) for pair in zip(words, words[1:])}
+
+
+def diet_mask(ingredient_names: Iterable[str]) -> int:
+    """Returns the mask of diets that every one of the ingredients suits."""
+    mask = ALL_DIETS
+    for name in ingredient_names:
+        terms = _terms(name or "")
+        for keywords, diets in _RULES_OUT:
+            if diets == GLUTEN_FREE and "gluten free" in terms:
+                continue
+            if terms & keywords:
+                mask &= ~diets
+    return mask
+
+
+def preference_mask(preferences: Iterable[DietaryPreferenceEnum]) -> int:
+    mask = 0
+    for preference in preferences:
+        mask |= 1 << preference.value
+    return mask
+
+
+def compatible_masks(required: int) -> List[int]:
+    """
+    Every diet_mask that includes all of ``required``.  There are only 16
+    masks, so "diet_mask IN (...)" is an index-friendly way to say
+    "diet_mask & required = required".
+    """
+    return [mask for mask in range(ALL_DIETS + 1) if mask & required == required]
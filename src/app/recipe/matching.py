@@ -0,0 +1,92 @@
+from collections import OrderedDict, defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, Union
+
+from app.food.names import food_key
+
+
+class Match(NamedTuple):
+    recipe_id: int
+    missing: List[str]
+    coverage: float
+
+
+class IngredientIndex:
+    """
+    Inverted index from food to the recipes that use it.  Foods are keyed by
+    food_key, as on the shopping list, so aliases such as "scallion" for
+    "green onion" match here too.
+
+    Building it reads every ingredient, which is why IndexCache keeps it
+    between requests.  Matching a pantry then walks the posting lists of the
+    foods in the pantry and makes one pass over the recipes, rather than
+    comparing pantry x recipes x ingredients.
+    """
+
+    def __init__(
+        self,
+        recipe_ids: Iterable[int],
+        ingredients: Iterable[Tuple[int, Optional[int], str]],
+    ):
+        self.recipes_by_food: Dict[Union[int, str], Set[int]] = defaultdict(set)
+        self.names_by_recipe: Dict[int, Dict[Union[int, str], str]] = {
+            recipe_id: {} for recipe_id in recipe_ids
+        }
+
+        for recipe_id, food_id, name in ingredients:
+            food = food_key(food_id, name)
+            self.recipes_by_food[food].add(recipe_id)
+            self.names_by_recipe[recipe_id].setdefault(food, name)
+
+    def rank(
+        self, pantry_items: Iterable[Tuple[Optional[int], str]], max_missing: int
+    ) -> List[Match]:
+        """
+        Returns the recipes missing at most ``max_missing`` ingredients from the
+        pantry's (food_id, name) pairs, fewest missing first and then by
+        coverage.
+        """
+        pantry = {food_key(food_id, name) for food_id, name in pantry_items}
+
+        matched: Dict[int, int] = defaultdict(int)
+        for food in pantry:
+            for recipe_id in self.recipes_by_food.get(food, ()):
+                matched[recipe_id] += 1
+
+        ranked = []
+        for recipe_id, names in self.names_by_recipe.items():
+            if len(names) - matched[recipe_id] > max_missing:
+                continue
+            missing = [name for key, name in names.items() if key not in pantry]
+            coverage = matched[recipe_id] / len(names) if names else 1.0
+            ranked.append(Match(recipe_id, missing, coverage))
+
+        ranked.sort(key=lambda m: (len(m.missing), -m.coverage, m.recipe_id))
+        return ranked
+
+
+class IndexCache:
+    """
+    Bounded LRU cache of each user's IngredientIndex, tagged with the
+    recipe_version it was built at.  Any recipe write bumps the version, so a
+    lookup at a newer version misses and the index is rebuilt.
+    """
+
+    def __init__(self, maxsize: int = 1000):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[int, Tuple[int, IngredientIndex]]" = OrderedDict()
+
+    def get(self, user_id: int, version: int) -> Optional[IngredientIndex]:
+        entry = self._entries.get(user_id)
+        if entry is None or entry[0] != version:
+            return None
+        self._entries.move_to_end(user_id)
+        return entry[1]
+
+    def put(self, user_id: int, version: int, index: IngredientIndex):
+        self._entries[user_id] = (version, index)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
@@ -1,15 +1,38 @@
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, Text, text
+from sqlalchemy import (
+    DDL,
+    Column,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    event,
+    func,
+    text,
+)
 from sqlalchemy.orm import relationship
 
-from database.db import Base
+from database.db import Base, ServerTimestamp
+
+# Postgres search expressions.  Queries must use the same expressions as the
+# indexes below for the planner to use them.
+SEARCH_DOCUMENT = (
+    "(setweight(to_tsvector('english'::regconfig, coalesce(name, '')), 'A')"
+    " || setweight(to_tsvector('english'::regconfig,"
+    " coalesce(ingredient_names, '')), 'B')"
+    " || setweight(to_tsvector('english'::regconfig, coalesce(procedure, '')), 'C'))"
+)
+TRIGRAM_DOCUMENT = "(coalesce(name, '') || ' ' || coalesce(ingredient_names, ''))"
 
 
 class Ingredient(Base):
     __tablename__ = "ingredients"
 
     id = Column(Integer, primary_key=True)
-    recipe_id = Column(Integer, ForeignKey("recipes.id"))
+    recipe_id = Column(Integer, ForeignKey("recipes.id"), index=True)
     name = Column(String)
+    food_id = Column(Integer, ForeignKey("foods.id"), nullable=True, index=True)
     quantity = Column(Float)
     unit = Column(String)
 
@@ -22,8 +45,33 @@ class Recipe(Base):
     name = Column(String)
     servings = Column(Float)
     procedure = Column(Text, nullable=True)
-    timestamp = Column(
-        DateTime(timezone=False), server_default=text("CURRENT_TIMESTAMP")
+    # Space-separated ingredient names, kept by crud.recipe for search
+    ingredient_names = Column(Text, nullable=True)
+    # Diets the recipe suits, as app.recipe.diet bits, kept by crud.recipe
+    diet_mask = Column(Integer, nullable=False, default=0, server_default="0")
+    timestamp = Column(ServerTimestamp, server_default=text("CURRENT_TIMESTAMP"))
+    updated_at = Column(
+        ServerTimestamp, server_default=text("CURRENT_TIMESTAMP"), onupdate=func.now()
     )
+    # User's recipe_version as of the last write to this recipe
+    version = Column(Integer, nullable=False, default=0, server_default="0")
 
     ingredients = relationship(Ingredient, lazy="joined")
+
+    # Serve per-user listing in keyset order, delta sync and diet filtering
+    __table_args__ = (
+        Index("ix_recipes_user_id_timestamp_id", "user_id", "timestamp", "id"),
+        Index("ix_recipes_user_id_version", "user_id", "version"),
+        Index("ix_recipes_user_id_diet_mask", "user_id", "diet_mask"),
+    )
+
+
+for ddl in [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"CREATE INDEX ix_recipes_search_document ON recipes USING gin ({SEARCH_DOCUMENT})",
+    "CREATE INDEX ix_recipes_search_trigram ON recipes"
+    f" USING gin ({TRIGRAM_DOCUMENT} gin_trgm_ops)",
+]:
+    event.listen(
+        Recipe.__table__, "after_create", DDL(ddl).execute_if(dialect="postgresql")
+    )
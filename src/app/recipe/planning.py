@@ -0,0 +1,228 @@
+"""
+Meal planning that uses up the pantry before it spoils.
+
+A plan is a set of recipes, each scaled from its own servings to the number
+of people eating.  Its score is the pantry it uses up, weighted by urgency:
+each pantry item contributes the fraction of it that gets used times
+1 / (1 + days left before use_by).  Recipes draw on the soonest-expiring
+items of a food first, so the score of a plan is a sum of independent
+per-food terms and a change to one meal only re-scores the foods it touches.
+
+Planning is greedy, adding the recipe with the largest gain until the plan is
+full or the time budget runs out.  Optionally, swaps of meals in and out of
+the plan follow, while they improve the score and the budget lasts.
+"""
+
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import datetime
+from itertools import accumulate
+import random
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from app.shopping.aggregate import Line, keyed
+
+# Urgency of items without a use_by date
+NO_USE_BY_URGENCY = 0.05
+# Gains smaller than this are rounding noise
+EPSILON = 1e-9
+DEFAULT_TIME_BUDGET = 0.1
+
+
+class Stock(NamedTuple):
+    pantry_item_id: int
+    line: Line
+    use_by: Optional[datetime]
+
+
+class Meal(NamedTuple):
+    recipe_id: int
+    multiplier: float
+
+
+class Plan(NamedTuple):
+    meals: List[Meal]
+    # Fraction of each pantry item the plan uses, by pantry item id
+    used: Dict[int, float]
+    score: float
+
+
+class _Lot(NamedTuple):
+    pantry_item_id: int
+    amount: float
+    urgency: float
+
+
+def _urgency(use_by: Optional[datetime], now: datetime) -> float:
+    if use_by is None:
+        return NO_USE_BY_URGENCY
+    days_left = max((use_by - now).total_seconds() / 86400, 0)
+    return 1 / (1 + days_left)
+
+
+class MealPlanner:
+    def __init__(
+        self,
+        recipes: Iterable[Tuple[int, float, List[Line]]],
+        stock: Iterable[Stock],
+        people: float,
+        now: datetime,
+    ):
+        stock = [item for item in stock if item.line.quantity]
+        lots_by_key: Dict[tuple, list] = defaultdict(list)
+        for item, (key, amount, _) in zip(stock, keyed([item.line for item in stock])):
+            if amount > 0:
+                lots_by_key[key].append(
+                    (item.use_by is None, item.use_by, item.pantry_item_id, amount)
+                )
+
+        # Foods are numbered, since hashing (food, Dimension) keys dominates
+        # the cost of scoring otherwise
+        self.foods: Dict[tuple, int] = {}
+        self.lots: List[List[_Lot]] = []
+        # Running totals of amount and value over each food's lots, so the
+        # value of using a given amount is a binary search
+        self.ends: List[List[float]] = []
+        self.values: List[List[float]] = []
+        for key, lots in lots_by_key.items():
+            lots.sort()
+            lots = [
+                _Lot(pantry_item_id, amount, _urgency(use_by, now))
+                for _, use_by, pantry_item_id, amount in lots
+            ]
+            self.foods[key] = len(self.lots)
+            self.lots.append(lots)
+            self.ends.append(list(accumulate(lot.amount for lot in lots)))
+            self.values.append([0.0] + list(accumulate(lot.urgency for lot in lots)))
+
+        self.multipliers: Dict[int, float] = {}
+        # Scaled need per food number, only for foods in the pantry
+        self.needs: Dict[int, Dict[int, float]] = {}
+        for recipe_id, servings, ingredients in recipes:
+            multiplier = people / servings if servings and servings > 0 else 1.0
+            self.multipliers[recipe_id] = multiplier
+            needs = defaultdict(float)
+            ingredients = [line for line in ingredients if line.quantity]
+            for key, amount, _ in keyed(ingredients):
+                if key in self.foods and amount > 0:
+                    needs[self.foods[key]] += amount * multiplier
+            self.needs[recipe_id] = dict(needs)
+
+        self.recipes_by_food: List[List[int]] = [[] for _ in self.lots]
+        for recipe_id, needs in self.needs.items():
+            for food in needs:
+                self.recipes_by_food[food].append(recipe_id)
+
+    def _value(self, food: int, total: float) -> float:
+        """Value of using ``total`` of a food, soonest-expiring lots first."""
+        ends = self.ends[food]
+        if total <= 0:
+            return 0.0
+        if total >= ends[-1]:
+            return self.values[food][-1]
+        # Lots before i are used up, and lot i partly
+        i = bisect_right(ends, total)
+        lot = self.lots[food][i]
+        used = total - (ends[i - 1] if i else 0.0)
+        return self.values[food][i] + used / lot.amount * lot.urgency
+
+    def _gain(self, totals: Dict[int, Tuple[float, float]], remove, add) -> float:
+        gain = 0.0
+        foods = remove.keys() | add.keys() if remove else add.keys()
+        for food in foods:
+            total, value = totals.get(food, (0.0, 0.0))
+            changed = total - remove.get(food, 0.0) + add.get(food, 0.0)
+            gain += self._value(food, changed) - value
+        return gain
+
+    def _apply(self, totals: Dict[int, Tuple[float, float]], needs: Dict, sign: int):
+        for food, amount in needs.items():
+            total = totals.get(food, (0.0, 0.0))[0] + sign * amount
+            totals[food] = (total, self._value(food, total))
+
+    def plan(
+        self,
+        meals: int,
+        time_budget: float = DEFAULT_TIME_BUDGET,
+        local_search: bool = False,
+        seed: int = 0,
+    ) -> Plan:
+        """
+        Picks up to ``meals`` distinct recipes within ``time_budget`` seconds.
+        Recipes that would use nothing more from the pantry are left out, and
+        greedy picks stop at the deadline once there is one meal, so the plan
+        can be shorter.  With ``local_search``, what is left of the budget goes
+        on swaps; on the synthetic pantries in benchmarks.bench_meal_plan they
+        improve the greedy score by about 1% at best, so it is off by default.
+        """
+        deadline = time.perf_counter() + time_budget
+        # (total need, value) per food
+        totals: Dict[int, Tuple[float, float]] = {}
+        chosen: List[int] = []
+
+        # Adding a recipe only changes the gains of recipes sharing a food
+        gains = {
+            recipe_id: self._gain(totals, {}, needs)
+            for recipe_id, needs in self.needs.items()
+            if needs
+        }
+        while len(chosen) < meals and gains:
+            if chosen and time.perf_counter() >= deadline:
+                break
+            best = max(gains, key=lambda recipe_id: (gains[recipe_id], -recipe_id))
+            if gains[best] <= EPSILON:
+                break
+            del gains[best]
+            chosen.append(best)
+            self._apply(totals, self.needs[best], 1)
+            affected = {
+                recipe_id
+                for food in self.needs[best]
+                for recipe_id in self.recipes_by_food[food]
+            }
+            for recipe_id in affected & gains.keys():
+                gains[recipe_id] = self._gain(totals, {}, self.needs[recipe_id])
+
+        if local_search:
+            self._swap(chosen, totals, deadline, random.Random(seed))
+        return self._result(chosen, totals)
+
+    def _swap(self, chosen: List[int], totals, deadline: float, rng: random.Random):
+        """Swaps meals for unchosen recipes while that improves the score."""
+        candidates = sorted(recipe_id for recipe_id, n in self.needs.items() if n)
+        improved = True
+        while improved and time.perf_counter() < deadline:
+            improved = False
+            outside = [r for r in candidates if r not in chosen]
+            rng.shuffle(outside)
+            for slot in range(len(chosen)):
+                for recipe_id in outside:
+                    if time.perf_counter() >= deadline:
+                        break
+                    old = self.needs[chosen[slot]]
+                    new = self.needs[recipe_id]
+                    if self._gain(totals, old, new) > EPSILON:
+                        self._apply(totals, old, -1)
+                        self._apply(totals, new, 1)
+                        outside[outside.index(recipe_id)] = chosen[slot]
+                        chosen[slot] = recipe_id
+                        improved = True
+                        break
+
+    def _result(self, chosen: List[int], totals: Dict[int, Tuple]) -> Plan:
+        used: Dict[int, float] = {}
+        score = 0.0
+        for food, (total, _) in totals.items():
+            for lot in self.lots[food]:
+                if total <= EPSILON:
+                    break
+                amount = min(total, lot.amount)
+                used[lot.pantry_item_id] = amount / lot.amount
+                score += amount / lot.amount * lot.urgency
+                total -= amount
+        return Plan(
+            [Meal(recipe_id, self.multipliers[recipe_id]) for recipe_id in chosen],
+            used,
+            score,
+        )
@@ -1,10 +1,18 @@
-from typing import List
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from fastapi import APIRouter, Body, Depends, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.routers import get_authenticated_user
-from .schema import Recipe, RecipeCreate
-from database import crud, db
+from app.etag import ETAG_HEADER, list_etag, not_modified
+from app.streaming import StreamFormat, stream_response
+from .schema import CookableRecipe, MealPlan, Recipe, RecipeCreate
+from database import async_crud, db
+from database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
+
+# Three meals a day for a week
+MAX_MEALS = 21
+# A bulk import is one transaction holding the user's version lock
+MAX_BULK_RECIPES = 1000
 
 router = APIRouter(dependencies=[Depends(get_authenticated_user)])
 
@@ -13,32 +21,103 @@ router = APIRouter(dependencies=[Depends(get_authenticated_user)])
 async def add_recipe(
     user_id: int,
     recipe: RecipeCreate,
-    db: Session = Depends(db.get_db),
+    db: AsyncSession = Depends(db.get_async_db),
+):
+    return await async_crud.recipe.add(db, user_id, recipe)
+
+
+@router.post("/users/{user_id}/recipes/bulk", response_model=List[Recipe])
+async def add_recipes(
+    user_id: int,
+    recipes: List[RecipeCreate] = Body(..., max_items=MAX_BULK_RECIPES),
+    db: AsyncSession = Depends(db.get_async_db),
 ):
-    return crud.recipe.add(db, user_id, recipe)
+    return await async_crud.recipe.add_many(db, user_id, recipes)
 
 
 @router.get("/users/{user_id}/recipes", response_model=List[Recipe])
 async def get_recipes(
     user_id: int,
-    db: Session = Depends(db.get_db),
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    stream: Optional[StreamFormat] = None,
+    household_safe: bool = False,
+    db: AsyncSession = Depends(db.get_async_db),
+):
+    version = await async_crud.recipe.get_version(db, user_id)
+    required_diets = 0
+    if household_safe:
+        # Preference changes bump the household's version, not the recipes'
+        household_version = await async_crud.household.get_version(db, user_id)
+        version = f"{version}.{household_version}"
+        required_diets = await async_crud.household.get_required_diets(db, user_id)
+
+    etag = list_etag(version, request)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    if stream is not None:
+        streaming = stream_response(
+            async_crud.recipe.stream(db, user_id, required_diets), Recipe, stream
+        )
+        streaming.headers[ETAG_HEADER] = etag
+        return streaming
+
+    response.headers[ETAG_HEADER] = etag
+    recipes, next_cursor = await async_crud.recipe.get_page(
+        db, user_id, cursor, limit, required_diets
+    )
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return recipes
+
+
+@router.get("/users/{user_id}/recipes/search", response_model=List[Recipe])
+async def search_recipes(
+    user_id: int,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(db.get_async_db),
+):
+    return await async_crud.recipe.search(db, user_id, q, limit)
+
+
+@router.get("/users/{user_id}/recipes/cookable", response_model=List[CookableRecipe])
+async def get_cookable_recipes(
+    user_id: int,
+    max_missing: int = Query(0, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(db.get_async_db),
+):
+    return await async_crud.recipe.get_cookable(db, user_id, max_missing, limit)
+
+
+@router.get("/users/{user_id}/recipes/meal_plan", response_model=MealPlan)
+async def get_meal_plan(
+    user_id: int,
+    meals: int = Query(7, ge=1, le=MAX_MEALS),
+    people: Optional[float] = Query(None, gt=0),
+    db: AsyncSession = Depends(db.get_async_db),
 ):
-    return crud.recipe.get_all(db, user_id)
+    return await async_crud.recipe.get_meal_plan(db, user_id, meals, people)
 
 
 @router.put("/users/{user_id}/recipes", response_model=Recipe)
 async def update_recipe(
     user_id: int,
     recipe: Recipe,
-    db: Session = Depends(db.get_db),
+    db: AsyncSession = Depends(db.get_async_db),
 ):
-    return crud.recipe.update(db, user_id, recipe)
+    return await async_crud.recipe.update(db, user_id, recipe)
 
 
 @router.delete("/users/{user_id}/recipes")
 async def delete_recipe(
     user_id: int,
     recipe: Recipe,
-    db: Session = Depends(db.get_db),
+    db: AsyncSession = Depends(db.get_async_db),
 ):
-    crud.recipe.delete(db, user_id, recipe)
+    await async_crud.recipe.delete(db, user_id, recipe)
@@ -39,3 +39,26 @@ class Recipe(RecipeBase):
 
     class Config:
         orm_mode = True
+
+
+class CookableRecipe(BaseModel):
+    recipe: Recipe
+    missing: List[str]
+    coverage: float
+
+
+class PlannedMeal(BaseModel):
+    recipe: Recipe
+    # Scales the recipe from its servings to the number of people eating
+    multiplier: float
+
+
+class PantryItemUse(BaseModel):
+    pantry_item_id: int
+    fraction: float
+
+
+class MealPlan(BaseModel):
+    meals: List[PlannedMeal]
+    pantry_items_used: List[PantryItemUse]
+    score: float
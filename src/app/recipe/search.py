@@ -0,0 +1,90 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.food.names import normalize_name
+
+# Field weights, matching the A/B/C weights of the Postgres search document
+NAME_WEIGHT = 1.0
+INGREDIENT_WEIGHT = 0.4
+PROCEDURE_WEIGHT = 0.1
+
+PREFIX_MATCH = 0.75
+FUZZY_MATCH = 0.5
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """True if ``a`` becomes ``b`` with at most one insertion, deletion,
+    substitution or adjacent transposition."""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        return (
+            a[i + 1 :] == b[i + 1 :]
+            or a[i : i + 2] == b[i : i + 2][::-1]
+            and a[i + 2 :] == b[i + 2 :]
+        )
+    return a[i:] == b[i + 1 :]
+
+
+class RecipeSearchIndex:
+    """
+    In-process inverted index over recipe names, ingredient names and
+    procedures.  Stands in for the tsvector and trigram indexes on databases
+    without them, such as SQLite.
+
+    Every query term must match a word in the recipe, exactly, as a prefix or
+    within one typo.  Recipes are ranked by match quality times the weight of
+    the field it matched in.
+    """
+
+    def __init__(self, recipes: Iterable[Tuple[int, str, str, Optional[str]]]):
+        self.postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+
+        for recipe_id, name, ingredient_names, procedure in recipes:
+            for text, weight in [
+                (name, NAME_WEIGHT),
+                (ingredient_names, INGREDIENT_WEIGHT),
+                (procedure, PROCEDURE_WEIGHT),
+            ]:
+                for word in normalize_name(text or "").split():
+                    weights = self.postings[word]
+                    weights[recipe_id] = max(weights.get(recipe_id, 0), weight)
+
+    def _matches(self, term: str) -> Dict[int, float]:
+        scores: Dict[int, float] = {}
+        for word, weights in self.postings.items():
+            if word == term:
+                quality = 1.0
+            elif len(term) >= 3 and word.startswith(term):
+                quality = PREFIX_MATCH
+            elif len(term) >= 4 and _within_one_edit(term, word):
+                quality = FUZZY_MATCH
+            else:
+                continue
+            for recipe_id, weight in weights.items():
+                scores[recipe_id] = max(scores.get(recipe_id, 0), quality * weight)
+        return scores
+
+    def search(self, query: str, limit: int) -> List[int]:
+        """Returns the ids of the best ``limit`` recipes, best first."""
+        terms = normalize_name(query).split()
+        if not terms:
+            return []
+
+        scores = self._matches(terms[0])
+        for term in terms[1:]:
+            matches = self._matches(term)
+            scores = {
+                recipe_id: score + matches[recipe_id]
+                for recipe_id, score in scores.items()
+                if recipe_id in matches
+            }
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [recipe_id for recipe_id, _ in ranked[:limit]]
@@ -0,0 +1,69 @@
+"""
+Shopping list arithmetic: what a set of recipes needs, minus what the pantry
+holds.
+
+Quantities are summed per food and per dimension (mass, volume or count)
+after converting to grams, millilitres or a count, so "1 cup" and "100 ml" of
+milk add up.  Quantities in units that aren't recognised are only summed with
+the same unit.  Everything is done in one pass over each list.
+"""
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from app.food import units
+from app.food.names import food_key
+
+# Shortfalls smaller than this are rounding noise
+EPSILON = 1e-6
+
+
+class Line(NamedTuple):
+    food_id: Optional[int]
+    name: str
+    quantity: float
+    unit: str
+
+
+def keyed(lines: List[Line]) -> Iterable[Tuple[tuple, float, Line]]:
+    """Yields ((food, measure), canonical amount, line) for each line."""
+    canonical = units.to_canonical(
+        [line.quantity for line in lines], [line.unit for line in lines]
+    )
+    for line, quantity in zip(lines, canonical):
+        food = food_key(line.food_id, line.name)
+        if quantity is None:
+            yield (food, line.unit.strip().lower()), line.quantity, line
+        else:
+            yield (food, quantity.dimension), quantity.amount, line
+
+
+def shortfall(needed: Iterable[Line], stock: Iterable[Line]) -> List[Line]:
+    """
+    Sums ``needed`` per food and measure, subtracts matching ``stock``, and
+    returns what is still missing.  Each missing food is given in the unit of
+    the first needed line for it, and the list is sorted by name.
+    """
+    needed = [line for line in needed if line.quantity is not None]
+    stock = [line for line in stock if line.quantity is not None]
+
+    totals: Dict[tuple, float] = {}
+    first: Dict[tuple, Line] = {}
+    for key, amount, line in keyed(needed):
+        totals[key] = totals.get(key, 0.0) + amount
+        first.setdefault(key, line)
+
+    for key, amount, _ in keyed(stock):
+        if key in totals:
+            totals[key] -= amount
+
+    missing = []
+    for key, total in totals.items():
+        if total <= EPSILON:
+            continue
+        line = first[key]
+        unit = units.lookup(line.unit)
+        factor = unit.factor if unit is not None else 1.0
+        missing.append(line._replace(quantity=round(total / factor, 3)))
+
+    missing.sort(key=lambda line: (line.name.lower(), line.unit))
+    return missing
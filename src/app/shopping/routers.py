@@ -0,0 +1,19 @@
+from typing import List
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.routers import get_authenticated_user
+from .schema import ShoppingListItem, ShoppingListRequest
+from database import async_crud, db
+
+router = APIRouter(dependencies=[Depends(get_authenticated_user)])
+
+
+@router.post("/users/{user_id}/shopping_list", response_model=List[ShoppingListItem])
+async def get_shopping_list(
+    user_id: int,
+    request: ShoppingListRequest,
+    db: AsyncSession = Depends(db.get_async_db),
+):
+    return await async_crud.shopping.get_list(db, user_id, request.recipes)
@@ -0,0 +1,22 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+MAX_RECIPES = 100
+
+
+class ShoppingListRecipe(BaseModel):
+    recipe_id: int
+    # Scales the recipe's quantities, e.g. 2 to cook it twice over
+    multiplier: float = Field(1, gt=0)
+
+
+class ShoppingListRequest(BaseModel):
+    recipes: List[ShoppingListRecipe] = Field(..., min_items=1, max_items=MAX_RECIPES)
+
+
+class ShoppingListItem(BaseModel):
+    food_id: Optional[int]
+    name: str
+    quantity: float
+    unit: str
@@ -0,0 +1,66 @@
+import logging
+
+from app.config import Settings
+from app.recipe.schema import IngredientCreate, RecipeCreate
+from app.user.schema import UserCreate
+from database import crud, db
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary key for the advisory lock, shared by every worker
+STARTUP_LOCK_ID = 7_305_611
+
+
+def seed_test_data(session):
+    existing, _ = crud.user.get_page(session, limit=1)
+    if len(existing) > 0:
+        return
+
+    michelle = UserCreate(
+        first_name="Michelle",
+        last_name="Tolfa",
+        email="michelle.tolfa@gmail.com",
+    )
+    db_michelle = crud.user.create(session, michelle)
+
+    alex = UserCreate(
+        first_name="Alex",
+        last_name="Cahoon",
+        email="cahoon.alex@gmail.com",
+    )
+    crud.user.create(session, alex)
+
+    hannah = UserCreate(
+        first_name="Hannah",
+        last_name="Horvath",
+        email="writerGrl@hotmail.com",
+    )
+    crud.user.create(session, hannah)
+
+    milk = IngredientCreate(name="milk", quantity=1, unit="liter")
+    froot_loops = IngredientCreate(name="froot loops", quantity=2, unit="cups")
+    cereal = RecipeCreate(
+        name="cereal",
+        procedure="pour the milk",
+        ingredients=[milk, froot_loops],
+        servings=4,
+    )
+    crud.recipe.add(session, db_michelle.id, cereal)
+
+
+def run_startup_tasks(settings: Settings):
+    """
+    One-off work for a deployment, run from the app lifespan.  Schema
+    migrations are not part of it; those run through alembic before the
+    workers start.
+    """
+    if not settings.seed_test_data:
+        return
+
+    with db.get_engine().connect() as connection:
+        with db.try_advisory_lock(connection, STARTUP_LOCK_ID) as acquired:
+            if not acquired:
+                logger.info("Startup tasks are running in another worker")
+                return
+            with db.SessionLocal(bind=connection) as session:
+                seed_test_data(session)
@@ -0,0 +1,54 @@
+from enum import Enum
+from typing import AsyncIterator, Type
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+# Rows serialized per chunk written to the client
+CHUNK_SIZE = 100
+
+
+class StreamFormat(str, Enum):
+    JSON = "json"
+    NDJSON = "ndjson"
+
+
+async def _chunks(rows: AsyncIterator, schema: Type[BaseModel]):
+    chunk = []
+    async for row in rows:
+        chunk.append(schema.from_orm(row).json())
+        if len(chunk) == CHUNK_SIZE:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def _json_array(rows: AsyncIterator, schema: Type[BaseModel]):
+    yield "["
+    first = True
+    async for chunk in _chunks(rows, schema):
+        yield ("" if first else ",") + ",".join(chunk)
+        first = False
+    yield "]"
+
+
+async def _ndjson(rows: AsyncIterator, schema: Type[BaseModel]):
+    async for chunk in _chunks(rows, schema):
+        yield "".join(line + "\n" for line in chunk)
+
+
+def stream_response(
+    rows: AsyncIterator,
+    schema: Type[BaseModel],
+    format: StreamFormat,
+) -> StreamingResponse:
+    """
+    Serializes ``rows`` as they arrive so that only one chunk of them is held
+    in memory at a time, however many rows there are.
+    """
+    if format == StreamFormat.NDJSON:
+        return StreamingResponse(
+            _ndjson(rows, schema), media_type="application/x-ndjson"
+        )
+    return StreamingResponse(_json_array(rows, schema), media_type="application/json")
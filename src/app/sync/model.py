@@ -0,0 +1,23 @@
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, text
+
+from database.db import Base, ServerTimestamp
+
+
+class Tombstone(Base):
+    """
+    Records a deleted pantry item, recipe or household member so /sync can
+    tell clients to drop it.
+    """
+
+    __tablename__ = "tombstones"
+
+    id = Column(Integer, primary_key=True)
+    # Owner of the deleted row: the user, or for household members the head
+    # of household
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    kind = Column(String, nullable=False)
+    object_id = Column(Integer, nullable=False)
+    version = Column(Integer, nullable=False)
+    deleted_at = Column(ServerTimestamp, server_default=text("CURRENT_TIMESTAMP"))
+
+    __table_args__ = (Index("ix_tombstones_user_id_version", "user_id", "version"),)
@@ -0,0 +1,19 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.routers import get_authenticated_user
+from .schema import SyncChanges
+from database import async_crud, db
+
+router = APIRouter(dependencies=[Depends(get_authenticated_user)])
+
+
+@router.get("/users/{user_id}/sync", response_model=SyncChanges)
+async def get_changes(
+    user_id: int,
+    since: Optional[str] = None,
+    db: AsyncSession = Depends(db.get_async_db),
+):
+    return await async_crud.sync.get_changes(db, user_id, since)
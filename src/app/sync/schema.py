@@ -0,0 +1,26 @@
+from enum import Enum
+from typing import List
+
+from pydantic import BaseModel
+
+from app.household.schema import HouseholdMember
+from app.pantry.schema import PantryItem
+from app.recipe.schema import Recipe
+
+
+class SyncKind(str, Enum):
+    PANTRY_ITEM = "pantry_item"
+    RECIPE = "recipe"
+    HOUSEHOLD_MEMBER = "household_member"
+
+
+class SyncChanges(BaseModel):
+    token: str
+    # True when this is a full snapshot that replaces the client's copy
+    reset: bool
+    pantry_items: List[PantryItem]
+    recipes: List[Recipe]
+    household_members: List[HouseholdMember]
+    deleted_pantry_items: List[int]
+    deleted_recipes: List[int]
+    deleted_household_members: List[int]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Index, Integer, String, func
 
 from database.db import Base
 
@@ -11,3 +11,13 @@ class User(Base):
     first_name = Column(String)
     last_name = Column(String)
     email = Column(String)
+
+    # Bumped by every write to the user's pantry, recipes or (as head of
+    # household) household members.  The list endpoints use them as ETags and
+    # /sync uses them as change sequence numbers.
+    pantry_version = Column(Integer, nullable=False, default=0, server_default="0")
+    recipe_version = Column(Integer, nullable=False, default=0, server_default="0")
+    household_version = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Logins look users up by case-insensitive email
+    __table_args__ = (Index("ix_users_email_lower", func.lower(email)),)
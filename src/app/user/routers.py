@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.routers import get_authenticated_user
 
 from .schema import User, UserCreate
-from database import crud, db
-from typing import List
+from database import async_crud, db
+from database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
+from typing import List, Optional
 
 router = APIRouter(dependencies=[Depends(get_authenticated_user)])
 
@@ -13,31 +14,35 @@ router = APIRouter(dependencies=[Depends(get_authenticated_user)])
 @router.post("/users", response_model=User)
 async def add_user(
     user: UserCreate,
-    session: Session = Depends(db.get_db),
+    session: AsyncSession = Depends(db.get_async_db),
 ):
-    return crud.user.create(session, user)
+    return await async_crud.user.create(session, user)
 
 
 @router.get("/users", response_model=List[User])
 async def read_users(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(db.get_db),
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(db.get_async_db),
 ):
-    return crud.user.get_all(db, skip=skip, limit=limit)
+    users, next_cursor = await async_crud.user.get_page(db, cursor, limit)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return users
 
 
 @router.get("/users/{user_id}", response_model=User)
 async def read_user_by_id(
     user_id: int,
-    session: Session = Depends(db.get_db),
+    session: AsyncSession = Depends(db.get_async_db),
 ):
-    return crud.user.get(session, user_id)
+    return await async_crud.user.get(session, user_id)
 
 
 @router.put("/users", response_model=User)
 async def update_user(
     user: User,
-    session: Session = Depends(db.get_db),
+    session: AsyncSession = Depends(db.get_async_db),
 ):
-    return crud.user.update(session, user)
+    return await async_crud.user.update(session, user)
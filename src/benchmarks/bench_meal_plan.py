@@ -0,0 +1,142 @@
+"""
+Times the meal planner on a synthetic pantry, and how much local search adds
+to the greedy plan for each time budget.
+
+    python -m benchmarks.bench_meal_plan [--recipes 500] [--items 1000]
+        [--foods 400] [--meals 7] [--rounds 3] [--database-url postgresql://...]
+
+The first part runs app.recipe.planning.MealPlanner in memory, greedy alone
+and with local search.  Fewer --foods means more overlap between recipes,
+which is where swaps have the most room to help.  The second
+runs crud.recipe.get_meal_plan end to end, including the queries, against a
+throwaway SQLite file or the given database.
+"""
+
+import argparse
+from datetime import datetime, timedelta
+import random
+
+from app.pantry.schema import PantryItemCreate, StorageLocation
+from app.recipe.planning import MealPlanner, Stock
+from app.recipe.schema import IngredientCreate, RecipeCreate
+from app.shopping.aggregate import Line
+from benchmarks.common import bench_database, report, time_rounds
+from database import crud
+
+UNITS = [("g", 50, 500), ("ml", 50, 500), ("each", 1, 6)]
+SEARCH_BUDGETS = [0.05, 0.2, 1.0]
+
+
+def make_data(recipes: int, items: int, foods: int, seed: int = 0):
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    units = {f"food {i}": rng.choice(UNITS) for i in range(foods)}
+    names = list(units)
+
+    new_recipes = []
+    for i in range(recipes):
+        ingredients = []
+        for name in rng.sample(names, rng.randint(4, 12)):
+            unit, low, high = units[name]
+            quantity = rng.randint(low, high) / 4
+            ingredients.append(
+                IngredientCreate(name=name, quantity=quantity, unit=unit)
+            )
+        new_recipes.append(
+            RecipeCreate(
+                name=f"recipe {i}",
+                servings=rng.choice([1, 2, 4, 6]),
+                procedure="cook",
+                ingredients=ingredients,
+            )
+        )
+
+    pantry_items = []
+    for i in range(items):
+        name = rng.choice(names)
+        unit, low, high = units[name]
+        pantry_items.append(
+            PantryItemCreate(
+                name=name,
+                quantity=rng.randint(low, high),
+                unit=unit,
+                storage_location=StorageLocation.PANTRY,
+                date_added=now,
+                use_by=now + timedelta(days=rng.random() * 30),
+            )
+        )
+    return new_recipes, pantry_items
+
+
+def planner_for(recipes, pantry_items, people: float):
+    return MealPlanner(
+        (
+            (
+                i,
+                recipe.servings,
+                [Line(None, x.name, x.quantity, x.unit) for x in recipe.ingredients],
+            )
+            for i, recipe in enumerate(recipes)
+        ),
+        [
+            Stock(i, Line(None, item.name, item.quantity, item.unit), item.use_by)
+            for i, item in enumerate(pantry_items)
+        ],
+        people,
+        datetime.utcnow(),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--recipes", type=int, default=500)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--foods", type=int, default=400)
+    parser.add_argument("--meals", type=int, default=7)
+    parser.add_argument("--people", type=float, default=2)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+
+    recipes, pantry_items = make_data(args.recipes, args.items, args.foods)
+
+    report(
+        "setup",
+        time_rounds(
+            args.rounds, lambda: planner_for(recipes, pantry_items, args.people)
+        ),
+        args.recipes,
+        "recipes",
+    )
+    planner = planner_for(recipes, pantry_items, args.people)
+    plans = []
+    timings = time_rounds(args.rounds, lambda: plans.append(planner.plan(args.meals)))
+    report("greedy", timings, args.meals, "meals")
+    greedy_score = plans[-1].score
+    print(f"{'score':>10}: {greedy_score:.3f}")
+    for budget in SEARCH_BUDGETS:
+        plans = []
+        timings = time_rounds(
+            args.rounds,
+            lambda: plans.append(planner.plan(args.meals, budget, local_search=True)),
+        )
+        report(f"swaps {budget:g}s", timings, args.meals, "meals")
+        gain = plans[-1].score / greedy_score - 1 if greedy_score else 0.0
+        print(f"{'score':>10}: {plans[-1].score:.3f} ({gain:+.2%} on greedy)")
+
+    with bench_database(args.database_url) as Session:
+        with Session() as session:
+            crud.recipe.add_many(session, Session.user_id, recipes)
+            crud.pantry.add_many(session, Session.user_id, pantry_items)
+
+        def end_to_end():
+            with Session() as session:
+                crud.recipe.get_meal_plan(
+                    session, Session.user_id, args.meals, args.people
+                )
+
+        report("end to end", time_rounds(args.rounds, end_to_end), args.meals, "meals")
+
+
+if __name__ == "__main__":
+    main()
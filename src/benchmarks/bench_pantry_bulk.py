@@ -0,0 +1,61 @@
+"""
+Compares adding pantry items one at a time (crud.pantry.add) with the bulk
+path (crud.pantry.add_many).
+
+    python -m benchmarks.bench_pantry_bulk [--items 80] [--rounds 20]
+        [--database-url postgresql://...]
+
+Defaults to a throwaway SQLite file.  Point it at a scratch Postgres database
+to measure the multi-row INSERT ... RETURNING path.
+"""
+
+import argparse
+from datetime import datetime, timedelta
+
+from app.pantry.schema import PantryItemCreate, StorageLocation
+from benchmarks.common import bench_database, report, time_rounds
+from database import crud
+
+
+def make_items(count: int):
+    now = datetime.utcnow()
+    return [
+        PantryItemCreate(
+            name=f"item {i}",
+            quantity=i % 5 + 1,
+            unit="each",
+            storage_location=StorageLocation.PANTRY,
+            date_added=now,
+            use_by=now + timedelta(days=i % 14),
+        )
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=80)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+
+    items = make_items(args.items)
+
+    with bench_database(args.database_url) as Session:
+
+        def per_item():
+            with Session() as session:
+                for item in items:
+                    crud.pantry.add(session, Session.user_id, item)
+
+        def bulk():
+            with Session() as session:
+                crud.pantry.add_many(session, Session.user_id, items)
+
+        single = report("per item", time_rounds(args.rounds, per_item), args.items)
+        batched = report("bulk", time_rounds(args.rounds, bulk), args.items)
+        print(f"{'speedup':>10}: {single / batched:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
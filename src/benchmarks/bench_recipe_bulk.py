@@ -0,0 +1,65 @@
+"""
+Compares importing recipes one at a time (crud.recipe.add) with the bulk path
+(crud.recipe.add_many).
+
+    python -m benchmarks.bench_recipe_bulk [--recipes 1000] [--ingredients 8]
+        [--rounds 3] [--database-url postgresql://...]
+
+Defaults to a throwaway SQLite file.  Point it at a scratch Postgres database
+to measure the multi-row INSERT ... RETURNING path.
+"""
+
+import argparse
+
+from app.recipe.schema import IngredientCreate, RecipeCreate
+from benchmarks.common import bench_database, report, time_rounds
+from database import crud
+
+
+def make_recipes(count: int, ingredients: int):
+    return [
+        RecipeCreate(
+            name=f"recipe {i}",
+            servings=4,
+            procedure="mix and bake",
+            ingredients=[
+                IngredientCreate(name=f"ingredient {j}", quantity=j + 1, unit="g")
+                for j in range(ingredients)
+            ],
+        )
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--recipes", type=int, default=1000)
+    parser.add_argument("--ingredients", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+
+    recipes = make_recipes(args.recipes, args.ingredients)
+
+    with bench_database(args.database_url) as Session:
+
+        def per_recipe():
+            with Session() as session:
+                for recipe in recipes:
+                    crud.recipe.add(session, Session.user_id, recipe)
+
+        def bulk():
+            with Session() as session:
+                crud.recipe.add_many(session, Session.user_id, recipes)
+
+        single = report(
+            "per recipe", time_rounds(args.rounds, per_recipe), args.recipes, "recipes"
+        )
+        batched = report(
+            "bulk", time_rounds(args.rounds, bulk), args.recipes, "recipes"
+        )
+        print(f"{'speedup':>10}: {single / batched:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Measures time to first request for a fresh worker: importing app.main,
+running the lifespan startup tasks, and serving one request.
+
+    python -m benchmarks.bench_startup [--rounds 10]
+        [--database-url postgresql://...]
+
+Each round starts a new interpreter, as a new uvicorn worker would.  Rounds
+run in development mode, where the worker checks whether the database needs
+seeding, and in production mode, where it skips that check.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+from benchmarks.common import bench_database, report
+
+WORKER = """
+import time
+start = time.perf_counter()
+from fastapi.testclient import TestClient
+from app.main import app
+with TestClient(app) as client:
+    client.get("/docs").raise_for_status()
+print(time.perf_counter() - start)
+"""
+
+
+def start_worker(database_url: str, environment: str) -> float:
+    env = dict(
+        os.environ,
+        DATABASE_URL=database_url,
+        ENVIRONMENT=environment,
+        TOKEN_KEY="bench",
+        OAUTH_IOS_CLIENT_ID="bench",
+        OAUTH_ANDROID_CLIENT_ID="bench",
+        OAUTH_DESKTOP_CLIENT_ID="bench",
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", WORKER],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+
+    with bench_database(args.database_url) as Session:
+        url = Session.kw["bind"].url.render_as_string(hide_password=False)
+        for environment in ("development", "production"):
+            timings = [start_worker(url, environment) for _ in range(args.rounds)]
+            report(environment, timings, 1, "worker")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+from contextlib import contextmanager
+import os
+import statistics
+import tempfile
+import time
+from typing import Optional
+
+import sqlalchemy as sa
+from sqlalchemy.orm import sessionmaker
+
+import app.food.model  # noqa: F401
+import app.household.model  # noqa: F401
+import app.notifications.model  # noqa: F401
+import app.pantry.model  # noqa: F401
+import app.recipe.model  # noqa: F401
+import app.sync.model  # noqa: F401
+import app.user.model as user_model
+from database import db
+
+
+@contextmanager
+def bench_database(url: Optional[str] = None):
+    """
+    Yields a sessionmaker for ``url``, or for a throwaway SQLite file when no
+    url is given, with the schema created and one user to own the data.
+    """
+    tmpdir = None
+    if url is None:
+        tmpdir = tempfile.TemporaryDirectory()
+        url = f"sqlite:///{os.path.join(tmpdir.name, 'bench.db')}"
+
+    engine = sa.create_engine(url)
+    db.Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+
+    with Session() as session:
+        user = user_model.User(first_name="Bench", last_name="Mark", email="b@m")
+        session.add(user)
+        session.commit()
+        Session.user_id = user.id
+
+    try:
+        yield Session
+    finally:
+        engine.dispose()
+        if tmpdir is not None:
+            tmpdir.cleanup()
+
+
+def time_rounds(rounds: int, fn):
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(label: str, timings, count: int, unit: str = "items"):
+    median = statistics.median(timings)
+    print(
+        f"{label:>10}: median {median * 1000:9.2f} ms per {count} {unit} "
+        f"({median / count * 1e6:8.1f} us each)"
+    )
+    return median
@@ -0,0 +1,261 @@
+"""
+Async versions of the ``crud`` operations.
+
+Each one runs the matching ``crud`` function against the ``AsyncSession``'s
+sync session through ``run_sync``, so the query logic stays in ``crud`` while
+the database round-trips are awaited instead of blocking the event loop.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.batch.schema as batch_schema
+import app.household.schema as household_schema
+import app.pantry.schema as pantry_schema
+import app.recipe.schema as recipe_schema
+import app.shopping.schema as shopping_schema
+import app.user.schema as user_schema
+from database import crud
+from database.pagination import DEFAULT_PAGE_SIZE
+
+
+class user:
+    @staticmethod
+    async def get(db: AsyncSession, id: int):
+        return await db.run_sync(crud.user.get, id)
+
+    @staticmethod
+    async def get_page(
+        db: AsyncSession,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ):
+        return await db.run_sync(crud.user.get_page, cursor, limit)
+
+    @staticmethod
+    async def create(db: AsyncSession, user: user_schema.UserCreate):
+        return await db.run_sync(crud.user.create, user)
+
+    @staticmethod
+    async def update(db: AsyncSession, updated_user: user_schema.User):
+        return await db.run_sync(crud.user.update, updated_user)
+
+
+class household:
+    @staticmethod
+    async def add_member(
+        db: AsyncSession,
+        head_of_household_id: int,
+        member: household_schema.HouseholdMemberCreate,
+    ):
+        return await db.run_sync(
+            crud.household.add_member, head_of_household_id, member
+        )
+
+    @staticmethod
+    async def get_all(db: AsyncSession, user_id: int):
+        return await db.run_sync(crud.household.get_all, user_id)
+
+    @staticmethod
+    async def get_version(db: AsyncSession, user_id: int):
+        return await db.run_sync(crud.household.get_version, user_id)
+
+    @staticmethod
+    async def get_required_diets(db: AsyncSession, user_id: int):
+        return await db.run_sync(crud.household.get_required_diets, user_id)
+
+    @staticmethod
+    async def update(db: AsyncSession, member: household_schema.HouseholdMember):
+        return await db.run_sync(crud.household.update, member)
+
+    @staticmethod
+    async def remove_from_household(
+        db: AsyncSession,
+        member: household_schema.HouseholdMember,
+    ):
+        return await db.run_sync(crud.household.remove_from_household, member)
+
+
+class pantry:
+    @staticmethod
+    async def add(
+        db: AsyncSession,
+        user_id: int,
+        pantry_item: pantry_schema.PantryItemCreate,
+    ):
+        return await db.run_sync(crud.pantry.add, user_id, pantry_item)
+
+    @staticmethod
+    async def add_many(
+        db: AsyncSession,
+        user_id: int,
+        pantry_items: List[pantry_schema.PantryItemCreate],
+    ):
+        return await db.run_sync(crud.pantry.add_many, user_id, pantry_items)
+
+    @staticmethod
+    async def get_all(db: AsyncSession, user_id: int):
+        return await db.run_sync(crud.pantry.get_all, user_id)
+
+    @staticmethod
+    async def get_version(db: AsyncSession, user_id: int):
+        return await db.run_sync(crud.pantry.get_version, user_id)
+
+    @staticmethod
+    async def get_page(
+        db: AsyncSession,
+        user_id: int,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ):
+        return await db.run_sync(crud.pantry.get_page, user_id, cursor, limit)
+
+    @staticmethod
+    async def get_expiring(
+        db: AsyncSession,
+        user_id: int,
+        start: datetime,
+        end: datetime,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ):
+        return await db.run_sync(crud.pantry.get_expiring, user_id, start, end, limit)
+
+    @staticmethod
+    async def stream(db: AsyncSession, user_id: int):
+        result = await db.stream(crud.pantry.stream_query(user_id))
+        async for pantry in result.scalars():
+            yield pantry
+
+    @staticmethod
+    async def update(db: AsyncSession, user_id: int, item: pantry_schema.PantryItem):
+        return await db.run_sync(crud.pantry.update, user_id, item)
+
+    @staticmethod
+    async def delete(db: AsyncSession, user_id: int, item: pantry_schema.PantryItem):
+        return await db.run_sync(crud.pantry.delete, user_id, item)
+
+
+class recipe:
+    @staticmethod
+    async def add(db: AsyncSession, user_id: int, recipe: recipe_schema.RecipeCreate):
+        return await db.run_sync(crud.recipe.add, user_id, recipe)
+
+    @staticmethod
+    async def add_many(
+        db: AsyncSession,
+        user_id: int,
+        recipes: List[recipe_schema.RecipeCreate],
+    ):
+        return await db.run_sync(crud.recipe.add_many, user_id, recipes)
+
+    @staticmethod
+    async def get_all(db: AsyncSession, user_id: int):
+        return await db.run_sync(crud.recipe.get_all, user_id)
+
+    @staticmethod
+    async def get_version(db: AsyncSession, user_id: int):
+        return await db.run_sync(crud.recipe.get_version, user_id)
+
+    @staticmethod
+    async def get_page(
+        db: AsyncSession,
+        user_id: int,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        required_diets: int = 0,
+    ):
+        return await db.run_sync(
+            crud.recipe.get_page, user_id, cursor, limit, required_diets
+        )
+
+    @staticmethod
+    async def stream(db: AsyncSession, user_id: int, required_diets: int = 0):
+        result = await db.stream(crud.recipe.stream_query(user_id, required_diets))
+        async for recipe in result.scalars():
+            yield recipe
+
+    @staticmethod
+    async def search(
+        db: AsyncSession, user_id: int, q: str, limit: int = DEFAULT_PAGE_SIZE
+    ):
+        return await db.run_sync(crud.recipe.search, user_id, q, limit)
+
+    @staticmethod
+    async def get_meal_plan(
+        db: AsyncSession, user_id: int, meals: int, people: Optional[float] = None
+    ):
+        planner = await db.run_sync(crud.recipe.get_meal_planner, user_id, people)
+        # Planning is pure CPU work, so it runs off the event loop
+        plan = await run_in_threadpool(planner.plan, meals)
+        return await db.run_sync(crud.recipe.get_meal_plan_details, plan)
+
+    @staticmethod
+    async def get_cookable(
+        db: AsyncSession, user_id: int, max_missing: int, limit: int
+    ):
+        return await db.run_sync(crud.recipe.get_cookable, user_id, max_missing, limit)
+
+    @staticmethod
+    async def update(db: AsyncSession, user_id: int, recipe: recipe_schema.Recipe):
+        return await db.run_sync(crud.recipe.update, user_id, recipe)
+
+    @staticmethod
+    async def delete(db: AsyncSession, user_id: int, recipe: recipe_schema.Recipe):
+        return await db.run_sync(crud.recipe.delete, user_id, recipe)
+
+
+class sync:
+    @staticmethod
+    async def get_changes(db: AsyncSession, user_id: int, since: Optional[str] = None):
+        return await db.run_sync(crud.sync.get_changes, user_id, since)
+
+
+class shopping:
+    @staticmethod
+    async def get_list(
+        db: AsyncSession,
+        user_id: int,
+        recipes: List[shopping_schema.ShoppingListRecipe],
+    ):
+        return await db.run_sync(crud.shopping.get_list, user_id, recipes)
+
+
+class batch:
+    @staticmethod
+    async def run(
+        db: AsyncSession, user_id: int, operations: List[batch_schema.Operation]
+    ):
+        return await db.run_sync(crud.batch.run, user_id, operations)
+
+
+class home:
+    @staticmethod
+    async def get(session_factory, user_id: int, limit: int):
+        """
+        Loads the user, their household and the first ``limit`` pantry items
+        and recipes concurrently, each in its own session from
+        ``session_factory``.
+        """
+
+        async def load(fn, *args):
+            async with session_factory() as db:
+                return await fn(db, *args)
+
+        members, db_user, pantry_page, recipe_page = await asyncio.gather(
+            load(household.get_all, user_id),
+            load(user.get, user_id),
+            load(pantry.get_page, user_id, None, limit),
+            load(recipe.get_page, user_id, None, limit),
+        )
+        return {
+            "user": db_user,
+            "household": members,
+            "pantry_items": pantry_page[0],
+            "pantry_items_cursor": pantry_page[1],
+            "recipes": recipe_page[0],
+            "recipes_cursor": recipe_page[1],
+        }
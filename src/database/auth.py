@@ -1,13 +1,12 @@
 from fastapi import HTTPException
 
 import jwt
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.auth import schema
 from app.config import Settings
 from app.user import model
-from google.oauth2 import id_token
-from google.auth.transport import requests
 
 
 class auth:
@@ -19,9 +18,13 @@ class auth:
     @staticmethod
     def authenticate(
         db: Session,
-        request: schema.AuthenticateRequest,
+        idinfo: dict,
         settings: Settings,
     ):
+        """
+        Signs in the user a verified Google ID token belongs to, creating them
+        on first sign in.
+        """
         valid_client_ids = [
             settings.oauth_android_client_id,
             settings.oauth_ios_client_id,
@@ -29,8 +32,6 @@ class auth:
             settings.oauth_desktop_client_id,
         ]
 
-        idinfo = id_token.verify_oauth2_token(request.token, requests.Request())
-
         if idinfo["aud"] not in valid_client_ids:
             raise HTTPException(status_code=401, detail="Invalid token")
 
@@ -42,7 +43,9 @@ class auth:
 
         validated_email = idinfo["email"]
         db_user = (
-            db.query(model.User).filter(model.User.email.ilike(validated_email)).first()
+            db.query(model.User)
+            .filter(func.lower(model.User.email) == validated_email.lower())
+            .first()
         )
 
         new_user = False
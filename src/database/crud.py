@@ -1,14 +1,172 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import List, Optional
+
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    delete,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app.food.resolver import food_resolver
 import app.pantry.model as pantry_model
 import app.pantry.schema as pantry_schema
 import app.recipe.model as recipe_model
+from app.recipe.diet import compatible_masks, diet_mask, preference_mask
+from app.recipe.matching import IndexCache, IngredientIndex
+from app.recipe.planning import MealPlanner, Plan, Stock
+from app.recipe.search import RecipeSearchIndex
 import app.recipe.schema as recipe_schema
+from app.shopping.aggregate import Line, shortfall
+import app.shopping.schema as shopping_schema
 import app.user.model as user_model
 import app.user.schema as user_schema
 import app.household.schema as household_schema
 import app.household.model as household_model
+from app.household.permissions import check_can_remove, check_can_update
+import app.batch.schema as batch_schema
+import app.sync.model as sync_model
+from app.sync.schema import SyncKind
+from database.pagination import DEFAULT_PAGE_SIZE, paginate
+from database.sync_token import decode_token, encode_token
+
+STREAM_BATCH_SIZE = 500
+# Rows per multi-row INSERT, well under Postgres' 32767 bind parameter limit
+BULK_INSERT_BATCH_SIZE = 1000
+
+ingredient_indexes = IndexCache()
+
+
+def _supports_returning(db: Session):
+    return db.get_bind().dialect.full_returning
+
+
+def _insert_returning(db: Session, table, rows: List[dict]):
+    """
+    Inserts ``rows`` into ``table`` and returns them as stored, with ids and
+    server defaults filled in, in the order of ``rows``.  Uses multi-row
+    INSERT ... RETURNING where the dialect supports it, otherwise one INSERT
+    per row and a single SELECT.
+
+    Postgres does not promise RETURNING rows in VALUES order, so each batch
+    is sorted by id: the sequence hands out ids as the VALUES rows are
+    evaluated, which is in order.
+    """
+    if not rows:
+        return []
+
+    if _supports_returning(db):
+        created = []
+        for i in range(0, len(rows), BULK_INSERT_BATCH_SIZE):
+            batch = rows[i : i + BULK_INSERT_BATCH_SIZE]
+            returned = db.execute(insert(table).values(batch).returning(table))
+            created += sorted(returned, key=lambda row: row.id)
+        return created
+
+    ids = [
+        db.execute(insert(table).values(row)).inserted_primary_key[0] for row in rows
+    ]
+    created = {
+        row.id: row for row in db.execute(select(table).where(table.c.id.in_(ids)))
+    }
+    return [created[id] for id in ids]
+
+
+def _update_returning(db: Session, table, where: list, values: dict):
+    """
+    Updates the row matching ``where`` and returns it as stored, or None if
+    nothing matched.  One UPDATE ... RETURNING where the dialect supports it,
+    otherwise an UPDATE and a SELECT.
+    """
+    statement = update(table).where(*where).values(values)
+    if _supports_returning(db):
+        return db.execute(statement.returning(table)).first()
+
+    db.execute(statement)
+    return db.execute(select(table).where(*where)).first()
+
+
+def _delete_returning(db: Session, table, where: list):
+    """
+    Deletes the rows matching ``where`` and returns them.  One DELETE ...
+    RETURNING where the dialect supports it, otherwise a SELECT and a DELETE.
+    """
+    statement = delete(table).where(*where)
+    if _supports_returning(db):
+        return db.execute(statement.returning(table)).all()
+
+    deleted = db.execute(select(table).where(*where)).all()
+    db.execute(statement)
+    return deleted
+
+
+def _with_children(parents, children, foreign_key: str, key: str):
+    """
+    Nests child rows under their parent rows, e.g. ingredients under recipes,
+    for rows returned by _insert_returning/_update_returning.
+    """
+    by_parent = {parent.id: [] for parent in parents}
+    for child in children:
+        by_parent[getattr(child, foreign_key)].append(dict(child._mapping))
+    return [dict(parent._mapping, **{key: by_parent[parent.id]}) for parent in parents]
+
+
+def _finish(db: Session, commit: bool):
+    """
+    Commits a write, or only flushes it when ``commit`` is False so the caller
+    can group several writes into one transaction.
+    """
+    if commit:
+        db.commit()
+    else:
+        db.flush()
+
+
+def _bump_version(db: Session, user_id: int, column: str) -> int:
+    """
+    Increments one of the user's version counters and returns the new value,
+    which the caller stamps on the rows it writes.  The UPDATE also holds the
+    user's row lock until commit, so versions are handed out in commit order.
+    """
+    users = user_model.User.__table__
+    db_user = _update_returning(
+        db, users, [users.c.id == user_id], {column: users.c[column] + 1}
+    )
+    return 0 if db_user is None else db_user._mapping[column]
+
+
+def _add_tombstones(
+    db: Session, user_id: int, kind: SyncKind, ids: List[int], version: int
+):
+    if not ids:
+        return
+    db.execute(
+        insert(sync_model.Tombstone.__table__).values(
+            [
+                {
+                    "user_id": user_id,
+                    "kind": kind.value,
+                    "object_id": id,
+                    "version": version,
+                }
+                for id in ids
+            ]
+        )
+    )
+
+
+def _get_version(db: Session, user_id: int, column: str) -> int:
+    users = user_model.User.__table__
+    version = db.execute(select(users.c[column]).where(users.c.id == user_id)).scalar()
+    return version or 0
 
 
 class user:
@@ -20,15 +178,23 @@ class user:
         return db_user
 
     @staticmethod
-    def get_all(db: Session, skip: int = 0, limit: int = 100):
-        return db.query(user_model.User).offset(skip).limit(limit).all()
+    def get_page(
+        db: Session,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ):
+        return paginate(
+            db.query(user_model.User),
+            [user_model.User.id],
+            cursor,
+            limit,
+        )
 
     @staticmethod
     def create(db: Session, user: user_schema.UserCreate):
         db_user = user_model.User(**user.dict())
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        db.flush()
 
         new_member = household_schema.HouseholdMemberCreate(
             user_id=db_user.id,
@@ -37,16 +203,43 @@ class user:
             db,
             db_user.id,
             new_member,
+            commit=False,
         )
+        db.commit()
         return db_user
 
     @staticmethod
     def update(db: Session, updated_user: user_schema.User):
-        db_user: user_model.User = user.get(db, updated_user.id)
-        db_user.first_name = updated_user.first_name
-        db_user.last_name = updated_user.last_name
+        users = user_model.User.__table__
+        db_user = _update_returning(
+            db,
+            users,
+            [users.c.id == updated_user.id],
+            {
+                "first_name": updated_user.first_name,
+                "last_name": updated_user.last_name,
+            },
+        )
+        if db_user is None:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        # Household members show the user's own name, so a rename changes the
+        # member row as far as sync and the household ETag are concerned
+        members = household_model.HouseholdMember.__table__
+        rows = db.execute(
+            select(members.c.id, members.c.head_of_household_id).where(
+                members.c.user_id == updated_user.id
+            )
+        ).all()
+        for member_id, head_of_household_id in rows:
+            db.execute(
+                update(members)
+                .where(members.c.id == member_id)
+                .values(
+                    version=_bump_version(db, head_of_household_id, "household_version")
+                )
+            )
         db.commit()
-        db.refresh(db_user)
         return db_user
 
 
@@ -56,6 +249,7 @@ class household:
         db: Session,
         head_of_household_id: int,
         member: household_schema.HouseholdMemberCreate,
+        commit: bool = True,
     ):
         if member.dietary_preferences is None:
             member.dietary_preferences = []
@@ -72,74 +266,140 @@ class household:
             user_id=member.user_id,
             child=member.child,
             dietary_preferences=diet_prefs,
+            version=_bump_version(db, head_of_household_id, "household_version"),
         )
 
         db.add(db_member)
-        db.commit()
-        db.refresh(db_member)
+        _finish(db, commit)
         return db_member
 
     @staticmethod
-    def get_all(db: Session, user_id: int):
-        db_member = (
-            db.query(household_model.HouseholdMember)
+    def head_of_household_query(db: Session, user_id: int):
+        return (
+            db.query(household_model.HouseholdMember.head_of_household_id)
             .filter(household_model.HouseholdMember.user_id == user_id)
-            .first()
+            .limit(1)
+        )
+
+    @staticmethod
+    def get_all(db: Session, user_id: int):
+        head_of_household_id = household.head_of_household_query(
+            db, user_id
+        ).scalar_subquery()
+        return household.get_members(
+            db,
+            household_model.HouseholdMember.head_of_household_id
+            == head_of_household_id,
         )
-        db_members = (
-            db.query(household_model.HouseholdMember)
+
+    @staticmethod
+    def get_version(db: Session, user_id: int) -> int:
+        head_of_household_id = household.head_of_household_query(db, user_id).scalar()
+        return _get_version(db, head_of_household_id, "household_version")
+
+    @staticmethod
+    def get_required_diets(db: Session, user_id: int) -> int:
+        """
+        Returns the diets every recipe for the user's household must suit, as
+        an app.recipe.diet mask: the union of all members' preferences.
+        """
+        head_of_household_id = household.head_of_household_query(
+            db, user_id
+        ).scalar_subquery()
+        preferences = (
+            db.query(household_model.DietaryPreferences.preference)
+            .join(household_model.HouseholdMember)
             .filter(
                 household_model.HouseholdMember.head_of_household_id
-                == db_member.head_of_household_id
+                == head_of_household_id,
+                household_model.DietaryPreferences.preference.isnot(None),
+            )
+            .distinct()
+        )
+        return preference_mask(preference for preference, in preferences)
+
+    @staticmethod
+    def get_members(db: Session, *criteria):
+        rows = (
+            db.query(
+                household_model.HouseholdMember,
+                user_model.User.first_name,
+                user_model.User.last_name,
+            )
+            .outerjoin(
+                user_model.User,
+                user_model.User.id == household_model.HouseholdMember.user_id,
             )
+            .filter(*criteria)
+            .order_by(household_model.HouseholdMember.id)
             .all()
         )
-        for member in db_members:
+
+        db_members = []
+        for member, first_name, last_name in rows:
             if member.user_id is not None:
-                u: user_model.User = (
-                    db.query(user_model.User)
-                    .filter(user_model.User.id == member.user_id)
-                    .first()
-                )
-                member.first_name = u.first_name
-                member.last_name = u.last_name
+                # Show the user's own name without marking the member dirty
+                set_committed_value(member, "first_name", first_name)
+                set_committed_value(member, "last_name", last_name)
+            db_members.append(member)
 
         return db_members
 
     @staticmethod
-    def update(db: Session, member: household_schema.HouseholdMember):
-        db_member: household_model.HouseholdMember = (
-            db.query(household_model.HouseholdMember)
-            .filter(
-                household_model.HouseholdMember.id == member.id,
-            )
-            .first()
-        )
+    def update(
+        db: Session, member: household_schema.HouseholdMember, commit: bool = True
+    ):
+        members = household_model.HouseholdMember.__table__
+        diet_prefs = household_model.DietaryPreferences.__table__
 
-        db.query(household_model.DietaryPreferences).filter(
-            household_model.DietaryPreferences.member_id == member.id
-        ).delete()
+        old_head_of_household_id = db.execute(
+            select(members.c.head_of_household_id).where(members.c.id == member.id)
+        ).scalar()
+        if old_head_of_household_id is None:
+            raise HTTPException(status_code=404, detail="Household member not found")
 
-        diet_prefs = [
-            household_model.DietaryPreferences(**e.dict())
-            for e in member.dietary_preferences
-        ]
+        if old_head_of_household_id != member.head_of_household_id:
+            # Moving to another household deletes the member from the old one
+            _add_tombstones(
+                db,
+                old_head_of_household_id,
+                SyncKind.HOUSEHOLD_MEMBER,
+                [member.id],
+                _bump_version(db, old_head_of_household_id, "household_version"),
+            )
 
-        db_member.first_name = member.first_name
-        db_member.last_name = member.last_name
-        db_member.child = member.child
-        db_member.dietary_preferences = diet_prefs
-        db_member.head_of_household_id = member.head_of_household_id
-        db_member.user_id = member.user_id
+        db.execute(delete(diet_prefs).where(diet_prefs.c.member_id == member.id))
+        db_member = _update_returning(
+            db,
+            members,
+            [members.c.id == member.id],
+            {
+                "first_name": member.first_name,
+                "last_name": member.last_name,
+                "child": member.child,
+                "head_of_household_id": member.head_of_household_id,
+                "user_id": member.user_id,
+                "version": _bump_version(
+                    db, member.head_of_household_id, "household_version"
+                ),
+            },
+        )
 
-        db.commit()
-        db.refresh(db_member)
-        return db_member
+        db_diet_prefs = _insert_returning(
+            db,
+            diet_prefs,
+            [dict(e.dict(), member_id=member.id) for e in member.dietary_preferences],
+        )
+        _finish(db, commit)
+        return _with_children(
+            [db_member], db_diet_prefs, "member_id", "dietary_preferences"
+        )[0]
 
     @staticmethod
     def remove_from_household(
         db: Session,
         member: household_schema.HouseholdMember,
+        commit: bool = True,
     ):
         """
         Member must not be head of own household.  This is only for deleting
@@ -149,24 +409,53 @@ class household:
             db.query(household_model.DietaryPreferences).filter(
                 household_model.DietaryPreferences.member_id == member.id
             ).delete()
-            db.query(household_model.HouseholdMember).filter(
-                household_model.HouseholdMember.id == member.id,
-            ).delete()
-            db.commit()
+            members = household_model.HouseholdMember.__table__
+            for db_member in _delete_returning(
+                db, members, [members.c.id == member.id]
+            ):
+                head_of_household_id = db_member.head_of_household_id
+                _add_tombstones(
+                    db,
+                    head_of_household_id,
+                    SyncKind.HOUSEHOLD_MEMBER,
+                    [db_member.id],
+                    _bump_version(db, head_of_household_id, "household_version"),
+                )
+            _finish(db, commit)
         else:
             member.head_of_household_id = member.user_id
-            household.update(db, member)
+            household.update(db, member, commit)
 
 
 class pantry:
     @staticmethod
-    def add(db: Session, user_id: int, pantry_item: pantry_schema.PantryItemCreate):
-        db_pantry_item = pantry_model.PantryItem(**pantry_item.dict())
-        db_pantry_item.user_id = user_id
-        db.add(db_pantry_item)
-        db.commit()
-        db.refresh(db_pantry_item)
-        return db_pantry_item
+    def add(
+        db: Session,
+        user_id: int,
+        pantry_item: pantry_schema.PantryItemCreate,
+        commit: bool = True,
+    ):
+        return pantry.add_many(db, user_id, [pantry_item], commit)[0]
+
+    @staticmethod
+    def add_many(
+        db: Session,
+        user_id: int,
+        pantry_items: List[pantry_schema.PantryItemCreate],
+        commit: bool = True,
+    ):
+        version = _bump_version(db, user_id, "pantry_version")
+        food_ids = food_resolver.resolve(db, [item.name for item in pantry_items])
+        created = _insert_returning(
+            db,
+            pantry_model.PantryItem.__table__,
+            [
+                dict(item.dict(), user_id=user_id, food_id=food_id, version=version)
+                for item, food_id in zip(pantry_items, food_ids)
+            ],
+        )
+        _finish(db, commit)
+        return created
 
     @staticmethod
     def get_all(db: Session, user_id: int):
@@ -177,52 +466,146 @@ class pantry:
         )
 
     @staticmethod
-    def update(db: Session, user_id: int, item: pantry_schema.PantryItem):
-        db_pantry_item = (
+    def get_version(db: Session, user_id: int) -> int:
+        return _get_version(db, user_id, "pantry_version")
+
+    @staticmethod
+    def get_page(
+        db: Session,
+        user_id: int,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ):
+        return paginate(
+            db.query(pantry_model.PantryItem).filter(
+                pantry_model.PantryItem.user_id == user_id
+            ),
+            [pantry_model.PantryItem.timestamp, pantry_model.PantryItem.id],
+            cursor,
+            limit,
+        )
+
+    @staticmethod
+    def get_expiring(
+        db: Session,
+        user_id: int,
+        start: datetime,
+        end: datetime,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ):
+        return (
             db.query(pantry_model.PantryItem)
             .filter(
                 pantry_model.PantryItem.user_id == user_id,
-                pantry_model.PantryItem.id == item.id,
+                pantry_model.PantryItem.use_by >= start,
+                pantry_model.PantryItem.use_by <= end,
             )
-            .first()
+            .order_by(pantry_model.PantryItem.use_by)
+            .limit(limit)
+            .all()
         )
-        db_pantry_item.name = item.name
-        db_pantry_item.quantity = item.quantity
-        db_pantry_item.unit = item.unit
-        db_pantry_item.storage_location = item.storage_location
-        db_pantry_item.date_added = item.date_added
-        db_pantry_item.use_by = item.use_by
 
-        db.commit()
-        db.refresh(db_pantry_item)
+    @staticmethod
+    def stream_query(user_id: int):
+        return (
+            select(pantry_model.PantryItem)
+            .filter(pantry_model.PantryItem.user_id == user_id)
+            .order_by(pantry_model.PantryItem.timestamp, pantry_model.PantryItem.id)
+            .execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+
+    @staticmethod
+    def update(
+        db: Session, user_id: int, item: pantry_schema.PantryItem, commit: bool = True
+    ):
+        pantry_items = pantry_model.PantryItem.__table__
+        db_pantry_item = _update_returning(
+            db,
+            pantry_items,
+            [pantry_items.c.user_id == user_id, pantry_items.c.id == item.id],
+            {
+                "name": item.name,
+                "food_id": food_resolver.resolve(db, [item.name])[0],
+                "quantity": item.quantity,
+                "unit": item.unit,
+                "storage_location": item.storage_location,
+                "date_added": item.date_added,
+                "use_by": item.use_by,
+                "version": _bump_version(db, user_id, "pantry_version"),
+            },
+        )
+        if db_pantry_item is None:
+            raise HTTPException(status_code=404, detail="Pantry item not found")
+        _finish(db, commit)
         return db_pantry_item
 
     @staticmethod
-    def delete(db: Session, user_id: int, item: pantry_schema.PantryItem):
-        db.query(pantry_model.PantryItem).filter(
-            pantry_model.PantryItem.user_id == user_id,
-            pantry_model.PantryItem.name == item.name,
-        ).delete()
-        db.commit()
+    def delete(
+        db: Session, user_id: int, item: pantry_schema.PantryItem, commit: bool = True
+    ):
+        pantry_items = pantry_model.PantryItem.__table__
+        deleted = _delete_returning(
+            db,
+            pantry_items,
+            [pantry_items.c.user_id == user_id, pantry_items.c.name == item.name],
+        )
+        _add_tombstones(
+            db,
+            user_id,
+            SyncKind.PANTRY_ITEM,
+            [row.id for row in deleted],
+            _bump_version(db, user_id, "pantry_version"),
+        )
+        _finish(db, commit)
 
 
 class recipe:
     @staticmethod
-    def add(db: Session, user_id: int, recipe: recipe_schema.RecipeCreate):
-        db_ingredients = [
-            recipe_model.Ingredient(**e.dict()) for e in recipe.ingredients
+    def add(
+        db: Session,
+        user_id: int,
+        new_recipe: recipe_schema.RecipeCreate,
+        commit: bool = True,
+    ):
+        return recipe.add_many(db, user_id, [new_recipe], commit)[0]
+
+    @staticmethod
+    def add_many(
+        db: Session,
+        user_id: int,
+        recipes: List[recipe_schema.RecipeCreate],
+        commit: bool = True,
+    ):
+        version = _bump_version(db, user_id, "recipe_version")
+        db_recipes = _insert_returning(
+            db,
+            recipe_model.Recipe.__table__,
+            [
+                {
+                    "user_id": user_id,
+                    "name": recipe.name,
+                    "servings": recipe.servings,
+                    "procedure": recipe.procedure,
+                    "ingredient_names": _ingredient_names(recipe.ingredients),
+                    "diet_mask": _diet_mask(recipe.ingredients),
+                    "version": version,
+                }
+                for recipe in recipes
+            ],
+        )
+        # db_recipes is in the order of recipes, see _insert_returning
+        ingredient_rows = [
+            dict(ingredient.dict(), recipe_id=db_recipe.id)
+            for db_recipe, recipe in zip(db_recipes, recipes)
+            for ingredient in recipe.ingredients
         ]
-        db_recipe = recipe_model.Recipe(
-            user_id=user_id,
-            name=recipe.name,
-            servings=recipe.servings,
-            ingredients=db_ingredients,
-            procedure=recipe.procedure,
-        )
-        db.add(db_recipe)
-        db.commit()
-        db.refresh(db_recipe)
-        return db_recipe
+        db_ingredients = _insert_returning(
+            db,
+            recipe_model.Ingredient.__table__,
+            _with_food_ids(db, ingredient_rows),
+        )
+        _finish(db, commit)
+        return _with_children(db_recipes, db_ingredients, "recipe_id", "ingredients")
 
     @staticmethod
     def get_all(db: Session, user_id: int):
@@ -233,42 +616,551 @@ class recipe:
         )
 
     @staticmethod
-    def update(db: Session, user_id: int, recipe: recipe_schema.Recipe):
+    def get_version(db: Session, user_id: int) -> int:
+        return _get_version(db, user_id, "recipe_version")
+
+    @staticmethod
+    def get_page(
+        db: Session,
+        user_id: int,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        required_diets: int = 0,
+    ):
+        return paginate(
+            db.query(recipe_model.Recipe).filter(
+                recipe_model.Recipe.user_id == user_id,
+                *_suits_diets(required_diets),
+            ),
+            [recipe_model.Recipe.timestamp, recipe_model.Recipe.id],
+            cursor,
+            limit,
+        )
+
+    @staticmethod
+    def stream_query(user_id: int, required_diets: int = 0):
+        # Joined eager loading can't be batched, so ingredients are loaded
+        # with one SELECT ... IN per batch of recipes instead
+        return (
+            select(recipe_model.Recipe)
+            .options(selectinload(recipe_model.Recipe.ingredients))
+            .filter(
+                recipe_model.Recipe.user_id == user_id, *_suits_diets(required_diets)
+            )
+            .order_by(recipe_model.Recipe.timestamp, recipe_model.Recipe.id)
+            .execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+
+    @staticmethod
+    def get_cookable(db: Session, user_id: int, max_missing: int, limit: int):
+        index = recipe.get_ingredient_index(db, user_id)
+        pantry_items = db.query(
+            pantry_model.PantryItem.food_id, pantry_model.PantryItem.name
+        ).filter(pantry_model.PantryItem.user_id == user_id)
+        matches = index.rank(pantry_items, max_missing)
+
+        db_recipes = {
+            db_recipe.id: db_recipe
+            for db_recipe in db.query(recipe_model.Recipe).filter(
+                recipe_model.Recipe.id.in_([m.recipe_id for m in matches[:limit]])
+            )
+        }
+        # A recipe deleted since the index was built is simply left out
+        return [
+            {
+                "recipe": db_recipes[match.recipe_id],
+                "missing": match.missing,
+                "coverage": match.coverage,
+            }
+            for match in matches[:limit]
+            if match.recipe_id in db_recipes
+        ]
+
+    @staticmethod
+    def get_ingredient_index(db: Session, user_id: int) -> IngredientIndex:
+        """
+        Returns the user's IngredientIndex, from ingredient_indexes unless a
+        recipe changed since it was built.  A rebuild reads the version, the
+        recipes and their ingredients in one outer-joined query, so the index
+        matches a single snapshot and is cached under that snapshot's version.
+        """
+        index = ingredient_indexes.get(
+            user_id, _get_version(db, user_id, "recipe_version")
+        )
+        if index is not None:
+            return index
+
+        users = user_model.User.__table__
+        recipes = recipe_model.Recipe.__table__
+        ingredients = recipe_model.Ingredient.__table__
+        rows = db.execute(
+            select(
+                users.c.recipe_version,
+                recipes.c.id,
+                ingredients.c.food_id,
+                ingredients.c.name,
+            )
+            .select_from(
+                users.outerjoin(recipes, recipes.c.user_id == users.c.id).outerjoin(
+                    ingredients, ingredients.c.recipe_id == recipes.c.id
+                )
+            )
+            .where(users.c.id == user_id)
+        ).all()
+
+        index = IngredientIndex(
+            {row.id for row in rows if row.id is not None},
+            [(row.id, row.food_id, row.name) for row in rows if row.name is not None],
+        )
+        if rows:
+            ingredient_indexes.put(user_id, rows[0].recipe_version or 0, index)
+        return index
+
+    @staticmethod
+    def get_meal_planner(db: Session, user_id: int, people: Optional[float] = None):
+        """
+        Loads the user's recipes and pantry into a MealPlanner.  ``people``
+        defaults to the size of the user's household.
+        """
+        if people is None:
+            people = len(household.get_all(db, user_id)) or 1
+
+        Recipe = recipe_model.Recipe
+        Ingredient = recipe_model.Ingredient
+        ingredients = defaultdict(list)
+        servings = {}
+        for row in (
+            db.query(
+                Recipe.id,
+                Recipe.servings,
+                Ingredient.food_id,
+                Ingredient.name,
+                Ingredient.quantity,
+                Ingredient.unit,
+            )
+            .outerjoin(Ingredient)
+            .filter(Recipe.user_id == user_id)
+        ):
+            servings[row.id] = row.servings
+            if row.name is not None:
+                ingredients[row.id].append(
+                    Line(row.food_id, row.name, row.quantity, row.unit)
+                )
+
+        PantryItem = pantry_model.PantryItem
+        stock = [
+            Stock(
+                row.id, Line(row.food_id, row.name, row.quantity, row.unit), row.use_by
+            )
+            for row in db.query(
+                PantryItem.id,
+                PantryItem.food_id,
+                PantryItem.name,
+                PantryItem.quantity,
+                PantryItem.unit,
+                PantryItem.use_by,
+            ).filter(PantryItem.user_id == user_id)
+        ]
+
+        return MealPlanner(
+            (
+                (recipe_id, recipe_servings, ingredients[recipe_id])
+                for recipe_id, recipe_servings in servings.items()
+            ),
+            stock,
+            people,
+            datetime.utcnow(),
+        )
+
+    @staticmethod
+    def get_meal_plan_details(db: Session, plan: Plan):
+        """Loads the recipes of ``plan`` for the MealPlan response."""
+        Recipe = recipe_model.Recipe
+        db_recipes = {
+            db_recipe.id: db_recipe
+            for db_recipe in db.query(Recipe).filter(
+                Recipe.id.in_([meal.recipe_id for meal in plan.meals])
+            )
+        }
+        return {
+            "meals": [
+                {"recipe": db_recipes[meal.recipe_id], "multiplier": meal.multiplier}
+                for meal in plan.meals
+            ],
+            "pantry_items_used": [
+                {"pantry_item_id": pantry_item_id, "fraction": fraction}
+                for pantry_item_id, fraction in sorted(plan.used.items())
+            ],
+            "score": plan.score,
+        }
+
+    @staticmethod
+    def get_meal_plan(
+        db: Session, user_id: int, meals: int, people: Optional[float] = None
+    ):
+        """
+        Plans up to ``meals`` of the user's recipes to use up the pantry items
+        closest to their use_by.  The async path runs the same steps, with the
+        planning itself in the threadpool.
+        """
+        plan = recipe.get_meal_planner(db, user_id, people).plan(meals)
+        return recipe.get_meal_plan_details(db, plan)
+
+    @staticmethod
+    def search(db: Session, user_id: int, q: str, limit: int = DEFAULT_PAGE_SIZE):
+        """
+        Ranks the user's recipes against ``q`` by name, ingredient names and
+        procedure, tolerating typos.  Postgres uses the full-text and trigram
+        indexes; other databases build a RecipeSearchIndex in process.
+        """
+        recipes = recipe_model.Recipe.__table__
+        if db.get_bind().dialect.name == "postgresql":
+            document = literal_column(recipe_model.SEARCH_DOCUMENT)
+            trigram_document = literal_column(recipe_model.TRIGRAM_DOCUMENT)
+            query = func.websearch_to_tsquery(literal_column("'english'::regconfig"), q)
+            rank = func.ts_rank(document, query) + func.word_similarity(
+                q, trigram_document
+            )
+            recipe_ids = [
+                id
+                for id, in db.execute(
+                    select(recipes.c.id)
+                    .where(
+                        recipes.c.user_id == user_id,
+                        or_(
+                            document.op("@@")(query),
+                            literal(q).op("<%")(trigram_document),
+                        ),
+                    )
+                    .order_by(rank.desc(), recipes.c.id)
+                    .limit(limit)
+                )
+            ]
+        else:
+            index = RecipeSearchIndex(
+                db.execute(
+                    select(
+                        recipes.c.id,
+                        recipes.c.name,
+                        recipes.c.ingredient_names,
+                        recipes.c.procedure,
+                    ).where(recipes.c.user_id == user_id)
+                )
+            )
+            recipe_ids = index.search(q, limit)
+
+        db_recipes = {
+            db_recipe.id: db_recipe
+            for db_recipe in db.query(recipe_model.Recipe).filter(
+                recipe_model.Recipe.id.in_(recipe_ids)
+            )
+        }
+        return [db_recipes[id] for id in recipe_ids]
+
+    @staticmethod
+    def update(
+        db: Session, user_id: int, recipe: recipe_schema.Recipe, commit: bool = True
+    ):
+        recipes = recipe_model.Recipe.__table__
+        ingredients = recipe_model.Ingredient.__table__
+
+        # Filtering on user_id as well keeps users from editing each other's
+        # recipes by id
+        db_recipe = _update_returning(
+            db,
+            recipes,
+            [recipes.c.user_id == user_id, recipes.c.id == recipe.id],
+            {
+                "name": recipe.name,
+                "servings": recipe.servings,
+                "procedure": recipe.procedure,
+                "ingredient_names": _ingredient_names(recipe.ingredients),
+                "diet_mask": _diet_mask(recipe.ingredients),
+                "version": _bump_version(db, user_id, "recipe_version"),
+            },
+        )
+        if db_recipe is None:
+            raise HTTPException(status_code=404, detail="Recipe not found")
+
+        db.execute(delete(ingredients).where(ingredients.c.recipe_id == recipe.id))
+        db_ingredients = _insert_returning(
+            db,
+            ingredients,
+            _with_food_ids(
+                db,
+                [
+                    dict(e.dict(exclude={"id"}), recipe_id=recipe.id)
+                    for e in recipe.ingredients
+                ],
+            ),
+        )
+        _finish(db, commit)
+        return _with_children([db_recipe], db_ingredients, "recipe_id", "ingredients")[
+            0
+        ]
+
+    @staticmethod
+    def delete(
+        db: Session, user_id: int, recipe: recipe_schema.Recipe, commit: bool = True
+    ):
         db.query(recipe_model.Ingredient).filter(
             recipe_model.Ingredient.recipe_id == recipe.id
-        ).delete()  # TODO check if this works
+        ).delete()
+
+        recipes = recipe_model.Recipe.__table__
+        deleted = _delete_returning(
+            db,
+            recipes,
+            [recipes.c.user_id == user_id, recipes.c.name == recipe.name],
+        )
+        _add_tombstones(
+            db,
+            user_id,
+            SyncKind.RECIPE,
+            [row.id for row in deleted],
+            _bump_version(db, user_id, "recipe_version"),
+        )
+        _finish(db, commit)
+
+
+def _with_food_ids(db: Session, rows: List[dict]) -> List[dict]:
+    food_ids = food_resolver.resolve(db, [row["name"] for row in rows])
+    return [dict(row, food_id=food_id) for row, food_id in zip(rows, food_ids)]
+
+
+def _ingredient_names(ingredients) -> str:
+    return " ".join(ingredient.name for ingredient in ingredients)
+
+
+def _diet_mask(ingredients) -> int:
+    return diet_mask(ingredient.name for ingredient in ingredients)
 
-        db_ingredients = [
-            recipe_model.Ingredient(**e.dict()) for e in recipe.ingredients
-        ]
 
-        # TODO? Do i need to filter by user ID AND recipe ID?
-        # aren't all recipe ids unique?
-        db_recipe = (
+def _suits_diets(required_diets: int) -> list:
+    if not required_diets:
+        return []
+    return [recipe_model.Recipe.diet_mask.in_(compatible_masks(required_diets))]
+
+
+def _changed_since(version_column, since: Optional[int], until: int) -> list:
+    criteria = [version_column <= until]
+    if since is not None:
+        criteria.append(version_column > since)
+    return criteria
+
+
+class sync:
+    @staticmethod
+    def get_changes(db: Session, user_id: int, since: Optional[str] = None):
+        """
+        Returns what changed for the user after the versions in ``since``, up
+        to and including the versions in the returned token.  Without a token,
+        or once the user has moved to another household, returns everything
+        with reset set.
+        """
+        users = user_model.User.__table__
+        versions = db.execute(
+            select(users.c.pantry_version, users.c.recipe_version).where(
+                users.c.id == user_id
+            )
+        ).first()
+        pantry_version, recipe_version = versions or (0, 0)
+        head_of_household_id = household.head_of_household_query(db, user_id).scalar()
+        household_version = _get_version(db, head_of_household_id, "household_version")
+
+        reset = since is None
+        if not reset:
+            since_pantry, since_recipe, since_head, since_household = decode_token(
+                since
+            )
+            reset = since_head != head_of_household_id
+        if reset:
+            since_pantry = since_recipe = since_household = None
+
+        pantry_items = (
+            db.query(pantry_model.PantryItem)
+            .filter(
+                pantry_model.PantryItem.user_id == user_id,
+                *_changed_since(
+                    pantry_model.PantryItem.version, since_pantry, pantry_version
+                ),
+            )
+            .order_by(pantry_model.PantryItem.id)
+            .all()
+        )
+        recipes = (
             db.query(recipe_model.Recipe)
             .filter(
                 recipe_model.Recipe.user_id == user_id,
-                recipe_model.Recipe.id == recipe.id,
+                *_changed_since(
+                    recipe_model.Recipe.version, since_recipe, recipe_version
+                ),
             )
-            .first()
+            .order_by(recipe_model.Recipe.id)
+            .all()
         )
-        db_recipe.name = recipe.name
-        db_recipe.servings = recipe.servings
-        db_recipe.ingredients = db_ingredients
-        db_recipe.procedure = recipe.procedure
+        household_members = []
+        if head_of_household_id is not None:
+            household_members = household.get_members(
+                db,
+                household_model.HouseholdMember.head_of_household_id
+                == head_of_household_id,
+                *_changed_since(
+                    household_model.HouseholdMember.version,
+                    since_household,
+                    household_version,
+                ),
+            )
 
-        db.commit()
-        db.refresh(db_recipe)
-        return db_recipe
+        deleted = {kind: [] for kind in SyncKind}
+        if not reset:
+            tombstones = sync_model.Tombstone
+            for kind, owner_id, since_version, version in [
+                (SyncKind.PANTRY_ITEM, user_id, since_pantry, pantry_version),
+                (SyncKind.RECIPE, user_id, since_recipe, recipe_version),
+                (
+                    SyncKind.HOUSEHOLD_MEMBER,
+                    head_of_household_id,
+                    since_household,
+                    household_version,
+                ),
+            ]:
+                deleted[kind] = [
+                    id
+                    for id, in db.query(tombstones.object_id).filter(
+                        tombstones.user_id == owner_id,
+                        tombstones.kind == kind.value,
+                        *_changed_since(tombstones.version, since_version, version),
+                    )
+                ]
+
+        return {
+            "token": encode_token(
+                pantry_version,
+                recipe_version,
+                head_of_household_id,
+                household_version,
+            ),
+            "reset": reset,
+            "pantry_items": pantry_items,
+            "recipes": recipes,
+            "household_members": household_members,
+            "deleted_pantry_items": deleted[SyncKind.PANTRY_ITEM],
+            "deleted_recipes": deleted[SyncKind.RECIPE],
+            "deleted_household_members": deleted[SyncKind.HOUSEHOLD_MEMBER],
+        }
 
+
+class shopping:
     @staticmethod
-    def delete(db: Session, user_id: int, recipe: recipe_schema.Recipe):
-        db.query(recipe_model.Ingredient).filter(
-            recipe_model.Ingredient.recipe_id == recipe.id
-        ).delete()
+    def get_list(
+        db: Session,
+        user_id: int,
+        recipes: List[shopping_schema.ShoppingListRecipe],
+    ):
+        """
+        Returns what the user is short of to cook ``recipes``: their
+        ingredients, scaled and summed per food and unit, minus the user's
+        pantry stock.  Reads every ingredient in one query and the matching
+        pantry items in another.
+        """
+        multipliers = defaultdict(float)
+        for selected in recipes:
+            multipliers[selected.recipe_id] += selected.multiplier
+
+        Recipe = recipe_model.Recipe
+        Ingredient = recipe_model.Ingredient
+        rows = (
+            db.query(
+                Recipe.id,
+                Ingredient.food_id,
+                Ingredient.name,
+                Ingredient.quantity,
+                Ingredient.unit,
+            )
+            .outerjoin(Ingredient)
+            .filter(Recipe.user_id == user_id, Recipe.id.in_(multipliers))
+            .all()
+        )
+        if {row.id for row in rows} != set(multipliers):
+            raise HTTPException(status_code=404, detail="Recipe not found")
+
+        needed = [
+            Line(
+                row.food_id,
+                row.name,
+                None if row.quantity is None else row.quantity * multipliers[row.id],
+                row.unit,
+            )
+            for row in rows
+            if row.name is not None
+        ]
+        food_ids = {line.food_id for line in needed if line.food_id is not None}
+        PantryItem = pantry_model.PantryItem
+        matching = [PantryItem.food_id.in_(food_ids)]
+        if any(line.food_id is None for line in needed):
+            matching.append(PantryItem.food_id.is_(None))
+        stock = [
+            Line(*row)
+            for row in db.query(
+                PantryItem.food_id,
+                PantryItem.name,
+                PantryItem.quantity,
+                PantryItem.unit,
+            ).filter(PantryItem.user_id == user_id, or_(*matching))
+        ]
+
+        return [line._asdict() for line in shortfall(needed, stock)]
+
+
+class batch:
+    @staticmethod
+    def run(db: Session, user_id: int, operations: List[batch_schema.Operation]):
+        """
+        Runs ``operations`` in order in one transaction, with one commit at the
+        end, and returns each one's result.  If any operation fails, none of
+        them take effect, and the error says which one failed.
+        """
+        writers = {
+            "create_pantry_item": lambda data: pantry.add(db, user_id, data, False),
+            "update_pantry_item": lambda data: pantry.update(db, user_id, data, False),
+            "delete_pantry_item": lambda data: pantry.delete(db, user_id, data, False),
+            "create_recipe": lambda data: recipe.add(db, user_id, data, False),
+            "update_recipe": lambda data: recipe.update(db, user_id, data, False),
+            "delete_recipe": lambda data: recipe.delete(db, user_id, data, False),
+            "create_household_member": lambda data: household.add_member(
+                db, user_id, data, False
+            ),
+            "update_household_member": lambda data: household.update(db, data, False),
+            "delete_household_member": lambda data: household.remove_from_household(
+                db, data, False
+            ),
+        }
+        checks = {
+            "update_household_member": check_can_update,
+            "delete_household_member": check_can_remove,
+        }
+
+        results = []
+        for index, operation in enumerate(operations):
+            try:
+                if operation.op in checks:
+                    checks[operation.op](user_id, operation.data)
+                results.append(
+                    {
+                        "op": operation.op,
+                        "result": writers[operation.op](operation.data),
+                    }
+                )
+            except HTTPException as error:
+                db.rollback()
+                raise HTTPException(
+                    status_code=error.status_code,
+                    detail={"index": index, "op": operation.op, "detail": error.detail},
+                )
+            except Exception:
+                db.rollback()
+                raise
 
-        db.query(recipe_model.Recipe).filter(
-            recipe_model.Recipe.user_id == user_id,
-            recipe_model.Recipe.name == recipe.name,
-        ).delete()
         db.commit()
+        return results
@@ -1,18 +1,179 @@
-from sqlalchemy import create_engine
+from contextlib import contextmanager
+from functools import lru_cache, partial
+import threading
+import time
+
+from sqlalchemy import DateTime, create_engine, exc, text
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.config import Settings, get_settings
+
+
+class PoolStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_checkout(self, wait: float, timed_out: bool = False):
+        with self._lock:
+            self.checkouts += 1
+            self.timeouts += int(timed_out)
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+
+class _TimedCheckoutMixin:
+    """
+    Records how long each checkout waited on the pool, including checkouts
+    that gave up with a pool timeout.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            self.stats.record_checkout(time.perf_counter() - start, timed_out)
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _pool_options(settings: Settings):
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+@lru_cache()
+def get_engine():
+    settings = get_settings()
+    return create_engine(
+        settings.database_url,
+        poolclass=InstrumentedQueuePool,
+        **_pool_options(settings),
+    )
+
 
-SQLALCHEMY_DATABASE_URL = "postgresql://postgres:newpassword@db:5432/panda_express"
+@lru_cache()
+def get_async_engine():
+    settings = get_settings()
+    url = make_url(settings.database_url).set(drivername="postgresql+asyncpg")
+    return create_async_engine(
+        url,
+        poolclass=InstrumentedAsyncQueuePool,
+        **_pool_options(settings),
+    )
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def get_engines():
+    return {
+        "sync": get_engine(),
+        "async": get_async_engine().sync_engine,
+    }
+
+
+def pool_status(name: str, engine):
+    pool = engine.pool
+    status = {
+        "name": name,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+    }
+
+    stats: PoolStats = getattr(pool, "stats", None)
+    if stats is not None:
+        status.update(
+            checkouts=stats.checkouts,
+            timeouts=stats.timeouts,
+            avg_wait=stats.total_wait / stats.checkouts if stats.checkouts else 0.0,
+            max_wait=stats.max_wait,
+        )
+    return status
+
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+AsyncSessionLocal = sessionmaker(
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
 
 Base = declarative_base()
 
+# For columns filled by CURRENT_TIMESTAMP.  SQLite stores those without
+# fractional seconds, so bound values must be rendered the same way for
+# comparisons against them (e.g. keyset cursors) to hold.
+ServerTimestamp = DateTime(timezone=False).with_variant(
+    sqlite.DATETIME(truncate_microseconds=True), "sqlite"
+)
+
 
 def get_db():
-    session = SessionLocal()
+    session = SessionLocal(bind=get_engine())
     try:
         yield session
     finally:
         session.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal(bind=get_async_engine()) as session:
+        yield session
+
+
+def get_async_session_factory():
+    """
+    For routes that run independent queries concurrently.  An AsyncSession
+    runs one statement at a time, so each concurrent query opens its own
+    session, and with it its own pooled connection.
+    """
+    return partial(AsyncSessionLocal, bind=get_async_engine())
+
+
+@contextmanager
+def try_advisory_lock(connection, lock_id: int):
+    """
+    Yields whether this process holds advisory lock ``lock_id`` on Postgres,
+    without waiting for it; another worker may already hold it.  Other
+    databases have no workers to race, so the lock is always granted.
+    """
+    if connection.dialect.name != "postgresql":
+        yield True
+        return
+
+    acquired = connection.execute(
+        text("SELECT pg_try_advisory_lock(:id)"), {"id": lock_id}
+    ).scalar()
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            connection.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": lock_id})
@@ -0,0 +1,71 @@
+"""
+Keyset pagination with opaque cursors.
+
+A cursor holds the sort key of the last row on a page, so the next page is a
+range scan starting just after it instead of an OFFSET that has to walk every
+earlier row.
+"""
+
+import base64
+from datetime import datetime
+import json
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import DateTime, literal, tuple_
+from sqlalchemy.orm import Query
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(values: list) -> str:
+    values = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _is_datetime(column) -> bool:
+    # Unwraps dialect variants such as db.ServerTimestamp
+    return isinstance(getattr(column.type, "impl", column.type), DateTime)
+
+
+def decode_cursor(cursor: str, columns: list) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError(cursor)
+        return [
+            datetime.fromisoformat(v) if _is_datetime(c) else int(v)
+            for c, v in zip(columns, values)
+        ]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginate(
+    query: Query,
+    columns: list,
+    cursor: Optional[str],
+    limit: int,
+) -> Tuple[List, Optional[str]]:
+    """
+    Returns one page of ``query`` ordered by ``columns`` (which must end in a
+    unique column) and the cursor for the next page, or None on the last page.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    if cursor is not None:
+        values = decode_cursor(cursor, columns)
+        after = tuple_(*[literal(v, c.type) for c, v in zip(columns, values)])
+        query = query.filter(tuple_(*columns) > after)
+
+    rows = query.order_by(*columns).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor([getattr(last, c.key) for c in columns])
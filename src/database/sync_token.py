@@ -0,0 +1,39 @@
+"""
+Opaque tokens for delta sync.
+
+A token holds the change versions a client has caught up to: the user's
+pantry and recipe versions, their head of household, and that household's
+version.
+"""
+
+import base64
+import json
+from typing import List, Optional
+
+from fastapi import HTTPException
+
+from database.pagination import encode_cursor
+
+TOKEN_LENGTH = 4
+
+
+def encode_token(
+    pantry_version: int,
+    recipe_version: int,
+    head_of_household_id: Optional[int],
+    household_version: int,
+) -> str:
+    return encode_cursor(
+        [pantry_version, recipe_version, head_of_household_id, household_version]
+    )
+
+
+def decode_token(token: str) -> List[Optional[int]]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(values, list) or len(values) != TOKEN_LENGTH:
+            raise ValueError(token)
+        return [None if v is None else int(v) for v in values]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid sync token")
@@ -0,0 +1,121 @@
+"""baseline schema
+
+The schema as it was created by Base.metadata.create_all.  Databases created
+that way should be stamped with this revision rather than upgraded through it.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("first_name", sa.String()),
+        sa.Column("last_name", sa.String()),
+        sa.Column("email", sa.String()),
+    )
+    op.create_table(
+        "household_members",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("first_name", sa.String(), nullable=True),
+        sa.Column("last_name", sa.String(), nullable=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column(
+            "head_of_household_id",
+            sa.Integer(),
+            sa.ForeignKey("users.id"),
+            nullable=False,
+        ),
+        sa.Column("child", sa.Boolean()),
+    )
+    op.create_table(
+        "dietary_preferences",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("member_id", sa.Integer(), sa.ForeignKey("household_members.id")),
+        sa.Column(
+            "preference",
+            sa.Enum(
+                "VEGETARIAN",
+                "PESCATARIAN",
+                "VEGAN",
+                "GLUTEN_FREE",
+                name="dietarypreferenceenum",
+            ),
+        ),
+    )
+    op.create_table(
+        "pantry_items",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String()),
+        sa.Column("quantity", sa.Float()),
+        sa.Column(
+            "storage_location",
+            sa.Enum(
+                "FRIDGE",
+                "FREEZER",
+                "PANTRY",
+                "SPICE_RACK",
+                name="storagelocation",
+            ),
+        ),
+        sa.Column(
+            "date_added",
+            sa.DateTime(timezone=False),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+        sa.Column(
+            "use_by",
+            sa.DateTime(timezone=False),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+        sa.Column(
+            "timestamp",
+            sa.DateTime(timezone=False),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+        sa.Column("unit", sa.String()),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+    )
+    op.create_table(
+        "recipes",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+        sa.Column("name", sa.String()),
+        sa.Column("servings", sa.Float()),
+        sa.Column("procedure", sa.Text(), nullable=True),
+        sa.Column(
+            "timestamp",
+            sa.DateTime(timezone=False),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+    )
+    op.create_table(
+        "ingredients",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("recipe_id", sa.Integer(), sa.ForeignKey("recipes.id")),
+        sa.Column("name", sa.String()),
+        sa.Column("quantity", sa.Float()),
+        sa.Column("unit", sa.String()),
+    )
+
+
+def downgrade():
+    op.drop_table("ingredients")
+    op.drop_table("recipes")
+    op.drop_table("pantry_items")
+    op.drop_table("dietary_preferences")
+    op.drop_table("household_members")
+    op.drop_table("users")
+    sa.Enum(name="storagelocation").drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name="dietarypreferenceenum").drop(op.get_bind(), checkfirst=True)
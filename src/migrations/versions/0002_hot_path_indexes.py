@@ -0,0 +1,44 @@
+"""index foreign keys and case-insensitive email
+
+Built with CREATE INDEX CONCURRENTLY so the tables stay writable while the
+indexes build.  That cannot run inside a transaction, hence the autocommit
+block.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_pantry_items_user_id", "pantry_items", ["user_id"]),
+    ("ix_recipes_user_id", "recipes", ["user_id"]),
+    ("ix_ingredients_recipe_id", "ingredients", ["recipe_id"]),
+    ("ix_household_members_user_id", "household_members", ["user_id"]),
+    (
+        "ix_household_members_head_of_household_id",
+        "household_members",
+        ["head_of_household_id"],
+    ),
+    ("ix_dietary_preferences_member_id", "dietary_preferences", ["member_id"]),
+    ("ix_users_email_lower", "users", [sa.text("lower(email)")]),
+]
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
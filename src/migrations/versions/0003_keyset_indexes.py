@@ -0,0 +1,69 @@
+"""index per-user lists in keyset order
+
+(user_id, timestamp, id) lets a page of a user's pantry or recipes be read as
+one index range scan.  It also covers plain user_id lookups, so the single
+column indexes from 0002 are dropped.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_pantry_items_user_id_timestamp_id",
+            "pantry_items",
+            ["user_id", "timestamp", "id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_recipes_user_id_timestamp_id",
+            "recipes",
+            ["user_id", "timestamp", "id"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_pantry_items_user_id",
+            table_name="pantry_items",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_recipes_user_id",
+            table_name="recipes",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_recipes_user_id",
+            "recipes",
+            ["user_id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_pantry_items_user_id",
+            "pantry_items",
+            ["user_id"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_recipes_user_id_timestamp_id",
+            table_name="recipes",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_pantry_items_user_id_timestamp_id",
+            table_name="pantry_items",
+            postgresql_concurrently=True,
+        )
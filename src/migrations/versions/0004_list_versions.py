@@ -0,0 +1,31 @@
+"""per-user pantry and recipe versions
+
+Counters bumped by every write to a user's pantry items or recipes, used as
+ETags by the list endpoints.  With a constant server default, adding the
+columns does not rewrite the users table on Postgres 11+.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    for column in ("pantry_version", "recipe_version"):
+        op.add_column(
+            "users",
+            sa.Column(column, sa.Integer(), nullable=False, server_default="0"),
+        )
+
+
+def downgrade():
+    op.drop_column("users", "recipe_version")
+    op.drop_column("users", "pantry_version")
@@ -0,0 +1,84 @@
+"""delta sync: updated_at, row versions and tombstones
+
+Pantry items, recipes and household members get updated_at and the owner's
+version as of their last write.  Deletes leave a row in tombstones.
+
+Adding a column with a CURRENT_TIMESTAMP default is a plain ALTER TABLE on
+Postgres; SQLite only allows it by rebuilding the table, which batch mode
+does there.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+TABLES = ["pantry_items", "recipes", "household_members"]
+
+INDEXES = [
+    ("ix_pantry_items_user_id_version", "pantry_items", ["user_id", "version"]),
+    ("ix_recipes_user_id_version", "recipes", ["user_id", "version"]),
+]
+
+
+def upgrade():
+    op.add_column(
+        "users",
+        sa.Column(
+            "household_version", sa.Integer(), nullable=False, server_default="0"
+        ),
+    )
+    for table in TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(
+                sa.Column(
+                    "updated_at",
+                    sa.DateTime(timezone=False),
+                    server_default=sa.text("CURRENT_TIMESTAMP"),
+                )
+            )
+            batch_op.add_column(
+                sa.Column("version", sa.Integer(), nullable=False, server_default="0")
+            )
+
+    op.create_table(
+        "tombstones",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("object_id", sa.Integer(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column(
+            "deleted_at",
+            sa.DateTime(timezone=False),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+    )
+    op.create_index(
+        "ix_tombstones_user_id_version", "tombstones", ["user_id", "version"]
+    )
+
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+    op.drop_index("ix_tombstones_user_id_version", table_name="tombstones")
+    op.drop_table("tombstones")
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column("version")
+            batch_op.drop_column("updated_at")
+    op.drop_column("users", "household_version")
@@ -0,0 +1,35 @@
+"""index pantry items by use_by
+
+Serves the expiring-items query as one range scan over a user's items in
+use_by order.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_pantry_items_user_id_use_by",
+            "pantry_items",
+            ["user_id", "use_by"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_pantry_items_user_id_use_by",
+            table_name="pantry_items",
+            postgresql_concurrently=True,
+        )
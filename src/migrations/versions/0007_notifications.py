@@ -0,0 +1,39 @@
+"""notifications
+
+Written by the expiry scanner.  The unique (user_id, key) constraint keeps a
+rerun of a scan from notifying a user twice, and its index serves lookups by
+user.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "notifications",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("key", sa.String(), nullable=False),
+        sa.Column("body", sa.String()),
+        sa.Column("item_count", sa.Integer()),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=False),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+        sa.UniqueConstraint("user_id", "key", name="uq_notifications_user_id_key"),
+    )
+
+
+def downgrade():
+    op.drop_table("notifications")
@@ -0,0 +1,60 @@
+"""recipe search
+
+Adds recipes.ingredient_names (kept up to date by crud.recipe) and fills it
+in for existing recipes.  On Postgres, also adds a weighted full-text index
+over name, ingredient names and procedure, and a trigram index for
+typo-tolerant matching on name and ingredient names.  Other databases search
+in process and need neither.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+SEARCH_DOCUMENT = (
+    "(setweight(to_tsvector('english'::regconfig, coalesce(name, '')), 'A')"
+    " || setweight(to_tsvector('english'::regconfig,"
+    " coalesce(ingredient_names, '')), 'B')"
+    " || setweight(to_tsvector('english'::regconfig, coalesce(procedure, '')), 'C'))"
+)
+TRIGRAM_DOCUMENT = "(coalesce(name, '') || ' ' || coalesce(ingredient_names, ''))"
+
+
+def upgrade():
+    op.add_column("recipes", sa.Column("ingredient_names", sa.Text(), nullable=True))
+
+    postgresql = op.get_bind().dialect.name == "postgresql"
+    aggregate = "string_agg" if postgresql else "group_concat"
+    op.execute(
+        f"UPDATE recipes SET ingredient_names = ("
+        f"SELECT {aggregate}(ingredients.name, ' ') FROM ingredients"
+        f" WHERE ingredients.recipe_id = recipes.id)"
+    )
+
+    if postgresql:
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        with op.get_context().autocommit_block():
+            op.execute(
+                "CREATE INDEX CONCURRENTLY ix_recipes_search_document"
+                f" ON recipes USING gin ({SEARCH_DOCUMENT})"
+            )
+            op.execute(
+                "CREATE INDEX CONCURRENTLY ix_recipes_search_trigram"
+                f" ON recipes USING gin ({TRIGRAM_DOCUMENT} gin_trgm_ops)"
+            )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_recipes_search_trigram")
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_recipes_search_document")
+    op.drop_column("recipes", "ingredient_names")
@@ -0,0 +1,116 @@
+"""foods dictionary
+
+Adds foods (one row per normalized name) and food_aliases, seeds a few common
+aliases, and points pantry items and ingredients at their food.  Existing
+rows are backfilled using the same normalization the resolver applies.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.food.names import normalize_name
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+# alias -> food, both already normalized
+ALIASES = {
+    "scallion": "green onion",
+    "spring onion": "green onion",
+    "coriander": "cilantro",
+    "aubergine": "eggplant",
+    "courgette": "zucchini",
+    "garbanzo bean": "chickpea",
+    "capsicum": "bell pepper",
+    "icing sugar": "powdered sugar",
+    "confectioner sugar": "powdered sugar",
+}
+
+INDEXES = [
+    ("ix_pantry_items_user_id_food_id", "pantry_items", ["user_id", "food_id"]),
+    ("ix_ingredients_food_id", "ingredients", ["food_id"]),
+]
+
+
+def upgrade():
+    foods = op.create_table(
+        "foods",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False, unique=True),
+    )
+    op.create_table(
+        "food_aliases",
+        sa.Column("alias", sa.String(), primary_key=True),
+        sa.Column("food_id", sa.Integer(), sa.ForeignKey("foods.id"), nullable=False),
+    )
+    op.create_index("ix_food_aliases_food_id", "food_aliases", ["food_id"])
+
+    for table in ["pantry_items", "ingredients"]:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(
+                sa.Column(
+                    "food_id",
+                    sa.Integer(),
+                    sa.ForeignKey("foods.id", name=f"fk_{table}_food_id"),
+                    nullable=True,
+                )
+            )
+
+    connection = op.get_bind()
+    names = {
+        name
+        for table in ["pantry_items", "ingredients"]
+        for name, in connection.execute(sa.text(f"SELECT DISTINCT name FROM {table}"))
+        if name is not None
+    }
+    normalized = {name: normalize_name(name) for name in names}
+    canonical = set(ALIASES.values()) | set(normalized.values())
+    canonical -= set(ALIASES) | {""}
+    if canonical:
+        op.bulk_insert(foods, [{"name": name} for name in sorted(canonical)])
+    food_ids = dict(connection.execute(sa.text("SELECT name, id FROM foods")).all())
+
+    op.bulk_insert(
+        sa.table("food_aliases", sa.column("alias"), sa.column("food_id")),
+        [
+            {"alias": alias, "food_id": food_ids[name]}
+            for alias, name in ALIASES.items()
+        ],
+    )
+
+    for table in ["pantry_items", "ingredients"]:
+        rows = [
+            {"name": name, "food_id": food_ids[ALIASES.get(key, key)]}
+            for name, key in normalized.items()
+            if key
+        ]
+        if rows:
+            connection.execute(
+                sa.text(f"UPDATE {table} SET food_id = :food_id WHERE name = :name"),
+                rows,
+            )
+
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+    for table in ["ingredients", "pantry_items"]:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_constraint(f"fk_{table}_food_id", type_="foreignkey")
+            batch_op.drop_column("food_id")
+
+    op.drop_index("ix_food_aliases_food_id", table_name="food_aliases")
+    op.drop_table("food_aliases")
+    op.drop_table("foods")
@@ -0,0 +1,71 @@
+"""recipe diet mask
+
+Adds recipes.diet_mask (kept up to date by crud.recipe) with an index on
+(user_id, diet_mask) for household-safe listing, and fills it in for existing
+recipes from their ingredient names.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+"""
+
+from collections import defaultdict
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.recipe.diet import diet_mask
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "recipes",
+        sa.Column("diet_mask", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+    connection = op.get_bind()
+    names = defaultdict(list)
+    for recipe_id, name in connection.execute(
+        sa.text(
+            "SELECT recipes.id, ingredients.name FROM recipes"
+            " LEFT OUTER JOIN ingredients ON ingredients.recipe_id = recipes.id"
+        )
+    ):
+        names[recipe_id].append(name)
+
+    # One UPDATE per distinct mask, of which there are at most 16
+    ids_by_mask = defaultdict(list)
+    for recipe_id, ingredient_names in names.items():
+        ids_by_mask[diet_mask(n for n in ingredient_names if n is not None)].append(
+            recipe_id
+        )
+    for mask, ids in ids_by_mask.items():
+        connection.execute(
+            sa.text("UPDATE recipes SET diet_mask = :mask WHERE id IN :ids").bindparams(
+                sa.bindparam("ids", expanding=True)
+            ),
+            {"mask": mask, "ids": ids},
+        )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_recipes_user_id_diet_mask",
+            "recipes",
+            ["user_id", "diet_mask"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_recipes_user_id_diet_mask",
+            table_name="recipes",
+            postgresql_concurrently=True,
+        )
+    op.drop_column("recipes", "diet_mask")
@@ -0,0 +1,34 @@
+"""scan runs
+
+Records each completed daily expiry scan, so that the other workers, and any
+worker that restarts later that day, skip it instead of rereading
+pantry_items.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "scan_runs",
+        sa.Column("key", sa.String(), primary_key=True),
+        sa.Column(
+            "completed_at",
+            sa.DateTime(timezone=False),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+    )
+
+
+def downgrade():
+    op.drop_table("scan_runs")
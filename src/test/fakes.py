@@ -14,6 +14,48 @@ fake = Faker()
 fake.add_provider(EnumProvider)
 
 
+class FakeAsyncSession:
+    """
+    Stands in for an ``AsyncSession`` so the async routes can run against the
+    sync SQLite sessions used in tests.
+    """
+
+    def __init__(self, session):
+        self.session = session
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return fn(self.session, *args, **kwargs)
+
+    async def stream(self, statement):
+        return FakeAsyncResult(self.session.execute(statement))
+
+
+class FakeGoogleVerifier:
+    def __init__(self, idinfo: dict = None):
+        self.idinfo = idinfo or {}
+
+    async def verify(self, token: str):
+        return self.idinfo
+
+
+class FakeAsyncResult:
+    def __init__(self, result):
+        self.result = result
+
+    def scalars(self):
+        return FakeAsyncResult(self.result.scalars())
+
+    async def __aiter__(self):
+        for row in self.result:
+            yield row
+
+
 class MyFakes:
     def __init__(self):
         self.user_id = 2
@@ -1,13 +1,16 @@
 from faker import Faker
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.testclient import TestClient
+from google.auth.exceptions import TransportError
 import jwt
 import pytest
 
 from app.auth import routers as auth_routers
+from app.auth.google import get_google_verifier
+from app.auth.token_cache import TokenCache
 from app.config import get_settings
 from database import auth, db
-from test.fakes import MyFakes
+from test.fakes import FakeAsyncSession, FakeGoogleVerifier, MyFakes
 
 
 @pytest.fixture
@@ -20,7 +23,8 @@ def test_app(my_fakes: MyFakes):
     app = FastAPI()
     app.include_router(auth_routers.router)
     app.dependency_overrides[get_settings] = my_fakes.fake_settings
-    app.dependency_overrides[db.get_db] = lambda: None
+    app.dependency_overrides[db.get_async_db] = lambda: FakeAsyncSession(None)
+    app.dependency_overrides[get_google_verifier] = FakeGoogleVerifier
     yield TestClient(app)
 
 
@@ -55,3 +59,93 @@ def test_create_access_token(fake, my_fakes: MyFakes):
 
     token = auth.auth.create_access_token(access_token_data, settings)
     assert token == encoded_jwt
+
+
+def test_authenticated_user_is_cached(fake, monkeypatch):
+    monkeypatch.setattr(auth_routers, "token_cache", TokenCache())
+    app = FastAPI()
+
+    @app.get("/me")
+    async def me(user=Depends(auth_routers.get_authenticated_user)):
+        return user
+
+    claims = {"sub": str(fake.pyint()), "user_id": fake.pyint()}
+    token = jwt.encode(claims, "myKey")
+    client = TestClient(app)
+
+    for _ in range(3):
+        response = client.get("/me", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 200
+        assert response.json() == claims
+
+    assert auth_routers.token_cache.stats()["hits"] == 2
+    assert auth_routers.token_cache.stats()["misses"] == 1
+
+    response = client.get("/me", headers={"Authorization": "Bearer not-a-token"})
+    assert response.status_code == 403
+
+
+def test_token_cache_respects_exp():
+    now = [1000.0]
+    cache = TokenCache(ttl=300, clock=lambda: now[0])
+
+    cache.put("short", {"user_id": 1, "exp": 1010})
+    cache.put("long", {"user_id": 2})
+    assert cache.get("short") == {"user_id": 1, "exp": 1010}
+
+    now[0] = 1011
+    assert cache.get("short") is None
+    assert cache.get("long") == {"user_id": 2}
+
+    now[0] = 1301
+    assert cache.get("long") is None
+
+
+def test_token_cache_evicts_least_recently_used():
+    cache = TokenCache(maxsize=2)
+    cache.put("a", {"user_id": 1})
+    cache.put("b", {"user_id": 2})
+    cache.get("a")
+    cache.put("c", {"user_id": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"user_id": 1}
+    assert cache.get("c") == {"user_id": 3}
+
+
+def test_token_cache_invalidation():
+    cache = TokenCache()
+    cache.put("a", {"user_id": 1})
+    cache.put("b", {"user_id": 1})
+    cache.put("c", {"user_id": 2})
+
+    cache.invalidate("c")
+    assert cache.get("c") is None
+
+    cache.invalidate_user(1)
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_authenticate_rejects_unverified_token(test_app, my_fakes: MyFakes):
+    class RejectingVerifier:
+        async def verify(self, token):
+            raise ValueError("Could not verify token signature.")
+
+    test_app.app.dependency_overrides[get_google_verifier] = RejectingVerifier
+
+    response = test_app.post("/auth/authenticate", json=my_fakes.fake_auth_request())
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Invalid token"
+
+
+def test_authenticate_reports_unreachable_certs(test_app, my_fakes: MyFakes):
+    class UnreachableVerifier:
+        async def verify(self, token):
+            raise TransportError("Could not fetch certificates")
+
+    test_app.app.dependency_overrides[get_google_verifier] = UnreachableVerifier
+
+    response = test_app.post("/auth/authenticate", json=my_fakes.fake_auth_request())
+    assert response.status_code == 503
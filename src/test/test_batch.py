@@ -0,0 +1,168 @@
+from fastapi import FastAPI
+import pytest
+import sqlalchemy as sa
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from database import db
+from app.auth.routers import get_authenticated_user
+import app.batch.routers as batch_routers
+import app.household.routers as household_routers
+import app.pantry.routers as pantry_routers
+import app.recipe.routers as recipe_routers
+from test.fakes import FakeAsyncSession, MyFakes
+
+TOKEN_USER_ID = 1
+SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+
+engine = sa.create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+db.Base.metadata.drop_all(bind=engine)
+db.Base.metadata.create_all(bind=engine)
+
+
+@pytest.fixture
+def my_fakes():
+    return MyFakes()
+
+
+@pytest.fixture()
+def global_data(my_fakes: MyFakes):
+    user_one = my_fakes.fake_db_user()
+    user_one.id = TOKEN_USER_ID
+
+    pantry_item_one = my_fakes.fake_db_pantry_item()
+    pantry_item_one.user_id = TOKEN_USER_ID
+
+    recipe_one = my_fakes.fake_db_recipe()
+    recipe_one.user_id = TOKEN_USER_ID
+
+    member_one = my_fakes.fake_db_household_member(TOKEN_USER_ID, user_id=TOKEN_USER_ID)
+    member_two = my_fakes.fake_db_household_member(TOKEN_USER_ID)
+
+    return {
+        "user_one": user_one,
+        "pantry_item_one": pantry_item_one,
+        "recipe_one": recipe_one,
+        "member_one": member_one,
+        "member_two": member_two,
+    }
+
+
+@pytest.fixture()
+def session(global_data):
+
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = TestingSessionLocal(bind=connection)
+
+    session.add_all([v for _, v in global_data.items()])
+    session.commit()
+
+    yield session
+
+    session.close()
+    transaction.rollback()
+    connection.close()
+
+
+@pytest.fixture()
+def test_client(session):
+    def override_get_async_db():
+        yield FakeAsyncSession(session)
+
+    app = FastAPI()
+    app.include_router(batch_routers.router)
+    app.include_router(household_routers.router)
+    app.include_router(pantry_routers.router)
+    app.include_router(recipe_routers.router)
+    app.dependency_overrides[db.get_async_db] = override_get_async_db
+    app.dependency_overrides[get_authenticated_user] = lambda: {"sub": TOKEN_USER_ID}
+    yield TestClient(app)
+
+
+def test_batch(test_client: TestClient, session, my_fakes: MyFakes, monkeypatch):
+    pantry_item = test_client.get(f"/users/{TOKEN_USER_ID}/pantry_items").json()[0]
+    pantry_item["quantity"] = 12.5
+    recipe = test_client.get(f"/users/{TOKEN_USER_ID}/recipes").json()[0]
+    member = test_client.get(f"/users/{TOKEN_USER_ID}/household").json()[1]
+    member["first_name"] = "renamed"
+    new_pantry_item = my_fakes.fake_json_pantry_item()
+    new_recipe = my_fakes.fake_json_recipe()
+
+    commits = []
+    monkeypatch.setattr(session, "commit", lambda: commits.append(1))
+    response = test_client.post(
+        f"/users/{TOKEN_USER_ID}/batch",
+        json={
+            "operations": [
+                {"op": "create_pantry_item", "data": new_pantry_item},
+                {"op": "update_pantry_item", "data": pantry_item},
+                {"op": "create_recipe", "data": new_recipe},
+                {"op": "delete_recipe", "data": recipe},
+                {"op": "update_household_member", "data": member},
+            ]
+        },
+    )
+    monkeypatch.undo()
+    session.commit()
+
+    assert response.status_code == 200
+    assert commits == [1]
+    results = response.json()["results"]
+    assert [r["op"] for r in results] == [
+        "create_pantry_item",
+        "update_pantry_item",
+        "create_recipe",
+        "delete_recipe",
+        "update_household_member",
+    ]
+    assert results[0]["result"]["name"] == new_pantry_item["name"]
+    assert results[1]["result"]["quantity"] == 12.5
+    assert results[2]["result"]["name"] == new_recipe["name"]
+    assert results[3]["result"] is None
+    assert results[4]["result"]["first_name"] == "renamed"
+
+    pantry_items = test_client.get(f"/users/{TOKEN_USER_ID}/pantry_items").json()
+    assert [p["id"] for p in pantry_items] == [
+        pantry_item["id"],
+        results[0]["result"]["id"],
+    ]
+    recipes = test_client.get(f"/users/{TOKEN_USER_ID}/recipes").json()
+    assert [r["id"] for r in recipes] == [results[2]["result"]["id"]]
+
+
+def test_batch_is_all_or_nothing(test_client: TestClient, my_fakes: MyFakes):
+    member = test_client.get(f"/users/{TOKEN_USER_ID}/household").json()[1]
+    member["head_of_household_id"] = TOKEN_USER_ID + 1
+    new_pantry_item = my_fakes.fake_json_pantry_item()
+
+    response = test_client.post(
+        f"/users/{TOKEN_USER_ID}/batch",
+        json={
+            "operations": [
+                {"op": "create_pantry_item", "data": new_pantry_item},
+                {"op": "delete_household_member", "data": member},
+            ]
+        },
+    )
+
+    assert response.status_code == 403
+    assert response.json()["detail"] == {
+        "index": 1,
+        "op": "delete_household_member",
+        "detail": "Not authorized to remove household member",
+    }
+    pantry_items = test_client.get(f"/users/{TOKEN_USER_ID}/pantry_items").json()
+    assert new_pantry_item["name"] not in [p["name"] for p in pantry_items]
+
+
+def test_batch_rejects_unknown_operation(test_client: TestClient):
+    response = test_client.post(
+        f"/users/{TOKEN_USER_ID}/batch",
+        json={"operations": [{"op": "drop_tables", "data": {}}]},
+    )
+    assert response.status_code == 422
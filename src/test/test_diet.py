@@ -0,0 +1,34 @@
+from app.household.schema import DietaryPreferenceEnum
+from app.recipe import diet
+from app.recipe.diet import ALL_DIETS, GLUTEN_FREE, PESCATARIAN, VEGAN, VEGETARIAN
+
+
+def test_diet_mask():
+    assert diet.diet_mask([]) == ALL_DIETS
+    assert diet.diet_mask(["Chicken thighs", "rice"]) == GLUTEN_FREE
+    assert diet.diet_mask(["canned tuna"]) == PESCATARIAN | GLUTEN_FREE
+    assert diet.diet_mask(["Eggs", "spinach"]) == ALL_DIETS & ~VEGAN
+    assert diet.diet_mask(["spaghetti", "tomatoes"]) == ALL_DIETS & ~GLUTEN_FREE
+    assert diet.diet_mask(["soy sauce"]) == ALL_DIETS & ~GLUTEN_FREE
+
+
+def test_diet_mask_plant_based_phrases():
+    assert diet.diet_mask(["peanut butter", "coconut milk"]) == ALL_DIETS
+    assert diet.diet_mask(["rice flour", "gluten-free pasta"]) == ALL_DIETS
+
+
+def test_preference_mask():
+    assert diet.preference_mask([]) == 0
+    assert (
+        diet.preference_mask(
+            [DietaryPreferenceEnum.VEGETARIAN, DietaryPreferenceEnum.GLUTEN_FREE]
+        )
+        == VEGETARIAN | GLUTEN_FREE
+    )
+
+
+def test_compatible_masks():
+    assert diet.compatible_masks(0) == list(range(ALL_DIETS + 1))
+    assert diet.compatible_masks(ALL_DIETS) == [ALL_DIETS]
+    assert all(m & VEGAN for m in diet.compatible_masks(VEGAN))
+    assert len(diet.compatible_masks(VEGAN)) == 8
@@ -1,3 +1,5 @@
+import json
+from datetime import datetime, timedelta
 from faker import Faker
 from faker_enum import EnumProvider
 from fastapi import FastAPI
@@ -6,10 +8,14 @@ import sqlalchemy as sa
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import sessionmaker
 
-from database import db
+from database import crud, db
 from app.auth.routers import get_authenticated_user
+from app.food.model import Food
+from app.food.resolver import FoodResolver
+from app.pantry.model import PantryItem
 import app.pantry.routers as pantry_routers
-from test.fakes import MyFakes
+from app.user.schema import UserCreate
+from test.fakes import FakeAsyncSession, MyFakes
 
 TOKEN_USER_ID = 1
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
@@ -68,12 +74,12 @@ def session(global_data):
 
 @pytest.fixture()
 def test_client(session):
-    def override_get_db():
-        yield session
+    def override_get_async_db():
+        yield FakeAsyncSession(session)
 
     app = FastAPI()
     app.include_router(pantry_routers.router)
-    app.dependency_overrides[db.get_db] = override_get_db
+    app.dependency_overrides[db.get_async_db] = override_get_async_db
     app.dependency_overrides[get_authenticated_user] = lambda: {"sub": TOKEN_USER_ID}
     yield TestClient(app)
 
@@ -155,6 +161,15 @@ def test_update_pantry_item(test_client: TestClient):
     assert updated["id"] == pantry_item_one["id"]
 
 
+def test_update_pantry_item_not_found(test_client: TestClient):
+    response = test_client.get(f"/users/{TOKEN_USER_ID}/pantry_items")
+    pantry_item = response.json()[0]
+    pantry_item["id"] = 9999
+
+    response = test_client.put(f"/users/{TOKEN_USER_ID}/pantry_items", json=pantry_item)
+    assert response.status_code == 404
+
+
 def test_delete_pantry_item(test_client: TestClient):
     response = test_client.get(f"/users/{TOKEN_USER_ID}/pantry_items")
     assert response.status_code == 200
@@ -175,3 +190,226 @@ def test_delete_pantry_item(test_client: TestClient):
     data = response.json()
     assert len(data) == initial_food_count - 1
     assert not any([d["name"] == item_to_delete["name"] for d in data])
+
+
+def test_get_pantry_items_by_page(test_client: TestClient, global_data):
+    response = test_client.get(f"/users/{TOKEN_USER_ID}/pantry_items?limit=1")
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+    assert response.json()[0]["name"] == global_data["pantry_item_one"].name
+
+    cursor = response.headers["X-Next-Cursor"]
+    response = test_client.get(
+        f"/users/{TOKEN_USER_ID}/pantry_items?limit=1&cursor={cursor}"
+    )
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+    assert response.json()[0]["name"] == global_data["pantry_item_two"].name
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_get_pantry_items_not_modified(test_client: TestClient, my_fakes: MyFakes):
+    response = test_client.get(f"/users/{TOKEN_USER_ID}/pantry_items")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    response = test_client.get(
+        f"/users/{TOKEN_USER_ID}/pantry_items", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+
+    # Other pages have their own tags
+    response = test_client.get(
+        f"/users/{TOKEN_USER_ID}/pantry_items?limit=1",
+        headers={"If-None-Match": etag},
+    )
+    assert response.status_code == 200
+
+    response = test_client.post(
+        f"/users/{TOKEN_USER_ID}/pantry_items", json=my_fakes.fake_json_pantry_item()
+    )
+    assert response.status_code == 200
+
+    response = test_client.get(
+        f"/users/{TOKEN_USER_ID}/pantry_items", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_get_pantry_items_invalid_cursor(test_client: TestClient):
+    response = test_client.get(f"/users/{TOKEN_USER_ID}/pantry_items?cursor=bogus")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_stream_pantry_items(test_client: TestClient, global_data):
+    response = test_client.get(f"/users/{TOKEN_USER_ID}/pantry_items?stream=json")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+
+    names = [item["name"] for item in response.json()]
+    assert names == [
+        global_data["pantry_item_one"].name,
+        global_data["pantry_item_two"].name,
+    ]
+
+
+def test_stream_pantry_items_ndjson(test_client: TestClient, global_data):
+    response = test_client.get(f"/users/{TOKEN_USER_ID}/pantry_items?stream=ndjson")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    lines = response.text.splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[0])["name"] == global_data["pantry_item_one"].name
+    assert json.loads(lines[1])["name"] == global_data["pantry_item_two"].name
+
+
+def test_add_pantry_items_in_bulk(test_client: TestClient, my_fakes: MyFakes):
+    new_foods = [my_fakes.fake_json_pantry_item() for _ in range(5)]
+
+    response = test_client.post(
+        f"/users/{TOKEN_USER_ID}/pantry_items/bulk", json=new_foods
+    )
+    assert response.status_code == 200
+
+    created = response.json()
+    assert [c["name"] for c in created] == [f["name"] for f in new_foods]
+    assert all(c["user_id"] == TOKEN_USER_ID for c in created)
+    assert len({c["id"] for c in created}) == len(new_foods)
+
+    response = test_client.get(f"/users/{TOKEN_USER_ID}/pantry_items")
+    assert response.status_code == 200
+    assert [d["id"] for d in response.json()[2:]] == [c["id"] for c in created]
+
+
+def test_add_pantry_items_in_bulk_is_capped(test_client: TestClient, my_fakes: MyFakes):
+    new_foods = [my_fakes.fake_json_pantry_item()] * (
+        pantry_routers.MAX_BULK_PANTRY_ITEMS + 1
+    )
+
+    response = test_client.post(
+        f"/users/{TOKEN_USER_ID}/pantry_items/bulk", json=new_foods
+    )
+    assert response.status_code == 422
+
+
+def test_get_expiring_pantry_items(test_client: TestClient, my_fakes: MyFakes):
+    now = datetime.utcnow()
+    for days in [5, 1, -1, 2]:
+        item = my_fakes.fake_json_pantry_item()
+        item["name"] = f"expires in {days}"
+        item["use_by"] = (now + timedelta(days=days)).isoformat()
+        response = test_client.post(f"/users/{TOKEN_USER_ID}/pantry_items", json=item)
+        assert response.status_code == 200
+
+    response = test_client.get(f"/users/{TOKEN_USER_ID}/pantry_items/expiring")
+    assert response.status_code == 200
+    assert [item["name"] for item in response.json()] == [
+        "expires in 1",
+        "expires in 2",
+    ]
+
+    response = test_client.get(
+        f"/users/{TOKEN_USER_ID}/pantry_items/expiring?within=1w&limit=2"
+    )
+    assert [item["name"] for item in response.json()] == [
+        "expires in 1",
+        "expires in 2",
+    ]
+
+    response = test_client.get(
+        f"/users/{TOKEN_USER_ID}/pantry_items/expiring?within=soon"
+    )
+    assert response.status_code == 422
+
+
+def test_pantry_items_share_food_ids(
+    test_client: TestClient, session, my_fakes: MyFakes, monkeypatch
+):
+    monkeypatch.setattr(crud, "food_resolver", FoodResolver())
+
+    items = [my_fakes.fake_json_pantry_item() for _ in range(3)]
+    items[0]["name"], items[1]["name"], items[2]["name"] = "Tomatoes", "tomato", "basil"
+    response = test_client.post(f"/users/{TOKEN_USER_ID}/pantry_items/bulk", json=items)
+    assert response.status_code == 200
+
+    ids = [item["id"] for item in response.json()]
+    food_ids = dict(
+        session.query(PantryItem.id, PantryItem.food_id).filter(PantryItem.id.in_(ids))
+    )
+    assert food_ids[ids[0]] == food_ids[ids[1]]
+    assert food_ids[ids[0]] != food_ids[ids[2]]
+    assert (
+        session.query(Food).filter(Food.id == food_ids[ids[0]]).one().name == "tomato"
+    )
+
+
+def count_writes(session, table, write):
+    """
+    Runs ``write`` and returns the statements that changed ``table`` and the
+    number of commits.  On SQLite, without RETURNING, each write is followed
+    by a SELECT of the row, so only the INSERT/UPDATE/DELETE are counted.
+    """
+    statements = []
+    commits = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        verb = statement.split(None, 1)[0]
+        if verb in ("INSERT", "UPDATE", "DELETE") and f" {table} " in statement:
+            statements.append(verb)
+
+    def count_commit(session):
+        commits.append(1)
+
+    sa.event.listen(engine, "before_cursor_execute", count_statement)
+    sa.event.listen(session, "after_commit", count_commit)
+    try:
+        write()
+    finally:
+        sa.event.remove(engine, "before_cursor_execute", count_statement)
+        sa.event.remove(session, "after_commit", count_commit)
+    return statements, len(commits)
+
+
+def test_pantry_writes_are_one_statement(
+    test_client: TestClient, session, my_fakes: MyFakes
+):
+    item = test_client.get(f"/users/{TOKEN_USER_ID}/pantry_items").json()[0]
+    url = f"/users/{TOKEN_USER_ID}/pantry_items"
+
+    statements, commits = count_writes(
+        session,
+        "pantry_items",
+        lambda: test_client.post(url, json=my_fakes.fake_json_pantry_item()),
+    )
+    assert (statements, commits) == (["INSERT"], 1)
+
+    statements, commits = count_writes(
+        session,
+        "pantry_items",
+        lambda: test_client.put(url, json=dict(item, name="renamed")),
+    )
+    assert (statements, commits) == (["UPDATE"], 1)
+
+    statements, commits = count_writes(
+        session,
+        "pantry_items",
+        lambda: test_client.request("DELETE", url, json=dict(item, name="renamed")),
+    )
+    assert (statements, commits) == (["DELETE"], 1)
+
+
+def test_create_user_commits_once(session):
+    new_user = UserCreate(
+        first_name="Ada", last_name="Lovelace", email="ada@example.com"
+    )
+
+    statements, commits = count_writes(
+        session, "users", lambda: crud.user.create(session, new_user)
+    )
+    assert commits == 1
+    # The insert, then the household_version bump for the new membership
+    assert statements == ["INSERT", "UPDATE"]
@@ -0,0 +1,62 @@
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.orm import sessionmaker
+
+from app.food.model import Food, FoodAlias
+from app.food.resolver import FoodResolver
+from database import db
+
+
+@pytest.fixture()
+def Session(tmp_path):
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'foods.db'}")
+    db.Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine, autoflush=False)
+    engine.dispose()
+
+
+def test_resolve_interns_normalized_names(Session):
+    resolver = FoodResolver()
+    with Session() as session:
+        tomato, tomatoes, onion, blank = resolver.resolve(
+            session, ["tomato", " Tomatoes.", "onion", ""]
+        )
+        session.commit()
+
+        assert tomato == tomatoes
+        assert tomato != onion
+        assert blank is None
+        assert session.query(Food).count() == 2
+
+
+def test_resolve_uses_aliases(Session):
+    resolver = FoodResolver()
+    with Session() as session:
+        green_onion = Food(name="green onion")
+        session.add(green_onion)
+        session.flush()
+        session.add(FoodAlias(alias="scallion", food_id=green_onion.id))
+        session.commit()
+
+        assert resolver.resolve(session, ["Scallions", "green onions"]) == [
+            green_onion.id,
+            green_onion.id,
+        ]
+
+
+def test_resolve_caches_only_committed_ids(Session):
+    resolver = FoodResolver()
+    with Session() as session:
+        resolver.resolve(session, ["milk"])
+        session.rollback()
+        assert resolver._ids == {}
+
+        (milk,) = resolver.resolve(session, ["milk"])
+        session.commit()
+        assert resolver._ids == {"milk": milk}
+
+    with Session() as session:
+        session.query(Food).delete()
+        session.commit()
+        # Served from the cache, without touching the database
+        assert resolver.resolve(session, ["milk"]) == [milk]
@@ -0,0 +1,157 @@
+import asyncio
+import time
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from google.auth import crypt, exceptions, jwt
+import httpx
+import pytest
+
+from app.auth.google import GoogleTokenVerifier
+
+CERTS_URL = "https://certs.test/oauth2/v1/certs"
+KEY_ID = "test-key"
+
+
+def make_key():
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    return crypt.RSASigner.from_string(private_pem, KEY_ID), public_pem.decode()
+
+
+@pytest.fixture(scope="module")
+def key():
+    return make_key()
+
+
+@pytest.fixture()
+def cert_endpoint(key):
+    _, public_pem = key
+    endpoint = {"requests": 0, "max_age": 3600}
+
+    def handler(request: httpx.Request):
+        assert str(request.url) == CERTS_URL
+        endpoint["requests"] += 1
+        return httpx.Response(
+            200,
+            json={KEY_ID: public_pem},
+            headers={"Cache-Control": f"public, max-age={endpoint['max_age']}"},
+        )
+
+    endpoint["transport"] = httpx.MockTransport(handler)
+    return endpoint
+
+
+@pytest.fixture()
+def clock():
+    return [1000.0]
+
+
+@pytest.fixture()
+def verifier(cert_endpoint, clock):
+    return GoogleTokenVerifier(
+        CERTS_URL,
+        client=httpx.AsyncClient(transport=cert_endpoint["transport"]),
+        clock=lambda: clock[0],
+    )
+
+
+def make_token(signer, **claims):
+    now = int(time.time())
+    payload = {
+        "iss": "https://accounts.google.com",
+        "aud": "fakeIosClientId",
+        "email": "someone@example.com",
+        "email_verified": True,
+        "iat": now,
+        "exp": now + 600,
+    }
+    payload.update(claims)
+    return jwt.encode(signer, payload).decode()
+
+
+def test_verify_uses_cached_certs(verifier, cert_endpoint, key):
+    signer, _ = key
+
+    async def verify_twice():
+        first = await verifier.verify(make_token(signer))
+        second = await verifier.verify(make_token(signer, email="other@example.com"))
+        return first, second
+
+    first, second = asyncio.run(verify_twice())
+    assert first["email"] == "someone@example.com"
+    assert second["email"] == "other@example.com"
+    assert cert_endpoint["requests"] == 1
+
+
+def test_certs_expire_with_max_age(verifier, cert_endpoint, clock):
+    cert_endpoint["max_age"] = 120
+
+    async def fetch_after(seconds):
+        clock[0] += seconds
+        return await verifier.get_certs()
+
+    asyncio.run(fetch_after(0))
+    asyncio.run(fetch_after(121))
+    assert cert_endpoint["requests"] == 2
+
+
+def test_certs_refresh_in_background(verifier, cert_endpoint, clock):
+    async def fetch_near_expiry():
+        await verifier.get_certs()
+        clock[0] += 3600 - 30
+        certs = await verifier.get_certs()
+        assert cert_endpoint["requests"] == 1
+        await verifier._refresh_task
+        return certs
+
+    certs = asyncio.run(fetch_near_expiry())
+    assert KEY_ID in certs
+    assert cert_endpoint["requests"] == 2
+
+
+def test_verify_rejects_foreign_signature(verifier):
+    other_signer, _ = make_key()
+
+    with pytest.raises(ValueError):
+        asyncio.run(verifier.verify(make_token(other_signer)))
+
+
+def test_verify_rejects_wrong_issuer(verifier, key):
+    signer, _ = key
+
+    with pytest.raises(exceptions.GoogleAuthError):
+        asyncio.run(verifier.verify(make_token(signer, iss="https://evil.test")))
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        httpx.Response(500),
+        httpx.Response(200, text="<html>not json</html>"),
+        httpx.ConnectError("connection refused"),
+    ],
+)
+def test_unavailable_certs_raise_transport_error(key, clock, response):
+    def handler(request: httpx.Request):
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    verifier = GoogleTokenVerifier(
+        CERTS_URL,
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        clock=lambda: clock[0],
+    )
+    signer, _ = key
+
+    with pytest.raises(exceptions.TransportError):
+        asyncio.run(verifier.verify(make_token(signer)))
@@ -0,0 +1,64 @@
+from fastapi import FastAPI
+import pytest
+import sqlalchemy as sa
+from fastapi.testclient import TestClient
+
+from app.auth.routers import get_authenticated_user
+import app.health.routers as health_routers
+from database import db
+
+TOKEN_USER_ID = 1
+
+
+@pytest.fixture()
+def engine():
+    engine = sa.create_engine(
+        "sqlite://",
+        poolclass=db.InstrumentedQueuePool,
+        pool_size=2,
+        max_overflow=0,
+        pool_timeout=0.01,
+    )
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture()
+def test_client(engine):
+    app = FastAPI()
+    app.include_router(health_routers.router)
+    app.dependency_overrides[db.get_engines] = lambda: {"sync": engine}
+    app.dependency_overrides[get_authenticated_user] = lambda: {"sub": TOKEN_USER_ID}
+    yield TestClient(app)
+
+
+def test_get_db_pool_status(test_client: TestClient, engine):
+    connection = engine.connect()
+
+    response = test_client.get("/health/db_pool")
+    assert response.status_code == 200
+
+    status = response.json()[0]
+    assert status["name"] == "sync"
+    assert status["size"] == 2
+    assert status["checked_out"] == 1
+    assert status["checkouts"] == 1
+    assert status["timeouts"] == 0
+
+    connection.close()
+
+
+def test_pool_timeout_is_counted(engine):
+    connections = [engine.connect(), engine.connect()]
+
+    with pytest.raises(sa.exc.TimeoutError):
+        engine.connect()
+
+    status = db.pool_status("sync", engine)
+    assert status["checked_out"] == 2
+    assert status["checkouts"] == 3
+    assert status["timeouts"] == 1
+    assert status["max_wait"] >= 0.01
+
+    for connection in connections:
+        connection.close()
@@ -0,0 +1,116 @@
+from fastapi import FastAPI
+import pytest
+import sqlalchemy as sa
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from database import db
+from app.auth.routers import get_authenticated_user
+import app.home.routers as home_routers
+import app.pantry.routers as pantry_routers
+from test.fakes import FakeAsyncSession, MyFakes
+
+TOKEN_USER_ID = 1
+SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+
+engine = sa.create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+db.Base.metadata.drop_all(bind=engine)
+db.Base.metadata.create_all(bind=engine)
+
+
+@pytest.fixture
+def my_fakes():
+    return MyFakes()
+
+
+@pytest.fixture()
+def global_data(my_fakes: MyFakes):
+    user_one = my_fakes.fake_db_user()
+    user_one.id = TOKEN_USER_ID
+
+    pantry_items = [my_fakes.fake_db_pantry_item() for _ in range(3)]
+    for pantry_item in pantry_items:
+        pantry_item.user_id = TOKEN_USER_ID
+
+    recipe_one = my_fakes.fake_db_recipe()
+    recipe_one.user_id = TOKEN_USER_ID
+
+    member_one = my_fakes.fake_db_household_member(TOKEN_USER_ID, user_id=TOKEN_USER_ID)
+    member_two = my_fakes.fake_db_household_member(TOKEN_USER_ID)
+
+    return {
+        "user_one": user_one,
+        "pantry_items": pantry_items,
+        "recipe_one": recipe_one,
+        "member_one": member_one,
+        "member_two": member_two,
+    }
+
+
+@pytest.fixture()
+def session(global_data):
+
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = TestingSessionLocal(bind=connection)
+
+    session.add_all(
+        [global_data["user_one"], *global_data["pantry_items"]]
+        + [global_data[k] for k in ("recipe_one", "member_one", "member_two")]
+    )
+    session.commit()
+
+    yield session
+
+    session.close()
+    transaction.rollback()
+    connection.close()
+
+
+@pytest.fixture()
+def test_client(session):
+    def override_get_async_db():
+        yield FakeAsyncSession(session)
+
+    app = FastAPI()
+    app.include_router(home_routers.router)
+    app.include_router(pantry_routers.router)
+    app.dependency_overrides[db.get_async_db] = override_get_async_db
+    app.dependency_overrides[db.get_async_session_factory] = lambda: (
+        lambda: FakeAsyncSession(session)
+    )
+    app.dependency_overrides[get_authenticated_user] = lambda: {"sub": TOKEN_USER_ID}
+    yield TestClient(app)
+
+
+def test_get_home(test_client: TestClient, global_data):
+    response = test_client.get(f"/users/{TOKEN_USER_ID}/home?limit=2")
+    assert response.status_code == 200
+
+    home = response.json()
+    assert home["user"]["id"] == TOKEN_USER_ID
+    assert [m["id"] for m in home["household"]] == [
+        global_data["member_one"].id,
+        global_data["member_two"].id,
+    ]
+    assert [r["id"] for r in home["recipes"]] == [global_data["recipe_one"].id]
+    assert home["recipes_cursor"] is None
+
+    pantry_ids = [p.id for p in global_data["pantry_items"]]
+    assert [p["id"] for p in home["pantry_items"]] == pantry_ids[:2]
+    assert home["pantry_items_cursor"] is not None
+
+    response = test_client.get(
+        f"/users/{TOKEN_USER_ID}/pantry_items",
+        params={"cursor": home["pantry_items_cursor"]},
+    )
+    assert [p["id"] for p in response.json()] == pantry_ids[2:]
+
+
+def test_get_home_user_not_found(test_client: TestClient):
+    response = test_client.get(f"/users/{TOKEN_USER_ID + 100}/home")
+    assert response.status_code == 404
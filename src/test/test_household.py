@@ -9,7 +9,7 @@ from app.auth.routers import get_authenticated_user
 from database import db
 import app.household.model as household_model
 import app.household.routers as household_routers
-from test.fakes import MyFakes
+from test.fakes import FakeAsyncSession, MyFakes
 
 TOKEN_USER_ID = 1
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
@@ -67,12 +67,12 @@ def session(global_data):
 
 @pytest.fixture()
 def test_client(session):
-    def override_get_db():
-        yield session
+    def override_get_async_db():
+        yield FakeAsyncSession(session)
 
     app = FastAPI()
     app.include_router(household_routers.router)
-    app.dependency_overrides[db.get_db] = override_get_db
+    app.dependency_overrides[db.get_async_db] = override_get_async_db
     app.dependency_overrides[get_authenticated_user] = lambda: {"sub": TOKEN_USER_ID}
     yield TestClient(app)
 
@@ -107,6 +107,26 @@ def test_get_household(test_client: TestClient, global_data):
     )
 
 
+def test_get_household_is_one_query(test_client: TestClient, global_data):
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    sa.event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        response = test_client.get(f"/users/{TOKEN_USER_ID}/household")
+    finally:
+        sa.event.remove(engine, "before_cursor_execute", count_statement)
+
+    assert response.status_code == 200
+    assert len(statements) == 1
+
+    member_one = response.json()[0]
+    assert member_one["first_name"] == global_data["user_one"].first_name
+    assert member_one["last_name"] == global_data["user_one"].last_name
+
+
 def test_add_household_member(test_client: TestClient, my_fakes: MyFakes):
     new_member = my_fakes.fake_json_household_member()
 
@@ -0,0 +1,107 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.orm import sessionmaker
+
+import app.food.model  # noqa: F401
+from app.notifications.model import Notification
+from app.notifications import scanner as expiry_scanner
+from app.notifications.scanner import ExpiryScanner
+from app.pantry.model import PantryItem
+from app.pantry.schema import StorageLocation
+from app.user.model import User
+from database import db
+
+NOW = datetime(2026, 10, 18, 9, 0)
+
+
+@pytest.fixture()
+def Session(tmp_path):
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'notifications.db'}")
+    db.Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine, autoflush=False)
+    engine.dispose()
+
+
+@pytest.fixture()
+def user_ids(Session):
+    with Session() as session:
+        users = [User(first_name=f"user {i}") for i in range(3)]
+        session.add_all(users)
+        session.flush()
+
+        # user 0: five items expiring, user 1: none, user 2: one of two
+        expiring = {
+            users[0].id: [0, 1, 1, 2, 3],
+            users[1].id: [10],
+            users[2].id: [2, 9],
+        }
+        for user_id, days in expiring.items():
+            session.add_all(
+                PantryItem(
+                    user_id=user_id,
+                    name=f"item {i}",
+                    quantity=1,
+                    unit="each",
+                    storage_location=StorageLocation.FRIDGE,
+                    use_by=NOW + timedelta(days=day),
+                )
+                for i, day in enumerate(days)
+            )
+        session.commit()
+        return [user.id for user in users]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 1000])
+def test_scan_notifies_each_user_once(Session, user_ids, chunk_size):
+    scanner = ExpiryScanner(Session, chunk_size=chunk_size, write_batch_size=1)
+
+    assert scanner.scan(NOW, NOW + timedelta(days=3)) == 2
+
+    with Session() as session:
+        notifications = {
+            n.user_id: n for n in session.query(Notification).order_by(Notification.id)
+        }
+    assert sorted(notifications) == [user_ids[0], user_ids[2]]
+    assert notifications[user_ids[0]].item_count == 5
+    assert (
+        notifications[user_ids[0]].body == "Use soon: item 0, item 1, item 2 and 2 more"
+    )
+    assert notifications[user_ids[2]].body == "Use soon: item 0"
+    assert notifications[user_ids[2]].key == "expiry:2026-10-18"
+
+
+def test_rescan_does_not_notify_twice(Session, user_ids):
+    scanner = ExpiryScanner(Session, chunk_size=2)
+
+    assert scanner.scan(NOW, NOW + timedelta(days=3)) == 2
+    assert scanner.scan(NOW, NOW + timedelta(days=3)) == 0
+
+    with Session() as session:
+        assert session.query(Notification).count() == 2
+
+
+def test_completed_scan_is_skipped(Session, user_ids, monkeypatch):
+    monkeypatch.setattr(expiry_scanner.db, "get_engine", lambda: Session.kw["bind"])
+    settings = SimpleNamespace(expiry_scan_within_days=3)
+    scans = []
+    scan = ExpiryScanner.scan
+
+    def counting_scan(self, start, end):
+        scans.append(start)
+        return scan(self, start, end)
+
+    monkeypatch.setattr(ExpiryScanner, "scan", counting_scan)
+
+    # A second worker, or a restart later the same day, doesn't read again
+    expiry_scanner.scan_expiring(settings)
+    expiry_scanner.scan_expiring(settings)
+    assert len(scans) == 1
+
+    scanner = ExpiryScanner(Session)
+    assert scanner.has_completed(expiry_scanner.expiry_key(scans[0]))
+    assert not scanner.has_completed(
+        expiry_scanner.expiry_key(scans[0] + timedelta(days=1))
+    )
@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta
+
+from app.recipe.planning import MealPlanner, Stock
+from app.shopping.aggregate import Line
+
+NOW = datetime(2026, 10, 18, 9, 0)
+
+
+def stock(pantry_item_id, name, quantity=1, unit="each", days=0):
+    return Stock(
+        pantry_item_id,
+        Line(None, name, quantity, unit),
+        None if days is None else NOW + timedelta(days=days),
+    )
+
+
+def recipe(recipe_id, names, servings=1, quantity=1, unit="each"):
+    return recipe_id, servings, [Line(None, name, quantity, unit) for name in names]
+
+
+def test_greedy_prefers_urgent_items():
+    planner = MealPlanner(
+        [recipe(1, ["milk"]), recipe(2, ["rice"]), recipe(3, ["salt"])],
+        [stock(10, "milk", days=0), stock(11, "rice", days=30)],
+        people=1,
+        now=NOW,
+    )
+
+    plan = planner.plan(meals=1, time_budget=0)
+
+    assert [meal.recipe_id for meal in plan.meals] == [1]
+    assert plan.used == {10: 1.0}
+    assert plan.score == 1.0
+
+
+def test_recipes_that_use_nothing_are_left_out():
+    planner = MealPlanner(
+        [recipe(1, ["milk"]), recipe(2, ["salt"])],
+        [stock(10, "milk")],
+        people=1,
+        now=NOW,
+    )
+
+    assert [meal.recipe_id for meal in planner.plan(meals=7).meals] == [1]
+
+
+def test_servings_scale_what_a_meal_uses():
+    planner = MealPlanner(
+        [recipe(1, ["flour"], servings=4, quantity=100, unit="g")],
+        [stock(10, "flour", quantity=1, unit="kg", days=None)],
+        people=2,
+        now=NOW,
+    )
+
+    plan = planner.plan(meals=1)
+
+    assert plan.meals[0].multiplier == 0.5
+    assert plan.used == {10: 0.05}
+
+
+def test_local_search_improves_on_greedy():
+    # Greedy takes recipe 1, which covers four items, and can then only add
+    # one more; recipes 2 and 3 together cover all six.
+    recipes = [
+        recipe(1, ["b", "c", "d", "e"]),
+        recipe(2, ["a", "b", "c"]),
+        recipe(3, ["d", "e", "f"]),
+    ]
+    pantry = [stock(i, name) for i, name in enumerate("abcdef")]
+
+    planner = MealPlanner(recipes, pantry, people=1, now=NOW)
+    greedy = planner.plan(2)
+    improved = planner.plan(2, time_budget=1, local_search=True)
+
+    assert greedy.score == 5
+    assert sorted(meal.recipe_id for meal in improved.meals) == [2, 3]
+    assert improved.score == 6
+
+
+def test_greedy_stops_at_the_deadline():
+    planner = MealPlanner(
+        [recipe(1, ["milk"]), recipe(2, ["rice"]), recipe(3, ["eggs"])],
+        [stock(10, "milk"), stock(11, "rice"), stock(12, "eggs")],
+        people=1,
+        now=NOW,
+    )
+
+    assert len(planner.plan(meals=3).meals) == 3
+    assert len(planner.plan(meals=3, time_budget=0).meals) == 1
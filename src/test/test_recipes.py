@@ -1,3 +1,5 @@
+from datetime import datetime, timedelta
+import json
 from faker import Faker
 from typing import List
 from fastapi import FastAPI
@@ -6,11 +8,15 @@ import sqlalchemy as sa
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import sessionmaker
 
-from database import db
+from database import crud, db
 from app.auth.routers import get_authenticated_user
+from app.food.resolver import FoodResolver
+import app.household.model as household_model
+from app.household.schema import DietaryPreferenceEnum
+import app.pantry.schema as pantry_schema
 import app.recipe.model as recipe_model
 import app.recipe.routers as recipe_routers
-from test.fakes import MyFakes
+from test.fakes import FakeAsyncSession, MyFakes
 
 
 def assertEqualIngredients(
@@ -80,13 +86,15 @@ def session(global_data):
 
 
 @pytest.fixture()
-def test_client(session):
-    def override_get_db():
-        yield session
+def test_client(session, monkeypatch):
+    def override_get_async_db():
+        yield FakeAsyncSession(session)
+
+    monkeypatch.setattr(crud, "food_resolver", FoodResolver())
 
     app = FastAPI()
     app.include_router(recipe_routers.router)
-    app.dependency_overrides[db.get_db] = override_get_db
+    app.dependency_overrides[db.get_async_db] = override_get_async_db
     app.dependency_overrides[get_authenticated_user] = lambda: {"sub": TOKEN_USER_ID}
     yield TestClient(app)
 
@@ -169,3 +177,322 @@ def test_delete_recipe(test_client: TestClient):
     data = response.json()
     assert len(data) == initial_recipe_count - 1
     assert not any([d["name"] == item_to_delete["name"] for d in data])
+
+
+def test_get_recipes_by_page(test_client: TestClient, my_fakes: MyFakes):
+    new_recipe = my_fakes.fake_json_recipe()
+    response = test_client.post(f"/users/{TOKEN_USER_ID}/recipes", json=new_recipe)
+    assert response.status_code == 200
+
+    response = test_client.get(f"/users/{TOKEN_USER_ID}/recipes?limit=1")
+    assert response.status_code == 200
+    first_page = response.json()
+    assert len(first_page) == 1
+
+    cursor = response.headers["X-Next-Cursor"]
+    response = test_client.get(
+        f"/users/{TOKEN_USER_ID}/recipes?limit=1&cursor={cursor}"
+    )
+    assert response.status_code == 200
+    second_page = response.json()
+    assert len(second_page) == 1
+    assert second_page[0]["name"] == new_recipe["name"]
+    assert second_page[0]["id"] != first_page[0]["id"]
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_stream_recipes(test_client: TestClient, global_data):
+    response = test_client.get(f"/users/{TOKEN_USER_ID}/recipes?stream=ndjson")
+    assert response.status_code == 200
+
+    lines = response.text.splitlines()
+    assert len(lines) == 1
+
+    recipe_one = json.loads(lines[0])
+    global_recipe_one = global_data["recipe_one"]
+    assert recipe_one["name"] == global_recipe_one.name
+    assertEqualIngredients(recipe_one["ingredients"], global_recipe_one.ingredients)
+
+
+def test_stream_empty_recipe_list(test_client: TestClient):
+    response = test_client.get("/users/999/recipes?stream=json")
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_add_recipes_in_bulk(test_client: TestClient, my_fakes: MyFakes):
+    new_recipes = [my_fakes.fake_json_recipe() for _ in range(3)]
+    new_recipes[0]["ingredients"] = []
+
+    response = test_client.post(
+        f"/users/{TOKEN_USER_ID}/recipes/bulk", json=new_recipes
+    )
+    assert response.status_code == 200
+
+    created = response.json()
+    assert [c["name"] for c in created] == [r["name"] for r in new_recipes]
+    for new_recipe, created_recipe in zip(new_recipes, created):
+        assert created_recipe["user_id"] == TOKEN_USER_ID
+        assert [i["name"] for i in created_recipe["ingredients"]] == [
+            i["name"] for i in new_recipe["ingredients"]
+        ]
+
+    response = test_client.get(f"/users/{TOKEN_USER_ID}/recipes")
+    assert response.status_code == 200
+    stored = {r["id"]: r for r in response.json()}
+    for created_recipe in created:
+        by_id = lambda i: i["id"]  # noqa: E731
+        assert sorted(stored[created_recipe["id"]]["ingredients"], key=by_id) == sorted(
+            created_recipe["ingredients"], key=by_id
+        )
+
+
+def test_add_recipes_in_bulk_is_capped(test_client: TestClient, my_fakes: MyFakes):
+    new_recipes = [my_fakes.fake_json_recipe()] * (recipe_routers.MAX_BULK_RECIPES + 1)
+
+    response = test_client.post(
+        f"/users/{TOKEN_USER_ID}/recipes/bulk", json=new_recipes
+    )
+    assert response.status_code == 422
+
+
+def test_get_cookable_recipes(test_client: TestClient, session, my_fakes: MyFakes):
+    def recipe(name, *ingredients):
+        json_recipe = my_fakes.fake_json_recipe()
+        json_recipe["name"] = name
+        json_recipe["ingredients"] = [
+            dict(my_fakes.fake_json_ingredient(), name=i) for i in ingredients
+        ]
+        return json_recipe
+
+    new_recipes = [
+        recipe("pancakes", "flour", "Eggs", "milk", "sugar"),
+        recipe("omelette", "eggs", "butter"),
+        recipe("scrambled eggs", "egg"),
+    ]
+    response = test_client.post(
+        f"/users/{TOKEN_USER_ID}/recipes/bulk", json=new_recipes
+    )
+    assert response.status_code == 200
+    new_ids = {r["id"] for r in response.json()}
+
+    for name in ("Egg", "butter ", "Milk", "tomatoes"):
+        pantry_item = my_fakes.fake_db_pantry_item()
+        pantry_item.name = name
+        pantry_item.food_id = crud.food_resolver.resolve(session, [name])[0]
+        pantry_item.user_id = TOKEN_USER_ID
+        session.add(pantry_item)
+    session.commit()
+
+    response = test_client.get(f"/users/{TOKEN_USER_ID}/recipes/cookable")
+    assert response.status_code == 200
+    cookable = [c for c in response.json() if c["recipe"]["id"] in new_ids]
+    assert [c["recipe"]["name"] for c in cookable] == ["omelette", "scrambled eggs"]
+    assert all(c["missing"] == [] and c["coverage"] == 1.0 for c in cookable)
+
+    response = test_client.get(f"/users/{TOKEN_USER_ID}/recipes/cookable?max_missing=2")
+    assert response.status_code == 200
+    cookable = [c for c in response.json() if c["recipe"]["id"] in new_ids]
+    assert [c["recipe"]["name"] for c in cookable] == [
+        "omelette",
+        "scrambled eggs",
+        "pancakes",
+    ]
+    pancakes = cookable[-1]
+    assert sorted(pancakes["missing"]) == ["flour", "sugar"]
+    assert pancakes["coverage"] == 0.5
+
+
+def test_cookable_index_follows_recipe_changes(
+    test_client: TestClient, session, my_fakes: MyFakes
+):
+    crud.ingredient_indexes.clear()
+    pantry_item = my_fakes.fake_db_pantry_item()
+    pantry_item.name = "bread"
+    pantry_item.food_id = crud.food_resolver.resolve(session, ["bread"])[0]
+    pantry_item.user_id = TOKEN_USER_ID
+    session.add(pantry_item)
+    session.commit()
+
+    url = f"/users/{TOKEN_USER_ID}/recipes/cookable"
+    assert "toast" not in [c["recipe"]["name"] for c in test_client.get(url).json()]
+    index = crud.recipe.get_ingredient_index(session, TOKEN_USER_ID)
+    assert crud.recipe.get_ingredient_index(session, TOKEN_USER_ID) is index
+
+    toast = dict(
+        my_fakes.fake_json_recipe(),
+        name="toast",
+        ingredients=[dict(my_fakes.fake_json_ingredient(), name="Bread")],
+    )
+    test_client.post(f"/users/{TOKEN_USER_ID}/recipes", json=toast)
+
+    assert "toast" in [c["recipe"]["name"] for c in test_client.get(url).json()]
+    assert crud.recipe.get_ingredient_index(session, TOKEN_USER_ID) is not index
+
+
+def test_get_meal_plan(test_client: TestClient, session, my_fakes: MyFakes):
+    def recipe(name, servings, *ingredients):
+        return dict(
+            my_fakes.fake_json_recipe(),
+            name=name,
+            servings=servings,
+            ingredients=[
+                {"name": i, "quantity": 100, "unit": "g"} for i in ingredients
+            ],
+        )
+
+    new_recipes = [
+        recipe("spinach pie", 4, "spinach", "feta"),
+        recipe("rice pudding", 4, "rice"),
+    ]
+    response = test_client.post(
+        f"/users/{TOKEN_USER_ID}/recipes/bulk", json=new_recipes
+    )
+    assert response.status_code == 200
+
+    now = datetime.utcnow()
+    pantry_items = []
+    for name, days in (("Spinach", 1), ("feta", 2), ("rice", 300)):
+        pantry_item = my_fakes.fake_json_pantry_item()
+        pantry_item.update(name=name, quantity=400, unit="g")
+        pantry_item["use_by"] = (now + timedelta(days=days)).isoformat()
+        pantry_items.append(pantry_schema.PantryItemCreate(**pantry_item))
+    spinach, feta, _ = crud.pantry.add_many(session, TOKEN_USER_ID, pantry_items)
+
+    response = test_client.get(
+        f"/users/{TOKEN_USER_ID}/recipes/meal_plan?meals=1&people=8"
+    )
+    assert response.status_code == 200
+    plan = response.json()
+    assert [m["recipe"]["name"] for m in plan["meals"]] == ["spinach pie"]
+    assert plan["meals"][0]["multiplier"] == 2
+    assert plan["pantry_items_used"] == [
+        {"pantry_item_id": spinach.id, "fraction": 0.5},
+        {"pantry_item_id": feta.id, "fraction": 0.5},
+    ]
+
+    response = test_client.get(f"/users/{TOKEN_USER_ID}/recipes/meal_plan?meals=0")
+    assert response.status_code == 422
+
+
+def test_get_household_safe_recipes(
+    test_client: TestClient, session, global_data, my_fakes: MyFakes
+):
+    def recipe(name, *ingredients):
+        return dict(
+            my_fakes.fake_json_recipe(),
+            name=name,
+            ingredients=[
+                dict(my_fakes.fake_json_ingredient(), name=i) for i in ingredients
+            ],
+        )
+
+    new_recipes = [
+        recipe("chili", "beef mince", "kidney beans"),
+        recipe("dal", "lentils", "ghee"),
+        recipe("stir fry", "tofu", "rice noodles"),
+    ]
+    response = test_client.post(
+        f"/users/{TOKEN_USER_ID}/recipes/bulk", json=new_recipes
+    )
+    assert response.status_code == 200
+    new_ids = {r["id"] for r in response.json()}
+
+    def household_safe_names():
+        response = test_client.get(
+            f"/users/{TOKEN_USER_ID}/recipes?household_safe=true&limit=100"
+        )
+        assert response.status_code == 200
+        return [r["name"] for r in response.json() if r["id"] in new_ids]
+
+    # No household, so nothing to filter on
+    assert household_safe_names() == ["chili", "dal", "stir fry"]
+
+    member = my_fakes.fake_db_household_member(TOKEN_USER_ID, user_id=TOKEN_USER_ID)
+    session.add(member)
+    session.flush()
+    session.add(
+        household_model.DietaryPreferences(
+            member_id=member.id, preference=DietaryPreferenceEnum.VEGETARIAN
+        )
+    )
+    session.commit()
+    assert household_safe_names() == ["dal", "stir fry"]
+
+    other = my_fakes.fake_db_household_member(TOKEN_USER_ID)
+    session.add(other)
+    session.flush()
+    session.add(
+        household_model.DietaryPreferences(
+            member_id=other.id, preference=DietaryPreferenceEnum.VEGAN
+        )
+    )
+    session.commit()
+    assert household_safe_names() == ["stir fry"]
+
+    response = test_client.get(f"/users/{TOKEN_USER_ID}/recipes?limit=100")
+    names = [r["name"] for r in response.json() if r["id"] in new_ids]
+    assert names == ["chili", "dal", "stir fry"]
+
+
+def test_get_recipes_not_modified(test_client: TestClient, my_fakes: MyFakes):
+    response = test_client.get(f"/users/{TOKEN_USER_ID}/recipes")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    response = test_client.get(
+        f"/users/{TOKEN_USER_ID}/recipes", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+
+    response = test_client.post(
+        f"/users/{TOKEN_USER_ID}/recipes", json=my_fakes.fake_json_recipe()
+    )
+    assert response.status_code == 200
+
+    response = test_client.get(
+        f"/users/{TOKEN_USER_ID}/recipes", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_search_recipes(test_client: TestClient):
+    recipes = [
+        {
+            "name": "Chicken noodle soup",
+            "servings": 4,
+            "procedure": "Simmer everything.",
+            "ingredients": [
+                {"name": "chicken thighs", "quantity": 500, "unit": "g"},
+                {"name": "carrots", "quantity": 2, "unit": "each"},
+            ],
+        },
+        {
+            "name": "Carrot cake",
+            "servings": 8,
+            "procedure": "Bake for an hour.",
+            "ingredients": [{"name": "carrots", "quantity": 3, "unit": "each"}],
+        },
+        {
+            "name": "Beef stew",
+            "servings": 6,
+            "procedure": "Brown the beef, then add chicken stock.",
+            "ingredients": [{"name": "beef", "quantity": 1, "unit": "kg"}],
+        },
+    ]
+    response = test_client.post(f"/users/{TOKEN_USER_ID}/recipes/bulk", json=recipes)
+    assert response.status_code == 200
+
+    def search(q):
+        response = test_client.get(f"/users/{TOKEN_USER_ID}/recipes/search?q={q}")
+        assert response.status_code == 200
+        return [recipe["name"] for recipe in response.json()]
+
+    # Name matches outrank procedure matches
+    assert search("chicken") == ["Chicken noodle soup", "Beef stew"]
+    assert search("chiken") == ["Chicken noodle soup", "Beef stew"]
+    assert search("carrot") == ["Carrot cake", "Chicken noodle soup"]
+    assert search("carrot soup") == ["Chicken noodle soup"]
+    assert search("lasagna") == []
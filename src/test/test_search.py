@@ -0,0 +1,25 @@
+from app.recipe.search import RecipeSearchIndex, _within_one_edit
+
+
+def test_within_one_edit():
+    assert _within_one_edit("chicken", "chicken")
+    assert _within_one_edit("chiken", "chicken")
+    assert _within_one_edit("chickne", "chicken")
+    assert _within_one_edit("chickin", "chicken")
+    assert not _within_one_edit("chckn", "chicken")
+    assert not _within_one_edit("kitchen", "chicken")
+
+
+def test_search_requires_every_term():
+    index = RecipeSearchIndex(
+        [
+            (1, "Tomato soup", "tomatoes onion", None),
+            (2, "Onion tart", "onions butter flour", "Bake"),
+        ]
+    )
+
+    assert index.search("onion", 10) == [2, 1]
+    assert index.search("tomato onion", 10) == [1]
+    assert index.search("tom", 10) == [1]
+    assert index.search("", 10) == []
+    assert index.search("onion", 1) == [2]
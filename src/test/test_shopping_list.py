@@ -0,0 +1,191 @@
+from fastapi import FastAPI
+import pytest
+import sqlalchemy as sa
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from database import crud, db
+from app.auth.routers import get_authenticated_user
+from app.food.model import Food, FoodAlias
+from app.food.resolver import FoodResolver
+import app.pantry.routers as pantry_routers
+import app.recipe.routers as recipe_routers
+import app.shopping.routers as shopping_routers
+from test.fakes import FakeAsyncSession, MyFakes
+
+TOKEN_USER_ID = 1
+SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+
+engine = sa.create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+db.Base.metadata.drop_all(bind=engine)
+db.Base.metadata.create_all(bind=engine)
+
+
+@pytest.fixture
+def my_fakes():
+    return MyFakes()
+
+
+@pytest.fixture()
+def global_data(my_fakes: MyFakes):
+    user_one = my_fakes.fake_db_user()
+    user_one.id = TOKEN_USER_ID
+
+    other_recipe = my_fakes.fake_db_recipe()
+    other_recipe.user_id = TOKEN_USER_ID + 1
+
+    return {"user_one": user_one, "other_recipe": other_recipe}
+
+
+@pytest.fixture()
+def session(global_data):
+
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = TestingSessionLocal(bind=connection)
+
+    session.add_all([v for _, v in global_data.items()])
+    session.commit()
+
+    yield session
+
+    session.close()
+    transaction.rollback()
+    connection.close()
+
+
+@pytest.fixture()
+def test_client(session, monkeypatch):
+    def override_get_async_db():
+        yield FakeAsyncSession(session)
+
+    monkeypatch.setattr(crud, "food_resolver", FoodResolver())
+
+    app = FastAPI()
+    app.include_router(pantry_routers.router)
+    app.include_router(recipe_routers.router)
+    app.include_router(shopping_routers.router)
+    app.dependency_overrides[db.get_async_db] = override_get_async_db
+    app.dependency_overrides[get_authenticated_user] = lambda: {"sub": TOKEN_USER_ID}
+    yield TestClient(app)
+
+
+def add_recipe(test_client: TestClient, my_fakes: MyFakes, ingredients):
+    recipe = my_fakes.fake_json_recipe()
+    recipe["ingredients"] = [
+        {"name": name, "quantity": quantity, "unit": unit}
+        for name, quantity, unit in ingredients
+    ]
+    response = test_client.post(f"/users/{TOKEN_USER_ID}/recipes", json=recipe)
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+def add_pantry_items(test_client: TestClient, my_fakes: MyFakes, items):
+    pantry_items = []
+    for name, quantity, unit in items:
+        item = my_fakes.fake_json_pantry_item()
+        item.update(name=name, quantity=quantity, unit=unit)
+        pantry_items.append(item)
+    response = test_client.post(
+        f"/users/{TOKEN_USER_ID}/pantry_items/bulk", json=pantry_items
+    )
+    assert response.status_code == 200
+
+
+def test_shopping_list_subtracts_pantry_stock(
+    test_client: TestClient, my_fakes: MyFakes
+):
+    pancakes = add_recipe(
+        test_client,
+        my_fakes,
+        [("flour", 200, "g"), ("milk", 1, "cup"), ("eggs", 2, "each")],
+    )
+    omelette = add_recipe(
+        test_client,
+        my_fakes,
+        [("Eggs", 3, ""), ("milk", 50, "ml"), ("chives", 1, "bunch")],
+    )
+    add_pantry_items(
+        test_client,
+        my_fakes,
+        [("flour", 1, "kg"), ("milk", 200, "ml"), ("egg", 4, "each")],
+    )
+
+    response = test_client.post(
+        f"/users/{TOKEN_USER_ID}/shopping_list",
+        json={
+            "recipes": [
+                {"recipe_id": pancakes, "multiplier": 2},
+                {"recipe_id": omelette},
+            ]
+        },
+    )
+    assert response.status_code == 200
+
+    shortfall = {item["name"]: item for item in response.json()}
+    assert sorted(shortfall) == ["chives", "eggs", "milk"]
+    assert shortfall["chives"]["quantity"] == 1
+    assert shortfall["chives"]["unit"] == "bunch"
+    # 2 + 2 + 3 eggs needed, 4 in the pantry
+    assert shortfall["eggs"]["quantity"] == 3
+    assert shortfall["eggs"]["unit"] == "each"
+    # 2 cups and 50 ml needed, 200 ml in the pantry
+    assert shortfall["milk"]["unit"] == "cup"
+    assert shortfall["milk"]["quantity"] == pytest.approx(
+        (2 * 236.5882365 + 50 - 200) / 236.5882365, abs=1e-3
+    )
+
+
+def test_shopping_list_of_another_users_recipe(
+    test_client: TestClient, global_data, my_fakes: MyFakes
+):
+    pancakes = add_recipe(test_client, my_fakes, [("flour", 200, "g")])
+
+    response = test_client.post(
+        f"/users/{TOKEN_USER_ID}/shopping_list",
+        json={
+            "recipes": [
+                {"recipe_id": pancakes},
+                {"recipe_id": global_data["other_recipe"].id},
+            ]
+        },
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Recipe not found"
+
+
+def test_shopping_list_rejects_bad_multiplier(test_client: TestClient):
+    response = test_client.post(
+        f"/users/{TOKEN_USER_ID}/shopping_list",
+        json={"recipes": [{"recipe_id": 1, "multiplier": 0}]},
+    )
+    assert response.status_code == 422
+
+
+def test_aliases_match_on_shopping_list_and_cookable(
+    test_client: TestClient, session, my_fakes: MyFakes
+):
+    crud.ingredient_indexes.clear()
+    green_onion = Food(name="green onion")
+    session.add(green_onion)
+    session.flush()
+    session.add(FoodAlias(alias="scallion", food_id=green_onion.id))
+    session.commit()
+
+    recipe_id = add_recipe(test_client, my_fakes, [("green onion", 2, "each")])
+    add_pantry_items(test_client, my_fakes, [("Scallions", 3, "each")])
+
+    response = test_client.post(
+        f"/users/{TOKEN_USER_ID}/shopping_list",
+        json={"recipes": [{"recipe_id": recipe_id}]},
+    )
+    assert response.json() == []
+
+    response = test_client.get(f"/users/{TOKEN_USER_ID}/recipes/cookable")
+    cookable = {c["recipe"]["id"]: c for c in response.json()}
+    assert cookable[recipe_id]["missing"] == []
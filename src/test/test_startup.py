@@ -0,0 +1,37 @@
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.orm import sessionmaker
+
+from app import startup
+from app.user.model import User
+from database import db
+from test.fakes import MyFakes
+
+
+@pytest.fixture()
+def engine(tmp_path, monkeypatch):
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'startup.db'}")
+    db.Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(db, "get_engine", lambda: engine)
+    yield engine
+    engine.dispose()
+
+
+def test_startup_seeds_once(engine):
+    settings = MyFakes().fake_settings()
+
+    startup.run_startup_tasks(settings)
+    startup.run_startup_tasks(settings)
+
+    with sessionmaker(bind=engine)() as session:
+        assert session.query(User).count() == 3
+
+
+def test_startup_skips_seeding_in_production(engine):
+    settings = MyFakes().fake_settings()
+    settings.environment = "production"
+
+    startup.run_startup_tasks(settings)
+
+    with sessionmaker(bind=engine)() as session:
+        assert session.query(User).count() == 0
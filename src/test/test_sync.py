@@ -0,0 +1,179 @@
+from fastapi import FastAPI
+import pytest
+import sqlalchemy as sa
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from database import db
+from app.auth.routers import get_authenticated_user
+import app.household.routers as household_routers
+import app.pantry.routers as pantry_routers
+import app.recipe.routers as recipe_routers
+import app.sync.routers as sync_routers
+import app.user.routers as user_routers
+from test.fakes import FakeAsyncSession, MyFakes
+
+TOKEN_USER_ID = 1
+SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+
+engine = sa.create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+db.Base.metadata.drop_all(bind=engine)
+db.Base.metadata.create_all(bind=engine)
+
+
+@pytest.fixture
+def my_fakes():
+    return MyFakes()
+
+
+@pytest.fixture()
+def global_data(my_fakes: MyFakes):
+    user_one = my_fakes.fake_db_user()
+    user_one.id = TOKEN_USER_ID
+
+    pantry_item_one = my_fakes.fake_db_pantry_item()
+    pantry_item_one.user_id = TOKEN_USER_ID
+
+    pantry_item_two = my_fakes.fake_db_pantry_item()
+    pantry_item_two.user_id = TOKEN_USER_ID
+
+    recipe_one = my_fakes.fake_db_recipe()
+    recipe_one.user_id = TOKEN_USER_ID
+    recipe_one.ingredients = []
+
+    member_one = my_fakes.fake_db_household_member(TOKEN_USER_ID, user_id=TOKEN_USER_ID)
+    member_two = my_fakes.fake_db_household_member(TOKEN_USER_ID)
+
+    return {
+        "user_one": user_one,
+        "pantry_item_one": pantry_item_one,
+        "pantry_item_two": pantry_item_two,
+        "recipe_one": recipe_one,
+        "member_one": member_one,
+        "member_two": member_two,
+    }
+
+
+@pytest.fixture()
+def session(global_data):
+
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = TestingSessionLocal(bind=connection)
+
+    session.add_all([v for _, v in global_data.items()])
+    session.commit()
+
+    yield session
+
+    session.close()
+    transaction.rollback()
+    connection.close()
+
+
+@pytest.fixture()
+def test_client(session):
+    def override_get_async_db():
+        yield FakeAsyncSession(session)
+
+    app = FastAPI()
+    app.include_router(household_routers.router)
+    app.include_router(pantry_routers.router)
+    app.include_router(recipe_routers.router)
+    app.include_router(sync_routers.router)
+    app.include_router(user_routers.router)
+    app.dependency_overrides[db.get_async_db] = override_get_async_db
+    app.dependency_overrides[get_authenticated_user] = lambda: {"sub": TOKEN_USER_ID}
+    yield TestClient(app)
+
+
+def test_full_sync(test_client: TestClient, global_data):
+    response = test_client.get(f"/users/{TOKEN_USER_ID}/sync")
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["reset"]
+    assert [p["id"] for p in data["pantry_items"]] == [
+        global_data["pantry_item_one"].id,
+        global_data["pantry_item_two"].id,
+    ]
+    assert [r["id"] for r in data["recipes"]] == [global_data["recipe_one"].id]
+    assert len(data["household_members"]) == 2
+    assert data["deleted_pantry_items"] == []
+
+
+def test_sync_since_token(test_client: TestClient, global_data, my_fakes: MyFakes):
+    token = test_client.get(f"/users/{TOKEN_USER_ID}/sync").json()["token"]
+
+    response = test_client.get(f"/users/{TOKEN_USER_ID}/sync?since={token}")
+    assert response.status_code == 200
+    data = response.json()
+    assert not data["reset"]
+    assert data["pantry_items"] == []
+    assert data["recipes"] == []
+    assert data["household_members"] == []
+    assert data["token"] == token
+
+    new_item = test_client.post(
+        f"/users/{TOKEN_USER_ID}/pantry_items", json=my_fakes.fake_json_pantry_item()
+    ).json()
+    deleted_item = test_client.get(f"/users/{TOKEN_USER_ID}/pantry_items").json()[1]
+    test_client.request(
+        "DELETE", f"/users/{TOKEN_USER_ID}/pantry_items", json=deleted_item
+    )
+
+    recipe = test_client.get(f"/users/{TOKEN_USER_ID}/recipes").json()[0]
+    recipe["name"] = "renamed"
+    test_client.put(f"/users/{TOKEN_USER_ID}/recipes", json=recipe)
+
+    new_member = test_client.post(
+        f"/users/{TOKEN_USER_ID}/household",
+        json=my_fakes.fake_json_household_member(),
+    ).json()
+    removed_member = test_client.get(f"/users/{TOKEN_USER_ID}/household").json()[1]
+    test_client.request(
+        "DELETE", f"/users/{TOKEN_USER_ID}/household", json=removed_member
+    )
+
+    response = test_client.get(f"/users/{TOKEN_USER_ID}/sync?since={token}")
+    assert response.status_code == 200
+    data = response.json()
+    assert not data["reset"]
+    assert [p["id"] for p in data["pantry_items"]] == [new_item["id"]]
+    assert data["deleted_pantry_items"] == [deleted_item["id"]]
+    assert [r["name"] for r in data["recipes"]] == ["renamed"]
+    assert [m["id"] for m in data["household_members"]] == [new_member["id"]]
+    assert data["deleted_household_members"] == [removed_member["id"]]
+
+    response = test_client.get(f"/users/{TOKEN_USER_ID}/sync?since={data['token']}")
+    assert response.json()["pantry_items"] == []
+    assert response.json()["deleted_pantry_items"] == []
+
+
+def test_sync_user_rename(test_client: TestClient, global_data):
+    token = test_client.get(f"/users/{TOKEN_USER_ID}/sync").json()["token"]
+    recipes_url = f"/users/{TOKEN_USER_ID}/recipes?household_safe=true"
+    etag = test_client.get(recipes_url).headers["etag"]
+
+    user = test_client.get(f"/users/{TOKEN_USER_ID}").json()
+    user["first_name"] = "Renamed"
+    assert test_client.put("/users", json=user).status_code == 200
+
+    response = test_client.get(f"/users/{TOKEN_USER_ID}/sync?since={token}")
+    data = response.json()
+    assert [m["id"] for m in data["household_members"]] == [
+        global_data["member_one"].id
+    ]
+    assert data["household_members"][0]["first_name"] == "Renamed"
+
+    assert test_client.get(recipes_url).headers["etag"] != etag
+
+
+def test_sync_invalid_token(test_client: TestClient):
+    response = test_client.get(f"/users/{TOKEN_USER_ID}/sync?since=bogus")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid sync token"
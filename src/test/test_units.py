@@ -0,0 +1,48 @@
+import pytest
+
+from app.food import units
+from app.food.units import Dimension, Quantity
+
+
+def test_lookup_folds_spelling():
+    assert units.lookup("Cups") == units.lookup("cup")
+    assert units.lookup(" tbsp. ") == units.lookup("tablespoon")
+    assert units.lookup("LITERS") == units.lookup("l")
+    assert units.lookup("glass") is None
+
+
+def test_lookup_keeps_teaspoon_and_tablespoon_apart():
+    assert units.lookup("t") == units.lookup("tsp")
+    assert units.lookup("T") == units.lookup("tbsp")
+
+
+def test_to_canonical():
+    converted = units.to_canonical(
+        [1, 2, 0.5, 3, 1],
+        ["liter", "cups", "kg", "", "handful"],
+    )
+
+    assert converted[0] == Quantity(1000.0, Dimension.VOLUME)
+    assert converted[1].dimension == Dimension.VOLUME
+    assert converted[1].amount == pytest.approx(473.176473)
+    assert converted[2] == Quantity(500.0, Dimension.MASS)
+    assert converted[3] == Quantity(3, Dimension.COUNT)
+    assert converted[4] is None
+
+
+def test_convert_many():
+    converted = units.convert_many(
+        [1, 16, 1, 2],
+        ["kg", "tbsp", "cup", "dozen"],
+        ["lb", "cup", "g", "each"],
+    )
+
+    assert converted[0] == pytest.approx(2.20462, rel=1e-5)
+    assert converted[1] == pytest.approx(1.0)
+    assert converted[2] is None
+    assert converted[3] == 24
+
+
+def test_convert():
+    assert units.convert(2, "l", "ml") == 2000
+    assert units.convert(1, "cup", "gram") is None
@@ -8,7 +8,7 @@ from app.auth.routers import get_authenticated_user
 
 from database import db
 import app.user.routers as user_routers
-from test.fakes import MyFakes
+from test.fakes import FakeAsyncSession, MyFakes
 
 TOKEN_USER_ID = 1
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
@@ -57,12 +57,12 @@ def session(global_data):
 
 @pytest.fixture()
 def test_client(session):
-    def override_get_db():
-        yield session
+    def override_get_async_db():
+        yield FakeAsyncSession(session)
 
     app = FastAPI()
     app.include_router(user_routers.router)
-    app.dependency_overrides[db.get_db] = override_get_db
+    app.dependency_overrides[db.get_async_db] = override_get_async_db
     app.dependency_overrides[get_authenticated_user] = lambda: {"sub": TOKEN_USER_ID}
     yield TestClient(app)
 
@@ -123,3 +123,20 @@ def test_get_user_by_id(test_client: TestClient, global_data):
 
     user = response.json()
     assert user["id"] == global_data["user_one"].id
+
+
+def test_get_users_by_page(test_client: TestClient, global_data):
+    response = test_client.get("/users?limit=1")
+    assert response.status_code == 200
+    assert [u["id"] for u in response.json()] == [global_data["user_one"].id]
+
+    cursor = response.headers["X-Next-Cursor"]
+    response = test_client.get(f"/users?limit=1&cursor={cursor}")
+    assert response.status_code == 200
+    assert [u["id"] for u in response.json()] == [global_data["user_two"].id]
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_get_users_page_size_is_capped(test_client: TestClient):
+    response = test_client.get("/users?limit=1000")
+    assert response.status_code == 422